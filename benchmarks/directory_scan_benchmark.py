@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+from podcast_downloader.downloaded import get_downloaded_files, get_extensions_checker
+
+FILES_COUNT = 20_000
+REPEATS = 3
+# the part of the files which are not the episodes (covers, descriptions)
+OTHER_FILES_RATIO = 0.05
+
+
+def listdir_based_scan(
+    podcast_files_filter: Callable[[str], bool], podcast_directory: str
+) -> List[str]:
+    # the approach used before the scandir: the files sorted by the creation
+    # time, then checked one by one
+    sort_key_function = lambda file_name: os.path.getctime(
+        os.path.join(podcast_directory, file_name)
+    )
+    return [
+        file_name
+        for file_name in sorted(
+            os.listdir(podcast_directory), key=sort_key_function, reverse=True
+        )
+        if podcast_files_filter(file_name)
+        and os.path.isfile(os.path.join(podcast_directory, file_name))
+    ]
+
+
+def build_directory(path: str, files_count: int) -> None:
+    other_files_count = int(files_count * OTHER_FILES_RATIO)
+
+    for index in range(files_count):
+        extension = ".jpg" if index < other_files_count else ".mp3"
+        open(os.path.join(path, f"episode{index:0>6}{extension}"), "w").close()
+
+
+class SlowStat:
+    # Emulates the slow file system (e.g. the network one), where each stat
+    # of the file takes the given time. The directory listing is not slowed.
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.stat = os.stat
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        return self.stat(*args, **kwargs)
+
+
+def measure(function: Callable[[], None], latency: float) -> Dict[str, float]:
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        slow_stat = SlowStat(latency)
+        with mock.patch("os.stat", slow_stat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+
+    return {"seconds": best, "stat_calls": slow_stat.calls}
+
+
+def benchmark_directory(directory: str, latency: float) -> Dict[str, Dict]:
+    podcast_files_filter = get_extensions_checker([".mp3"])
+
+    return {
+        "listdir_based": measure(
+            partial(listdir_based_scan, podcast_files_filter, directory), latency
+        ),
+        "scandir_based": measure(
+            partial(get_downloaded_files, podcast_files_filter, directory), latency
+        ),
+    }
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measures the scan of the podcast directory"
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=FILES_COUNT,
+        help="The number of the files in the directory",
+    )
+    parser.add_argument(
+        "--directory",
+        type=str,
+        default=None,
+        help="The place for the test directory (e.g. on the network file system)",
+    )
+    parser.add_argument(
+        "--stat_latency",
+        type=float,
+        default=0.0,
+        help="The time (milliseconds) added to each stat, to emulate the slow file system",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="directory_scan_benchmark.json",
+        help="The file for the results (JSON)",
+    )
+
+    return parser.parse_args()
+
+
+def run(files_count: int, parent_directory: Optional[str], latency: float) -> Dict:
+    with tempfile.TemporaryDirectory(dir=parent_directory) as directory:
+        build_directory(directory, files_count)
+        return benchmark_directory(directory, latency)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    results = run(arguments.files, arguments.directory, arguments.stat_latency / 1000)
+
+    print(f"{'files':>8} {'scan':>15} {'best time [s]':>15} {'stat calls':>12}")
+    for scan, result in results.items():
+        print(
+            f"{arguments.files:>8} {scan:>15} {result['seconds']:>15.4f} "
+            f"{result['stat_calls']:>12}"
+        )
+
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "repeats": REPEATS,
+                "files": arguments.files,
+                "stat_latency_ms": arguments.stat_latency,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from email.utils import formatdate
+from functools import partial
+from typing import Callable, Dict, List
+
+from podcast_downloader.downloaded import get_downloaded_files
+from podcast_downloader.feed_stream import get_feed_entities, stream_feed
+from podcast_downloader.reconciliation import reconcile
+from podcast_downloader.rss import (
+    RSSEntity,
+    build_only_allowed_filter_for_link_data,
+    compile_file_name_template,
+    load_feed,
+)
+from podcast_downloader.utils import compose
+
+FEED_SIZES = [10, 1_000, 10_000, 50_000]
+REPEATS = 3
+DOWNLOADED_RATIO = 0.95
+FILE_NAME_TEMPLATE = "%file_name%.%file_extension%"
+ALLOWED_TYPES = ["audio/mpeg"]
+
+
+def build_feed_content(size: int) -> str:
+    items = "".join(
+        "<item>"
+        f"<title>Episode {size - index}</title>"
+        f"<pubDate>{formatdate(1_700_000_000 - index * 3_600)}</pubDate>"
+        f'<enclosure url="http://www.p.com/episode{size - index:0>6}.mp3" '
+        'type="audio/mpeg" length="1000"/>'
+        f"<link>http://www.p.com/episode{size - index:0>6}.html</link>"
+        "</item>"
+        for index in range(size)
+    )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Benchmark</title>'
+        f"<link>http://www.p.com</link><description>Benchmark</description>{items}"
+        "</channel></rss>"
+    )
+
+
+def build_directory(path: str, entities: List[RSSEntity]) -> None:
+    # the newest episode is missing, all the other are downloaded
+    to_file_name = compile_file_name_template(FILE_NAME_TEMPLATE)
+    for entity in entities[1 : int(len(entities) * DOWNLOADED_RATIO) + 1]:
+        open(os.path.join(path, to_file_name(entity)), "w").close()
+
+
+def to_entities(feed) -> List[RSSEntity]:
+    return compose(
+        list,
+        partial(filter, build_only_allowed_filter_for_link_data(ALLOWED_TYPES)),
+        get_feed_entities,
+    )(feed)
+
+
+def measure(function: Callable[[], None], setup: Callable[[], None] = None) -> float:
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        if setup:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def benchmark_size(size: int, directory: str) -> Dict[str, float]:
+    feed_path = os.path.join(directory, "feed.xml")
+    feed_content = build_feed_content(size).encode("utf-8")
+    with open(feed_path, "wb") as file:
+        file.write(feed_content)
+
+    podcast_directory = os.path.join(directory, "podcast")
+    os.mkdir(podcast_directory)
+
+    feed = load_feed(feed_path)
+    entities = to_entities(feed)
+    build_directory(podcast_directory, entities)
+
+    to_file_name = compile_file_name_template(FILE_NAME_TEMPLATE)
+    downloaded_files = get_downloaded_files(lambda _: True, podcast_directory)
+    # without the gaps filled up, the pass goes only as far as the newest
+    # downloaded file, here the one deep in the feed
+    deep_downloaded_files = {
+        to_file_name(entities[int((len(entities) - 1) * DOWNLOADED_RATIO)])
+    }
+
+    # the entities cache the derived names, so the rendering gets fresh ones
+    fresh_entities = []
+
+    def refresh_entities() -> None:
+        fresh_entities[:] = to_entities(feed)
+
+    return {
+        "load_feed": measure(partial(load_feed, feed_path)),
+        "flatten_and_filter": measure(partial(to_entities, feed)),
+        "stream_and_filter": measure(
+            lambda: to_entities(stream_feed(feed_content, {}))
+        ),
+        "render_file_names": measure(
+            lambda: list(map(to_file_name, fresh_entities)), refresh_entities
+        ),
+        "get_downloaded_files": measure(
+            partial(get_downloaded_files, lambda _: True, podcast_directory)
+        ),
+        "reconciliation": measure(
+            lambda: reconcile(
+                to_file_name, set(downloaded_files), fresh_entities
+            ).get_missing_entities(True),
+            refresh_entities,
+        ),
+        "reconciliation_no_gaps": measure(
+            lambda: reconcile(
+                to_file_name, deep_downloaded_files, fresh_entities, False
+            ).get_missing_entities(False),
+            refresh_entities,
+        ),
+    }
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measures the stages of turning the feed into the download plan"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=FEED_SIZES,
+        help="The numbers of the feed entries",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="pipeline_benchmark.json",
+        help="The file for the results (JSON)",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    results = []
+
+    print(f"{'feed size':>10} {'stage':>25} {'best time [s]':>15}")
+
+    for size in arguments.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            for stage, seconds in benchmark_size(size, directory).items():
+                print(f"{size:>10} {stage:>25} {seconds:>15.4f}")
+                results.append({"size": size, "stage": stage, "seconds": seconds})
+
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "repeats": REPEATS,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
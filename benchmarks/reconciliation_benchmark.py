@@ -0,0 +1,69 @@
+import random
+import time
+from functools import partial
+from typing import Callable, List
+
+from podcast_downloader.downloaded import get_last_downloaded_file_before_gap
+from podcast_downloader.reconciliation import reconcile
+from podcast_downloader.rss import RSSEntity
+
+FEED_SIZES = [100, 1_000, 5_000, 10_000]
+REPEATS = 3
+
+
+def build_feed(size: int) -> List[RSSEntity]:
+    return [
+        RSSEntity(
+            time.localtime(1_700_000_000 - index * 86_400),
+            f"Episode {size - index}",
+            "audio/mpeg",
+            f"http://www.p.com/episode{size - index:0>6}.mp3",
+        )
+        for index in range(size)
+    ]
+
+
+def to_file_name(entity: RSSEntity) -> str:
+    return entity.link.rpartition("/")[-1]
+
+
+def list_based_reconciliation(
+    directory_files: List[str], feed: List[RSSEntity]
+) -> None:
+    # the approach used before the reconciliation engine
+    all_feed_files = list(map(to_file_name, feed))[::-1]
+    downloaded_files = [file for file in all_feed_files if file in directory_files]
+    get_last_downloaded_file_before_gap(all_feed_files, downloaded_files)
+
+
+def set_based_reconciliation(directory_files: List[str], feed: List[RSSEntity]) -> None:
+    result = reconcile(to_file_name, set(directory_files), feed)
+    result.get_missing_entities(True)
+
+
+def measure(function: Callable[[], None]) -> float:
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'feed size':>10} {'list based [s]':>15} {'set based [s]':>15}")
+
+    for size in FEED_SIZES:
+        feed = build_feed(size)
+        # almost all files are downloaded, except the newest and a few in gaps
+        directory_files = [to_file_name(entity) for entity in feed[1:]]
+        random.shuffle(directory_files)
+        directory_files = directory_files[: int(size * 0.95)]
+
+        print(
+            f"{size:>10} "
+            f"{measure(partial(list_based_reconciliation, directory_files, feed)):>15.4f} "
+            f"{measure(partial(set_based_reconciliation, directory_files, feed)):>15.4f}"
+        )
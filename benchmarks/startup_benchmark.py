@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+REPEATS = 10
+
+# the modules which should not be loaded, when there is nothing to check
+HEAVY_MODULES = [
+    "feedparser",
+    "http.client",
+    "ssl",
+    "sqlite3",
+    "xml.etree.ElementTree",
+    "concurrent.futures",
+    "podcast_downloader.runner",
+]
+
+
+def write_configuration(directory: str, name: str, configuration: Dict) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(configuration, file)
+
+    return path
+
+
+def build_scenarios(directory: str) -> Dict[str, List[str]]:
+    invalid_configuration = write_configuration(
+        directory, "invalid.json", {"download_workers": 0, "podcasts": []}
+    )
+    disabled_configuration = write_configuration(
+        directory,
+        "disabled.json",
+        {
+            "podcasts": [
+                {
+                    "name": f"Podcast {number}",
+                    "rss_link": f"http://www.p.com/{number}.xml",
+                    "path": directory,
+                    "disable": True,
+                }
+                for number in range(20)
+            ]
+        },
+    )
+
+    return {
+        "interpreter": ["-c", "pass"],
+        "import_main": ["-c", "import podcast_downloader.__main__"],
+        "invalid_configuration": [
+            "-m",
+            "podcast_downloader",
+            "--config",
+            invalid_configuration,
+        ],
+        "all_disabled": [
+            "-m",
+            "podcast_downloader",
+            "--config",
+            disabled_configuration,
+        ],
+    }
+
+
+def measure(arguments: List[str], repeats: int) -> float:
+    best = float("inf")
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def get_loaded_heavy_modules() -> List[str]:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, podcast_downloader.__main__; print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+
+    return [module for module in HEAVY_MODULES if module in output]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measures the start of the script, when there is nothing to check"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=REPEATS,
+        help="The number of runs of each scenario (the best one is taken)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="startup_benchmark.json",
+        help="The file for the results (JSON)",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    results = []
+
+    print(f"{'scenario':>25} {'best time [ms]':>15}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario, scenario_arguments in build_scenarios(directory).items():
+            seconds = measure(scenario_arguments, arguments.repeats)
+            print(f"{scenario:>25} {seconds * 1000:>15.1f}")
+            results.append({"scenario": scenario, "seconds": seconds})
+
+    heavy_modules = get_loaded_heavy_modules()
+    print(
+        "Heavy modules loaded by the entry point: "
+        + (", ".join(heavy_modules) or "none")
+    )
+
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "repeats": arguments.repeats,
+                "results": results,
+                "heavy_modules": heavy_modules,
+            },
+            file,
+            indent=2,
+        )
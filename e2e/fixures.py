@@ -32,11 +32,15 @@ class FeedBuilder:
         self.httpserver = httpserver
         self.url_prefix = url_prefix or ""
         self.headers = None
+        self.response_headers = None
         self.title = None
 
     def set_request_headers(self, headers):
         self.headers = headers
 
+    def set_response_headers(self, headers):
+        self.response_headers = headers
+
     def set_title(self, title):
         self.title = title
 
@@ -109,9 +113,15 @@ class FeedBuilder:
             )
             fe.published(published_date)
 
+        if self.response_headers and "ETag" in self.response_headers:
+            self.httpserver.expect_request(
+                self.url_prefix + self.FEED_RSS_FILE_NAME,
+                headers={"If-None-Match": self.response_headers["ETag"]},
+            ).respond_with_data("", status=304)
+
         self.httpserver.expect_request(
             self.url_prefix + self.FEED_RSS_FILE_NAME
-        ).respond_with_data(fg.rss_str())
+        ).respond_with_data(fg.rss_str(), headers=self.response_headers)
 
     def get_feed_url(self) -> str:
         self.__fill_up_dates()
@@ -122,6 +132,13 @@ class FeedBuilder:
     def get_requested_files_list(self):
         return [log[0].path[1:] for log in self.httpserver.log]
 
+    def get_feed_responses_statuses(self):
+        return [
+            response.status_code
+            for request, response in self.httpserver.log
+            if request.path == self.url_prefix + self.FEED_RSS_FILE_NAME
+        ]
+
 
 class PodcastDirectory:
     def __init__(self, download_destination_directory: Path) -> None:
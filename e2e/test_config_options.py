@@ -1,7 +1,13 @@
+import json
+import os
+import subprocess
+import sys
+import time
 from functools import partial
 from itertools import chain
 from typing import Callable, Dict, List
 from e2e.fixures import (
+    DEFAULT_CONFIG_NAME,
     FeedBuilder,
     MultipleFeedBuilder,
     MultiplePodcastDirectory,
@@ -269,3 +275,878 @@ def test_configuration_fill_up_gaps_option(
             )
         ]
     )
+
+
+def test_configuration_download_workers_option(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "download_workers": 3,
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    podcast_directory.is_containing_only([file_name.lower() for file_name in mp3_files])
+
+    creation_times = [
+        os.stat(os.path.join(podcast_directory.path(), file_name.lower())).st_ctime_ns
+        for file_name in mp3_files
+    ]
+    assert creation_times == sorted(
+        creation_times
+    ), "The files should appear from the oldest to the newest episode"
+
+
+def test_configuration_download_delay_option(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file, 3)
+
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "download_workers": 3,
+            "download_delay": 1,
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    start = time.monotonic()
+    podcast_downloader.run()
+    elapsed = time.monotonic() - start
+
+    # Assert
+    podcast_directory.is_containing_only([file_name.lower() for file_name in mp3_files])
+    assert elapsed >= 2, "The downloads from the same host should wait for each other"
+    assert podcast_downloader.is_containing("is waiting")
+
+
+def test_configuration_download_rate_limit_option(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "download_workers": 2,
+            "download_rate_limit": 10_000_000,
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                    "download_rate_limit": 1_000_000,
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    podcast_directory.is_containing_only([file_name.lower() for file_name in mp3_files])
+
+
+def test_configuration_cache_directory_option_with_etag(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed.add_random_entries()
+    feed.set_response_headers({"ETag": '"' + generate_random_string() + '"'})
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+    podcast_downloader.run()
+
+    # Assert
+    assert feed.get_feed_responses_statuses() == [
+        200,
+        304,
+    ], "The second run should get the not modified response"
+    assert podcast_downloader.is_containing("the feed has not changed")
+
+
+def test_configuration_cache_directory_option_with_added_podcast(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed.add_random_entries()
+    feed.set_response_headers({"ETag": '"' + generate_random_string() + '"'})
+    first_podcast = {
+        "name": generate_random_string(),
+        "if_directory_empty": "download_last",
+        "path": podcast_directory_manager.get_first_directory(),
+        "rss_link": feed.get_feed_url(),
+    }
+
+    use_config(
+        {"cache_directory": str(tmp_path / "cache"), "podcasts": [first_podcast]}
+    )
+    podcast_downloader.run()
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "podcasts": [
+                first_podcast,
+                {
+                    **first_podcast,
+                    "path": podcast_directory_manager.get_second_directory(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    assert feed.get_feed_responses_statuses() == [
+        200,
+        200,
+    ], "The feed should be read again for the added podcast"
+    assert len(list(podcast_directory_manager.get_second_directory_files())) == 1
+
+
+def test_configuration_cache_directory_option_with_changed_podcast(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed.add_random_entries()
+    feed.set_response_headers({"ETag": '"' + generate_random_string() + '"'})
+    podcast = {
+        "name": generate_random_string(),
+        "if_directory_empty": "download_last",
+        "path": podcast_directory_manager.get_first_directory(),
+        "rss_link": feed.get_feed_url(),
+    }
+
+    use_config({"cache_directory": str(tmp_path / "cache"), "podcasts": [podcast]})
+    podcast_downloader.run()
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "podcasts": [
+                {**podcast, "path": podcast_directory_manager.get_second_directory()}
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    assert feed.get_feed_responses_statuses() == [
+        200,
+        200,
+    ], "The feed should be read again for the changed podcast"
+    assert len(list(podcast_directory_manager.get_second_directory_files())) == 1
+
+
+def test_configuration_cache_directory_option_with_feed_snapshot(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+    podcast_downloader.run()
+    for file_name in mp3_files:
+        os.remove(os.path.join(podcast_directory.path(), file_name.lower()))
+
+    # Act
+    podcast_downloader.run(
+        ["--config", str(tmp_path / DEFAULT_CONFIG_NAME), "--rescan"]
+    )
+
+    # Assert
+    assert feed.get_feed_responses_statuses() == [200, 200]
+    assert len(os.listdir(tmp_path / "cache" / "snapshots")) == 1
+    podcast_directory.is_containing_only([file_name.lower() for file_name in mp3_files])
+
+
+def test_configuration_cache_directory_option_with_max_age(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed.add_random_entries()
+    feed.set_response_headers({"Cache-Control": "public, max-age=3600"})
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+    podcast_downloader.run()
+
+    # Assert
+    assert feed.get_feed_responses_statuses() == [
+        200
+    ], "The fresh feed should not be requested again"
+
+
+def test_configuration_cache_directory_option_with_rescan(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    last_file_name = generate_random_mp3_file()
+
+    feed.add_random_entries()
+    feed.add_entry(file_name=last_file_name)
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    podcast_downloader.run()
+    os.remove(os.path.join(podcast_directory.path(), last_file_name.lower()))
+
+    # Act
+    podcast_downloader.run()
+    files_after_run_without_rescan = podcast_directory.get_files_list()
+
+    podcast_downloader.run(
+        ["--config", str(tmp_path / DEFAULT_CONFIG_NAME), "--rescan"]
+    )
+
+    # Assert
+    assert (
+        len(files_after_run_without_rescan) == 0
+    ), "The file removed by hand should not be noticed without rescan"
+    podcast_directory.is_containing_only([last_file_name.lower()])
+
+
+def test_configuration_streaming_parser_option(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "file_name_template": "[%publish_date%] %title%.%file_extension%",
+            "streaming_parser": True,
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    assert len(podcast_directory.get_files_list()) == len(mp3_files)
+    assert all(
+        file_name.startswith("[") and file_name.endswith(".mp3")
+        for file_name in podcast_directory.get_files_list()
+    )
+
+
+def test_configuration_streaming_parser_option_with_cache_directory(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    downloaded_files = call_n_times(generate_random_mp3_file)
+    new_files = call_n_times(generate_random_mp3_file)
+    for file_name in chain(downloaded_files, new_files):
+        feed.add_entry(file_name=file_name)
+
+    for file_name in downloaded_files:
+        podcast_directory.add_file(file_name)
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "streaming_parser": True,
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    podcast_directory.is_containing_only(
+        [file_name.lower() for file_name in chain(downloaded_files, new_files)]
+    )
+    snapshots_directory = tmp_path / "cache" / "snapshots"
+    assert not snapshots_directory.exists() or not os.listdir(
+        snapshots_directory
+    ), "The streamed feed should not be read whole for the snapshot"
+
+
+def test_timing_report_argument(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    report_path = tmp_path / "timing.json"
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run(
+        [
+            "--config",
+            str(tmp_path / DEFAULT_CONFIG_NAME),
+            "--timing_report",
+            str(report_path),
+        ]
+    )
+
+    # Assert
+    with open(report_path) as file:
+        report = json.load(file)
+
+    [feed_report] = report["feeds"]
+    assert feed_report["feed"] == feed.get_feed_url()
+    assert set(feed_report["phases"]) == {"fetch", "parse", "scan", "plan", "download"}
+    assert sorted(
+        download["file_name"] for download in feed_report["downloads"]
+    ) == sorted(file_name.lower() for file_name in mp3_files)
+    assert all(download["bytes"] > 0 for download in feed_report["downloads"])
+
+
+def test_daemon_argument(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_directory: PodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed.get_feed_url(),
+                }
+            ],
+        }
+    )
+
+    # Act
+    daemon = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "podcast_downloader",
+            "--config",
+            str(tmp_path / DEFAULT_CONFIG_NAME),
+            "--daemon",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    try:
+        deadline = time.monotonic() + 30
+        while (
+            len(list(podcast_directory.get_files_list())) < len(mp3_files)
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.1)
+
+        # Assert
+        assert daemon.poll() is None, "The daemon should keep running"
+    finally:
+        daemon.terminate()
+        output, _ = daemon.communicate(timeout=30)
+
+    podcast_directory.is_containing_only([file_name.lower() for file_name in mp3_files])
+    assert "Waiting for the next check" in output
+
+
+def test_configuration_deduplicate_episodes_option(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    mp3_files = call_n_times(generate_random_mp3_file)
+    for file_name in mp3_files:
+        feed.add_entry(file_name=file_name)
+
+    rss_link = feed.get_feed_url()
+
+    use_config(
+        {
+            "cache_directory": str(tmp_path / "cache"),
+            "deduplicate_episodes": True,
+            "download_workers": 1,
+            "podcasts": [
+                {
+                    "if_directory_empty": "download_all_from_feed",
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": rss_link,
+                },
+                {
+                    "if_directory_empty": "download_all_from_feed",
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": rss_link,
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    first_files = sorted(podcast_directory_manager.get_first_directory_files())
+    second_files = sorted(podcast_directory_manager.get_second_directory_files())
+
+    assert [path.name for path in first_files] == sorted(
+        file_name.lower() for file_name in mp3_files
+    )
+    assert [path.name for path in second_files] == [path.name for path in first_files]
+    assert all(
+        os.path.samefile(first, second)
+        for first, second in zip(first_files, second_files)
+    )
+
+    requested_files = feed.get_requested_files_list()
+    assert all(requested_files.count(file_name) == 1 for file_name in mp3_files)
+
+
+def test_configuration_feed_parse_workers_option(
+    httpserver,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    download_destination_directory,
+):
+    # Arrange
+    feeds = [FeedBuilder(httpserver, "/" + generate_random_string()) for _ in range(8)]
+    for feed in feeds:
+        feed.add_random_entries()
+
+    broken_feed_link = httpserver.url_for("/broken.xml")
+    httpserver.expect_request("/broken.xml").respond_with_data("<html><body>")
+
+    podcasts = []
+    for number, feed in enumerate(feeds):
+        podcast_path = download_destination_directory / str(number)
+        podcast_path.mkdir()
+        podcasts.append(
+            {
+                "if_directory_empty": "download_last",
+                "path": str(podcast_path),
+                "rss_link": feed.get_feed_url(),
+            }
+        )
+
+    use_config(
+        {
+            "feed_parse_workers": 2,
+            "podcasts": podcasts
+            + [
+                {
+                    "path": str(download_destination_directory),
+                    "rss_link": broken_feed_link,
+                }
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    assert all(
+        len(os.listdir(podcast["path"])) == 1 for podcast in podcasts
+    ), "Each podcast should have its last episode"
+    assert podcast_downloader.is_containing(
+        f"Error while checking the link: '{broken_feed_link}'"
+    )
+
+
+def test_only_argument(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed_builder_manager.first_feed.add_random_entries()
+    feed_builder_manager.second_feed.add_random_entries()
+
+    use_config(
+        {
+            "podcasts": [
+                {
+                    "name": "First podcast",
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": feed_builder_manager.first_feed.get_feed_url(),
+                },
+                {
+                    "name": "Second podcast",
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": feed_builder_manager.second_feed.get_feed_url(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run(
+        ["--config", str(tmp_path / DEFAULT_CONFIG_NAME), "--only", "second*"]
+    )
+
+    # Assert
+    assert len(list(podcast_directory_manager.get_first_directory_files())) == 0
+    assert len(list(podcast_directory_manager.get_second_directory_files())) == 1
+    assert feed_builder_manager.first_feed.get_feed_responses_statuses() == []
+
+
+def test_shard_argument(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feed_builder_manager.first_feed.add_random_entries()
+    feed_builder_manager.second_feed.add_random_entries()
+
+    use_config(
+        {
+            "podcasts": [
+                {
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": feed_builder_manager.first_feed.get_feed_url(),
+                },
+                {
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": feed_builder_manager.second_feed.get_feed_url(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    for shard in ["1/2", "2/2"]:
+        podcast_downloader.run(
+            ["--config", str(tmp_path / DEFAULT_CONFIG_NAME), "--shard", shard]
+        )
+
+    # Assert
+    assert len(list(podcast_directory_manager.get_first_directory_files())) == 1
+    assert len(list(podcast_directory_manager.get_second_directory_files())) == 1
+    assert feed_builder_manager.first_feed.get_feed_responses_statuses() == [200]
+    assert feed_builder_manager.second_feed.get_feed_responses_statuses() == [200]
+
+
+def test_configuration_coordination_database_option(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feeds = [feed_builder_manager.first_feed, feed_builder_manager.second_feed]
+    feeds_files = []
+    for feed in feeds:
+        feed_files = call_n_times(generate_random_mp3_file)
+        for file_name in feed_files:
+            feed.add_entry(file_name=file_name)
+
+        feeds_files.append(feed_files)
+
+    use_config(
+        {
+            "coordination_database": str(tmp_path / "shared" / "leases.sqlite"),
+            "feed_fetch_workers": 1,
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": feeds[0].get_feed_url(),
+                },
+                {
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": feeds[1].get_feed_url(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "podcast_downloader",
+                "--config",
+                str(tmp_path / DEFAULT_CONFIG_NAME),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(2)
+    ]
+
+    for worker in workers:
+        worker.communicate(timeout=60)
+
+    # Assert
+    assert all(worker.returncode == 0 for worker in workers)
+    first_files = list(podcast_directory_manager.get_first_directory_files())
+    second_files = list(podcast_directory_manager.get_second_directory_files())
+    assert len(first_files) == len(feeds_files[0])
+    assert len(second_files) == len(feeds_files[1])
+
+    # the server is shared, so its log has the requests of both feeds
+    requested_files = feeds[0].get_requested_files_list()
+    assert all(
+        len([path for path in requested_files if path.endswith("/" + file_name)]) == 1
+        for file_name in chain.from_iterable(feeds_files)
+    ), "Each file should be downloaded by one worker"
+
+
+def test_configuration_coordination_database_option_with_downloads_limit(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feeds = [feed_builder_manager.first_feed, feed_builder_manager.second_feed]
+    for feed in feeds:
+        feed.add_entry(file_name=generate_random_mp3_file())
+
+    use_config(
+        {
+            "coordination_database": str(tmp_path / "shared" / "leases.sqlite"),
+            "feed_fetch_workers": 1,
+            "downloads_limit": 1,
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": feeds[0].get_feed_url(),
+                },
+                {
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": feeds[1].get_feed_url(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    downloaded_files = list(
+        chain(
+            podcast_directory_manager.get_first_directory_files(),
+            podcast_directory_manager.get_second_directory_files(),
+        )
+    )
+    assert len(downloaded_files) == 1, "The limit is for the whole run of the worker"
+
+
+def test_timing_report_argument_with_coordination_database(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+    tmp_path,
+):
+    # Arrange
+    feeds = [feed_builder_manager.first_feed, feed_builder_manager.second_feed]
+    for feed in feeds:
+        feed.add_entry(file_name=generate_random_mp3_file())
+
+    report_path = tmp_path / "timing.json"
+    use_config(
+        {
+            "coordination_database": str(tmp_path / "shared" / "leases.sqlite"),
+            "feed_fetch_workers": 1,
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": feeds[0].get_feed_url(),
+                },
+                {
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": feeds[1].get_feed_url(),
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run(
+        [
+            "--config",
+            str(tmp_path / DEFAULT_CONFIG_NAME),
+            "--timing_report",
+            str(report_path),
+        ]
+    )
+
+    # Assert
+    with open(report_path) as file:
+        report = json.load(file)
+
+    assert sorted(feed_report["feed"] for feed_report in report["feeds"]) == sorted(
+        feed.get_feed_url() for feed in feeds
+    ), "The report should cover all the feeds taken by the worker"
@@ -2,13 +2,17 @@ from itertools import chain
 from typing import Callable, Dict, List
 from e2e.fixures import (
     FeedBuilder,
+    MultipleFeedBuilder,
+    MultiplePodcastDirectory,
     PodcastDirectory,
     PodcastDownloaderRunner,
     # fixures:
     download_destination_directory,
     feed,
+    feed_builder_manager,
     use_config,
     podcast_directory,
+    podcast_directory_manager,
     podcast_downloader,
 )
 from e2e.random import call_n_times, generate_random_mp3_file, generate_random_string
@@ -196,3 +200,122 @@ def test_configuration_ignore_option_display_feed_name(
     assert runner.is_highlighted_in_outcome(feed_title)
     assert runner.is_containing("Skipping the ")
     assert runner.is_containing(feed_title)
+
+
+def test_the_same_feed_used_by_many_podcasts(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory_manager: MultiplePodcastDirectory,
+):
+    # Arrange
+    feed.add_random_entries()
+    rss_link = feed.get_feed_url()
+
+    use_config(
+        {
+            "podcasts": [
+                {
+                    "if_directory_empty": "download_last",
+                    "path": podcast_directory_manager.get_first_directory(),
+                    "rss_link": rss_link,
+                },
+                {
+                    "if_directory_empty": "download_last",
+                    "path": podcast_directory_manager.get_second_directory(),
+                    "rss_link": rss_link,
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    assert len(list(podcast_directory_manager.get_first_directory_files())) == 1
+    assert len(list(podcast_directory_manager.get_second_directory_files())) == 1
+
+
+def test_many_podcasts_in_the_same_directory(
+    feed_builder_manager: MultipleFeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    first_feed_files = call_n_times(generate_random_mp3_file)
+    for file_name in first_feed_files:
+        feed_builder_manager.first_feed.add_entry(file_name=file_name)
+
+    second_feed_file = generate_random_string() + ".m4a"
+    feed_builder_manager.second_feed.add_entry(
+        file_name=second_feed_file, file_type="audio/mp4"
+    )
+
+    use_config(
+        {
+            "if_directory_empty": "download_all_from_feed",
+            "podcasts": [
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed_builder_manager.first_feed.get_feed_url(),
+                },
+                {
+                    "path": podcast_directory.path(),
+                    "rss_link": feed_builder_manager.second_feed.get_feed_url(),
+                    "podcast_extensions": {".m4a": "audio/mp4"},
+                },
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+    podcast_downloader.run()
+
+    # Assert
+    podcast_directory.is_containing_only(
+        [file_name.lower() for file_name in first_feed_files]
+        + [second_feed_file.lower()]
+    )
+    assert podcast_downloader.is_containing("Nothing new")
+
+
+def test_the_same_feed_used_by_many_podcasts_in_the_same_directory(
+    feed: FeedBuilder,
+    use_config: Callable[[Dict], None],
+    podcast_downloader: Callable[[List[str]], PodcastDownloaderRunner],
+    podcast_directory: PodcastDirectory,
+):
+    # Arrange
+    downloaded_file = generate_random_mp3_file()
+    new_files = [generate_random_mp3_file() for _ in range(3)]
+    for file_name in [downloaded_file] + new_files:
+        feed.add_entry(file_name=file_name)
+
+    podcast_directory.add_file(downloaded_file)
+    rss_link = feed.get_feed_url()
+
+    use_config(
+        {
+            "download_workers": 4,
+            "podcasts": [
+                {"path": podcast_directory.path(), "rss_link": rss_link},
+                {"path": podcast_directory.path(), "rss_link": rss_link},
+            ],
+        }
+    )
+
+    # Act
+    podcast_downloader.run()
+
+    # Assert
+    podcast_directory.is_containing_only(
+        [file_name.lower() for file_name in [downloaded_file] + new_files]
+    )
+    requested_files = feed.get_requested_files_list()
+    for file_name in new_files:
+        assert (
+            requested_files.count(file_name) == 1
+        ), "Each episode should be downloaded once"
@@ -1,63 +1,24 @@
-import os
-from typing import Callable, Dict, Iterable, List, Tuple
-import urllib
 import argparse
-import re
-import time
+import os
 import sys
+import time
+from logging import getLogger, StreamHandler, INFO
+from typing import Dict
 
-from functools import partial
 from . import configuration
+from .configuration import configuration_verification, load_configuration
+from .parameters import parse_argv
+from .selection import apply_selection, has_selection, parse_shard
+from .utils import ConsoleOutputFormatter
 
-from podcast_downloader.configuration import (
-    configuration_verification,
-    get_label_to_date,
-    get_n_age_date,
-    parse_day_label,
-)
-from .utils import ConsoleOutputFormatter, compose
-from .downloaded import (
-    get_downloaded_files,
-    get_extensions_checker,
-    get_last_downloaded_file_before_gap,
-)
-from .parameters import merge_parameters_collection, load_configuration_file, parse_argv
-from .rss import (
-    RSSEntity,
-    build_only_allowed_filter_for_link_data,
-    build_only_new_entities,
-    file_template_to_file_name,
-    flatten_rss_links_data,
-    get_feed_title_from_feed,
-    get_raw_rss_entries_from_feed,
-    limit_file_name,
-    load_feed,
-    only_entities_from_date,
-    only_last_n_entities,
-)
-
-
-def download_rss_entity_to_path(
-    headers: List[Tuple[str, str]],
-    to_file_name_function: Callable[[RSSEntity], str],
-    path: str,
-    rss_entity: RSSEntity,
-):
-    path_to_file = os.path.join(path, to_file_name_function(rss_entity))
-
-    try:
-        request = urllib.request.Request(rss_entity.link, headers=headers)
+# Only the light modules are imported here. The ones needed for checking the
+# feeds (the network, the parsers, the index) are loaded when there is
+# something to check, so the runs ending on the configuration are quick.
 
-        with urllib.request.urlopen(request) as response:
-            with open(path_to_file, "wb") as file:
-                file.write(response.read())
+DEFAULT_CONFIGURATION_FILE = "~/.podcast_downloader_config.json"
 
-    except Exception:
-        logger.exception(
-            'The podcast file "%s" could not be saved to disk "%s" due to the following error',
-            rss_entity.link,
-            path_to_file,
-        )
+# the messages of all the modules of the package go through this logger
+logger = getLogger("podcast_downloader")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -91,79 +52,63 @@ def build_parser() -> argparse.ArgumentParser:
         help="The waiting time (seconds) between downloads",
     )
 
-    return parser
-
-
-def configuration_to_function_on_empty_directory(
-    configuration_value: str, last_run_date: time.struct_time
-) -> Callable[[Iterable[RSSEntity]], Iterable[RSSEntity]]:
-    if configuration_value == "download_last":
-        return partial(only_last_n_entities, 1)
-
-    if configuration_value == "download_all_from_feed":
-        return lambda source: source
-
-    if configuration_value == "download_since_last_run":
-        if last_run_date:
-            return only_entities_from_date(last_run_date)
-
-        logger.error(
-            'The "download_since_last_run" require setup the "last_run_mark_file_path"'
-        )
-        raise Exception("Missing the last run mark file")
-
-    local_time = time.localtime()
-
-    from_n_day_match = re.match(r"^download_from_(\d+)_days$", configuration_value)
-    if from_n_day_match:
-        from_date = get_n_age_date(int(from_n_day_match[1]), local_time)
-        return only_entities_from_date(from_date)
-
-    last_n_episodes = re.match(r"^download_last_(\d+)_episodes", configuration_value)
-    if last_n_episodes:
-        download_limit = int(last_n_episodes[1])
-        return partial(only_last_n_entities, download_limit)
-
-    from_nth_day_match = re.match(r"^download_from_(.*)", configuration_value)
-    if from_nth_day_match:
-        day_label = parse_day_label(from_nth_day_match[1])
-
-        return only_entities_from_date(get_label_to_date(day_label)(local_time))
-
-    raise Exception(f"The value the '{configuration_value}' is not recognizable")
-
+    parser.add_argument(
+        "--download_workers",
+        required=False,
+        type=int,
+        help="The number of files downloaded at the same time",
+    )
 
-def is_windows_running():
-    return sys.platform == "win32"
+    parser.add_argument(
+        "--download_rate_limit",
+        required=False,
+        type=int,
+        help="The maximum speed (bytes per second) of all the downloads together",
+    )
 
+    parser.add_argument(
+        "--timing_report",
+        required=False,
+        type=str,
+        help="The path to the JSON file with the time spent in each phase",
+    )
 
-def get_system_file_name_limit(sub_configuration: Dict[str, str]) -> int:
-    # on Windows, the file name is limited to 260 characters including the path to it
-    return 255 if is_windows_running() else 260 - len(sub_configuration["path"]) - 1
+    parser.add_argument(
+        "--daemon",
+        required=False,
+        action="store_true",
+        help="Keep running and check each feed on its own interval",
+    )
 
+    parser.add_argument(
+        "--rescan",
+        required=False,
+        action="store_true",
+        help="Rebuild the index of downloaded files from the podcasts directories",
+    )
 
-def configuration_to_function_rss_to_name(
-    configuration_value: str, sub_configuration: Dict[str, str]
-) -> Callable[[RSSEntity], str]:
-    if (
-        configuration.CONFIG_PODCASTS_REQUIRE_DATE in sub_configuration
-        and configuration.CONFIG_FILE_NAME_TEMPLATE not in sub_configuration
-    ):
-        default_file_name_template_with_date = (
-            "[%publish_date%] %file_name%.%file_extension%"
-        )
+    parser.add_argument(
+        "--coordination_database",
+        required=False,
+        type=str,
+        help="The database shared by many workers checking the same podcasts",
+    )
 
-        if sub_configuration[configuration.CONFIG_PODCASTS_REQUIRE_DATE]:
-            configuration_value = default_file_name_template_with_date
+    parser.add_argument(
+        "--shard",
+        required=False,
+        type=parse_shard,
+        help="Check only the given part of the podcasts, e.g. 3/8 (split by the feed link)",
+    )
 
-        logger.warning(
-            'The option %s is deprecated, please replace use of it with the %s option: "%s"',
-            configuration.CONFIG_PODCASTS_REQUIRE_DATE,
-            configuration.CONFIG_FILE_NAME_TEMPLATE,
-            default_file_name_template_with_date,
-        )
+    parser.add_argument(
+        "--only",
+        required=False,
+        action="append",
+        help="Check only the podcasts with the matching name or link (glob, can be repeated)",
+    )
 
-    return partial(file_template_to_file_name, configuration_value)
+    return parser
 
 
 def load_the_last_run_date_store_now(marker_file_path, now):
@@ -191,193 +136,90 @@ def load_the_last_run_date_store_now(marker_file_path, now):
     return access_time
 
 
-if __name__ == "__main__":
-    import sys
-    from logging import getLogger, StreamHandler, INFO
+def has_anything_to_check(config: Dict, parameters: Dict) -> bool:
+    return parameters.get("daemon", False) or any(
+        not rss_source.get(configuration.CONFIG_PODCASTS_DISABLE, False)
+        for rss_source in config[configuration.CONFIG_PODCASTS]
+    )
+
 
-    logger = getLogger(__name__)
+def main() -> None:
     logger.setLevel(INFO)
     stdout_handler = StreamHandler(stream=sys.stdout)
     stdout_handler.setFormatter(ConsoleOutputFormatter())
     logger.addHandler(stdout_handler)
 
-    DEFAULT_CONFIGURATION = {
-        configuration.CONFIG_DOWNLOADS_LIMIT: sys.maxsize,
-        configuration.CONFIG_IF_DIRECTORY_EMPTY: "download_last",
-        configuration.CONFIG_PODCAST_EXTENSIONS: {".mp3": "audio/mpeg"},
-        configuration.CONFIG_FILE_NAME_TEMPLATE: "%file_name%.%file_extension%",
-        configuration.CONFIG_HTTP_HEADER: {"User-Agent": "podcast-downloader"},
-        configuration.CONFIG_FILL_UP_GAPS: False,
-        configuration.CONFIG_DOWNLOAD_DELAY: 0,
-        configuration.CONFIG_LAST_RUN_MARK_PATH: None,
-        configuration.CONFIG_PODCASTS: [],
-    }
-
-    PARAMETERS_CONFIGURATION = parse_argv(build_parser())
-
-    config_file_name = PARAMETERS_CONFIGURATION.get(
-        "config", "~/.podcast_downloader_config.json"
-    )
-    logger.info('Loading configuration (from file: "%s")', config_file_name)
-    CONFIGURATION_FROM_FILE = load_configuration_file(
-        os.path.expanduser(config_file_name)
-    )
+    parameters = parse_argv(build_parser())
 
-    CONFIGURATION = merge_parameters_collection(
-        DEFAULT_CONFIGURATION,
-        CONFIGURATION_FROM_FILE,
-        PARAMETERS_CONFIGURATION,
-    )
+    config_file_name = parameters.get("config", DEFAULT_CONFIGURATION_FILE)
+    logger.info('Loading configuration (from file: "%s")', config_file_name)
+    config = load_configuration(os.path.expanduser(config_file_name), parameters)
 
-    is_valid, error = configuration_verification(CONFIGURATION)
+    is_valid, error = configuration_verification(config)
     if not is_valid:
         logger.info("There is a problem with configuration file: %s", error)
-        exit(1)
-
-    RSS_SOURCES = CONFIGURATION[configuration.CONFIG_PODCASTS]
-    DOWNLOADS_LIMITS = CONFIGURATION[configuration.CONFIG_DOWNLOADS_LIMIT]
-    LAST_RUN_DATETIME = load_the_last_run_date_store_now(
-        CONFIGURATION[configuration.CONFIG_LAST_RUN_MARK_PATH], time.localtime()
-    )
-
-    for rss_source in RSS_SOURCES:
-        file_length_limit = get_system_file_name_limit(rss_source)
-        rss_source_name = rss_source.get(configuration.CONFIG_PODCASTS_NAME, None)
-        rss_source_path = os.path.expanduser(
-            rss_source[configuration.CONFIG_PODCASTS_PATH]
-        )
-        rss_source_link = rss_source[configuration.CONFIG_PODCASTS_RSS_LINK]
-        rss_disable = rss_source.get(configuration.CONFIG_PODCASTS_DISABLE, False)
-        rss_file_name_template_value = rss_source.get(
-            configuration.CONFIG_FILE_NAME_TEMPLATE,
-            CONFIGURATION[configuration.CONFIG_FILE_NAME_TEMPLATE],
-        )
-        rss_on_empty_directory = rss_source.get(
-            configuration.CONFIG_IF_DIRECTORY_EMPTY,
-            CONFIGURATION[configuration.CONFIG_IF_DIRECTORY_EMPTY],
-        )
-        rss_podcast_extensions = rss_source.get(
-            configuration.CONFIG_PODCAST_EXTENSIONS,
-            CONFIGURATION[configuration.CONFIG_PODCAST_EXTENSIONS],
-        )
-        rss_https_header = merge_parameters_collection(
-            CONFIGURATION[configuration.CONFIG_HTTP_HEADER],
-            rss_source.get(configuration.CONFIG_HTTP_HEADER, {}),
-        )
-        rss_fill_up_gaps = rss_source.get(
-            CONFIGURATION[configuration.CONFIG_FILL_UP_GAPS],
-            rss_source.get(configuration.CONFIG_FILL_UP_GAPS, False),
-        )
-        rss_download_delay = rss_source.get(
-            CONFIGURATION[configuration.CONFIG_DOWNLOAD_DELAY],
-            rss_source.get(configuration.CONFIG_DOWNLOAD_DELAY, 0),
+        sys.exit(1)
+
+    if has_selection(parameters):
+        all_podcasts_count = len(config[configuration.CONFIG_PODCASTS])
+        config = apply_selection(config, parameters)
+        logger.info(
+            "Selected %d of %d podcasts",
+            len(config[configuration.CONFIG_PODCASTS]),
+            all_podcasts_count,
         )
 
-        if rss_disable:
-            logger.info('Skipping the "%s"', rss_source_name or rss_source_link)
-            continue
-
-        feed = load_feed(rss_source_link)
-        if feed.bozo and len(feed.entries) == 0:
-            logger.error(
-                f"Error while checking the link: '{rss_source_link}': {feed['bozo_exception']}"
-            )
-            continue
-
-        if not rss_source_name:
-            rss_source_name = get_feed_title_from_feed(feed)
-
-        logger.info('Checking "%s"', rss_source_name)
-
-        to_name_function = configuration_to_function_rss_to_name(
-            rss_file_name_template_value, rss_source
-        )
-
-        on_empty_directory = configuration_to_function_on_empty_directory(
-            rss_on_empty_directory, LAST_RUN_DATETIME
-        )
+    last_run_datetime = load_the_last_run_date_store_now(
+        config[configuration.CONFIG_LAST_RUN_MARK_PATH], time.localtime()
+    )
 
-        downloaded_files = list(
-            get_downloaded_files(
-                get_extensions_checker(rss_podcast_extensions), rss_source_path
+    if not has_anything_to_check(config, parameters):
+        for rss_source in config[configuration.CONFIG_PODCASTS]:
+            logger.info(
+                'Skipping the "%s"',
+                rss_source.get(configuration.CONFIG_PODCASTS_NAME, None)
+                or rss_source[configuration.CONFIG_PODCASTS_RSS_LINK],
             )
-        )
-
-        allow_link_types = list(set(rss_podcast_extensions.values()))
 
-        all_feed_entries = compose(
-            list,
-            partial(filter, build_only_allowed_filter_for_link_data(allow_link_types)),
-            flatten_rss_links_data,
-            get_raw_rss_entries_from_feed,
-        )(feed)
+        logger.info("Finished")
+        return
 
-        to_real_podcast_file_name = compose(
-            partial(limit_file_name, file_length_limit), to_name_function
-        )
-
-        all_feed_files = list(map(to_real_podcast_file_name, all_feed_entries))[::-1]
-        downloaded_files = [feed for feed in all_feed_files if feed in downloaded_files]
+    from .runner import (
+        close_session,
+        open_session,
+        run_coordinated,
+        run_daemon,
+        report_timings,
+        run_podcasts,
+    )
+    from .timing import RunTimings
 
-        last_downloaded_file = None
-        if downloaded_files:
-            if rss_fill_up_gaps:
-                last_downloaded_file = get_last_downloaded_file_before_gap(
-                    all_feed_files, downloaded_files
-                )
-            else:
-                last_downloaded_file = downloaded_files[-1]
+    session = open_session(config, parameters, last_run_datetime)
 
-            download_limiter_function = partial(
-                build_only_new_entities(to_name_function), last_downloaded_file
+    try:
+        if parameters.get("daemon", False):
+            run_daemon(
+                session, os.path.expanduser(config_file_name), parameters, config
             )
+        elif config[configuration.CONFIG_COORDINATION_DATABASE]:
+            run_coordinated(session, config)
         else:
-            download_limiter_function = on_empty_directory
-
-        missing_files_links = compose(list, download_limiter_function)(all_feed_entries)
-
-        logger.info('Last downloaded file "%s"', last_downloaded_file or "<none>")
-
-        if missing_files_links:
-            download_podcast = partial(
-                download_rss_entity_to_path,
-                rss_https_header,
-                to_real_podcast_file_name,
+            timings = RunTimings()
+            run_podcasts(
+                session,
+                config,
+                config[configuration.CONFIG_PODCASTS],
+                timings,
+                config[configuration.CONFIG_DOWNLOADS_LIMIT],
             )
-
-            first_element = True
-            for rss_entry in reversed(missing_files_links):
-                if rss_download_delay > 0:
-                    if not first_element:
-                        logger.info(
-                            "The download is sleeping (%d second)", rss_download_delay
-                        )
-                        time.sleep(rss_download_delay)
-                        first_element = False
-
-                wanted_podcast_file_name = to_name_function(rss_entry)
-                if wanted_podcast_file_name in downloaded_files:
-                    continue
-
-                if DOWNLOADS_LIMITS == 0:
-                    continue
-
-                if len(wanted_podcast_file_name) > file_length_limit:
-                    logger.info(
-                        'Your system cannot support the full podcast file name "%s". The name will be shortened',
-                        wanted_podcast_file_name,
-                    )
-
-                logger.info(
-                    '%s: Downloading file: "%s" saved as "%s"',
-                    rss_source_name,
-                    rss_entry.link,
-                    to_real_podcast_file_name(rss_entry),
-                )
-
-                download_podcast(rss_source_path, rss_entry)
-                DOWNLOADS_LIMITS -= 1
-        else:
-            logger.info("%s: Nothing new", rss_source_name)
+            report_timings(session, timings)
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+    finally:
+        close_session(session)
 
     logger.info("Finished")
+
+
+if __name__ == "__main__":
+    main()
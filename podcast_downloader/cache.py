@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+FEED_VALIDATORS_FILE_NAME = "feeds.json"
+
+VALIDATOR_ETAG = "etag"
+VALIDATOR_LAST_MODIFIED = "last_modified"
+VALIDATOR_EXPIRES = "expires"
+VALIDATOR_SETTINGS = "settings"
+
+
+def get_max_age(cache_control: str) -> Optional[int]:
+    directives = [directive.strip().lower() for directive in cache_control.split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+
+    for directive in directives:
+        match = re.match(r"^max-age=(\d+)$", directive)
+        if match:
+            return int(match[1])
+
+    return None
+
+
+def parse_http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def get_expires(headers: Dict[str, str], now: float) -> Optional[float]:
+    # The Expires header is used only without the max-age (which takes
+    # precedence). It is counted from the server's Date, so the clocks of
+    # the server and this machine do not have to agree.
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return None
+
+    expires = parse_http_date(headers.get("expires", ""))
+    if expires is None:
+        return None
+
+    server_now = parse_http_date(headers.get("date", "")) or now
+    return now + expires - server_now
+
+
+def build_feed_validators(headers: Dict[str, str], now: float) -> Dict:
+    validators = {}
+
+    if "etag" in headers:
+        validators[VALIDATOR_ETAG] = headers["etag"]
+
+    if "last-modified" in headers:
+        validators[VALIDATOR_LAST_MODIFIED] = headers["last-modified"]
+
+    max_age = get_max_age(headers.get("cache-control", ""))
+    if max_age:
+        age = headers.get("age", "0")
+        validators[VALIDATOR_EXPIRES] = (
+            now + max_age - (int(age) if age.isdigit() else 0)
+        )
+    elif max_age is None:
+        expires = get_expires(headers, now)
+        if expires is not None and expires > now:
+            validators[VALIDATOR_EXPIRES] = expires
+
+    return validators
+
+
+def build_conditional_headers(validators: Dict) -> Dict[str, str]:
+    headers = {}
+
+    if VALIDATOR_ETAG in validators:
+        headers["If-None-Match"] = validators[VALIDATOR_ETAG]
+
+    if VALIDATOR_LAST_MODIFIED in validators:
+        headers["If-Modified-Since"] = validators[VALIDATOR_LAST_MODIFIED]
+
+    return headers
+
+
+def get_settings_fingerprint(podcasts_settings: List[Dict]) -> str:
+    # the order of the podcasts in the configuration does not matter
+    serialized = sorted(
+        json.dumps(settings, sort_keys=True) for settings in podcasts_settings
+    )
+    return hashlib.sha256("\n".join(serialized).encode("utf-8")).hexdigest()
+
+
+def is_fresh(validators: Dict, now: float) -> bool:
+    return validators.get(VALIDATOR_EXPIRES, 0) > now
+
+
+class FeedValidatorsStore:
+    # Keeps the ETag, Last-Modified and expiration time of every feed between
+    # the runs. Without the cache directory, the store is empty and not saved.
+    # The validators are kept with the fingerprint of the settings of the
+    # podcasts using the feed; when they change (e.g. a podcast is added, or
+    # its path is changed), the feed has to be read and checked again.
+
+    def __init__(self, cache_directory: Optional[str]) -> None:
+        self.file_path = (
+            os.path.join(cache_directory, FEED_VALIDATORS_FILE_NAME)
+            if cache_directory
+            else None
+        )
+        self.lock = threading.Lock()
+        self.feeds = {}
+
+        if self.file_path and os.path.isfile(self.file_path):
+            with open(self.file_path, mode="r", encoding="utf-8") as file:
+                self.feeds = json.load(file)
+
+    def get(self, link: str, settings: Optional[str] = None) -> Dict:
+        with self.lock:
+            validators = self.feeds.get(link, {})
+            if settings is not None and validators.get(VALIDATOR_SETTINGS) != settings:
+                return {}
+
+            return dict(validators)
+
+    def update(self, link: str, validators: Dict, settings: str) -> None:
+        with self.lock:
+            self.feeds[link] = {**validators, VALIDATOR_SETTINGS: settings}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.feeds = {}
+
+    def save(self) -> None:
+        if not self.file_path:
+            return
+
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with self.lock:
+            with open(self.file_path, mode="w", encoding="utf-8") as file:
+                json.dump(self.feeds, file)
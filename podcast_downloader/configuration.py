@@ -1,8 +1,12 @@
 from functools import partial
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 from datetime import datetime, timedelta
+import sys
 import time
 
+from .politeness import DELAY_SCOPE_HOST, DELAY_SCOPES
+from .parameters import load_configuration_file, merge_parameters_collection
+
 SECONDS_IN_DAY = 24 * 60 * 60
 
 CONFIG_IF_DIRECTORY_EMPTY = "if_directory_empty"
@@ -12,7 +16,21 @@ CONFIG_PODCAST_EXTENSIONS = "podcast_extensions"
 CONFIG_HTTP_HEADER = "http_headers"
 CONFIG_FILL_UP_GAPS = "fill_up_gaps"
 CONFIG_DOWNLOAD_DELAY = "download_delay"
+CONFIG_DOWNLOAD_DELAY_SCOPE = "download_delay_scope"
+CONFIG_DOWNLOAD_WORKERS = "download_workers"
+CONFIG_FEED_FETCH_WORKERS = "feed_fetch_workers"
+CONFIG_FEED_FETCH_WORKERS_PER_HOST = "feed_fetch_workers_per_host"
+CONFIG_FEED_PARSE_WORKERS = "feed_parse_workers"
+CONFIG_CONNECTIONS_PER_HOST = "connections_per_host"
 CONFIG_LAST_RUN_MARK_PATH = "last_run_mark_file_path"
+CONFIG_CACHE_DIRECTORY = "cache_directory"
+CONFIG_FEED_SNAPSHOTS_SIZE = "feed_snapshots_size"
+CONFIG_DEDUPLICATE_EPISODES = "deduplicate_episodes"
+CONFIG_STREAMING_PARSER = "streaming_parser"
+CONFIG_UPDATE_INTERVAL = "update_interval"
+CONFIG_DOWNLOAD_RATE_LIMIT = "download_rate_limit"
+CONFIG_COORDINATION_DATABASE = "coordination_database"
+CONFIG_LEASE_SECONDS = "lease_seconds"
 
 CONFIG_PODCASTS = "podcasts"
 CONFIG_PODCASTS_NAME = "name"
@@ -21,6 +39,31 @@ CONFIG_PODCASTS_RSS_LINK = "rss_link"
 CONFIG_PODCASTS_REQUIRE_DATE = "require_date"
 CONFIG_PODCASTS_DISABLE = "disable"
 
+DEFAULT_CONFIGURATION = {
+    CONFIG_DOWNLOADS_LIMIT: sys.maxsize,
+    CONFIG_IF_DIRECTORY_EMPTY: "download_last",
+    CONFIG_PODCAST_EXTENSIONS: {".mp3": "audio/mpeg"},
+    CONFIG_FILE_NAME_TEMPLATE: "%file_name%.%file_extension%",
+    CONFIG_HTTP_HEADER: {"User-Agent": "podcast-downloader"},
+    CONFIG_FILL_UP_GAPS: False,
+    CONFIG_DOWNLOAD_DELAY: 0,
+    CONFIG_DOWNLOAD_DELAY_SCOPE: DELAY_SCOPE_HOST,
+    CONFIG_DOWNLOAD_WORKERS: 1,
+    CONFIG_FEED_FETCH_WORKERS: 4,
+    CONFIG_FEED_FETCH_WORKERS_PER_HOST: 2,
+    CONFIG_FEED_PARSE_WORKERS: 1,
+    CONFIG_CONNECTIONS_PER_HOST: 4,
+    CONFIG_LAST_RUN_MARK_PATH: None,
+    CONFIG_CACHE_DIRECTORY: None,
+    CONFIG_FEED_SNAPSHOTS_SIZE: 50,
+    CONFIG_DEDUPLICATE_EPISODES: False,
+    CONFIG_STREAMING_PARSER: False,
+    CONFIG_UPDATE_INTERVAL: 60 * 60,
+    CONFIG_COORDINATION_DATABASE: None,
+    CONFIG_LEASE_SECONDS: 5 * 60,
+    CONFIG_PODCASTS: [],
+}
+
 WEEK_DAYS = (
     "Monday",
     "Tuesday",
@@ -32,7 +75,39 @@ WEEK_DAYS = (
 )
 
 
+def load_configuration(config_file_path: str, parameters: Dict) -> Dict:
+    return merge_parameters_collection(
+        DEFAULT_CONFIGURATION,
+        load_configuration_file(config_file_path),
+        parameters,
+    )
+
+
+def is_positive_number(value) -> bool:
+    return isinstance(value, int) and value > 0
+
+
 def configuration_verification(config: dict) -> Tuple[bool, List[str]]:
+    for option in (
+        CONFIG_DOWNLOAD_WORKERS,
+        CONFIG_FEED_FETCH_WORKERS,
+        CONFIG_FEED_FETCH_WORKERS_PER_HOST,
+        CONFIG_FEED_PARSE_WORKERS,
+        CONFIG_CONNECTIONS_PER_HOST,
+        CONFIG_UPDATE_INTERVAL,
+        CONFIG_DOWNLOAD_RATE_LIMIT,
+        CONFIG_FEED_SNAPSHOTS_SIZE,
+        CONFIG_LEASE_SECONDS,
+    ):
+        if not is_positive_number(config.get(option, 1)):
+            return False, f"The {option} must be a positive number"
+
+    if config.get(CONFIG_DOWNLOAD_DELAY_SCOPE, DELAY_SCOPE_HOST) not in DELAY_SCOPES:
+        return (
+            False,
+            f"The {CONFIG_DOWNLOAD_DELAY_SCOPE} must be one of: {', '.join(DELAY_SCOPES)}",
+        )
+
     for podcast in config[CONFIG_PODCASTS]:
         if not CONFIG_PODCASTS_PATH in podcast:
             return (
@@ -46,6 +121,26 @@ def configuration_verification(config: dict) -> Tuple[bool, List[str]]:
                 f"There is no RSS link for podcast {podcast[CONFIG_PODCASTS_NAME]}",
             )
 
+        for option in (
+            CONFIG_DOWNLOAD_WORKERS,
+            CONFIG_UPDATE_INTERVAL,
+            CONFIG_DOWNLOAD_RATE_LIMIT,
+        ):
+            if not is_positive_number(podcast.get(option, 1)):
+                return (
+                    False,
+                    f"The {option} must be a positive number for podcast {podcast.get(CONFIG_PODCASTS_NAME, podcast[CONFIG_PODCASTS_RSS_LINK])}",
+                )
+
+        if (
+            podcast.get(CONFIG_DOWNLOAD_DELAY_SCOPE, DELAY_SCOPE_HOST)
+            not in DELAY_SCOPES
+        ):
+            return (
+                False,
+                f"The {CONFIG_DOWNLOAD_DELAY_SCOPE} must be one of: {', '.join(DELAY_SCOPES)} for podcast {podcast.get(CONFIG_PODCASTS_NAME, podcast[CONFIG_PODCASTS_RSS_LINK])}",
+            )
+
     return True, None
 
 
@@ -0,0 +1,116 @@
+import os
+import random
+from typing import Dict, Iterable, List, Optional
+
+from .cache import VALIDATOR_EXPIRES
+
+MINIMUM_UPDATE_INTERVAL = 60
+UPDATE_INTERVAL_JITTER = 0.1
+CONFIGURATION_CHECK_INTERVAL = 30
+
+SECONDS_IN_MINUTE = 60
+SYNDICATION_PERIODS = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+    "monthly": 30 * 24 * 60 * 60,
+    "yearly": 365 * 24 * 60 * 60,
+}
+# the channel elements (named as in feedparser) telling how often to check
+UPDATE_HINTS = ("ttl", "sy_updateperiod", "sy_updatefrequency")
+
+
+def to_positive_number(value: Optional[str]) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+
+    return number if number > 0 else None
+
+
+def get_update_hints(channel: Dict[str, str]) -> Dict[str, str]:
+    return {key: channel[key] for key in UPDATE_HINTS if key in channel}
+
+
+def get_channel_update_interval(channel: Dict[str, str]) -> Optional[float]:
+    # the <ttl> is given in minutes, the syndication module gives the number
+    # of updates in the period
+    intervals = []
+
+    ttl = to_positive_number(channel.get("ttl"))
+    if ttl:
+        intervals.append(ttl * SECONDS_IN_MINUTE)
+
+    period = SYNDICATION_PERIODS.get(channel.get("sy_updateperiod", "").lower())
+    if period:
+        intervals.append(
+            period / (to_positive_number(channel.get("sy_updatefrequency")) or 1)
+        )
+
+    return max(intervals, default=None)
+
+
+def get_cache_update_interval(validators: Dict, now: float) -> Optional[float]:
+    expires = validators.get(VALIDATOR_EXPIRES)
+    if expires is None or expires <= now:
+        return None
+
+    return expires - now
+
+
+def get_update_interval(
+    configured_interval: Optional[int],
+    default_interval: int,
+    channel: Dict[str, str],
+    validators: Dict,
+    now: float,
+) -> float:
+    # the podcast's own setting wins, then the hints from the feed itself
+    if configured_interval:
+        return configured_interval
+
+    hints = [
+        interval
+        for interval in (
+            get_channel_update_interval(channel),
+            get_cache_update_interval(validators, now),
+        )
+        if interval is not None
+    ]
+
+    return max(max(hints, default=default_interval), MINIMUM_UPDATE_INTERVAL)
+
+
+class FeedScheduler:
+    # Keeps the time of the next check for each feed. The intervals are
+    # shifted randomly, so the feeds added at once are not checked at once.
+
+    def __init__(
+        self, jitter: float = UPDATE_INTERVAL_JITTER, generator: random.Random = None
+    ) -> None:
+        self.jitter = jitter
+        self.generator = generator or random.Random()
+        self.next_checks: Dict[str, float] = {}
+
+    def schedule(self, link: str, interval: float, now: float) -> None:
+        self.next_checks[link] = now + interval * self.generator.uniform(
+            1 - self.jitter, 1 + self.jitter
+        )
+
+    def keep_only(self, links: Iterable[str], now: float) -> None:
+        # the new feeds are checked at once, the removed ones are forgotten
+        self.next_checks = {link: self.next_checks.get(link, now) for link in links}
+
+    def get_due(self, now: float) -> List[str]:
+        return [link for link, time in self.next_checks.items() if time <= now]
+
+    def get_next_check(self) -> Optional[float]:
+        return min(self.next_checks.values(), default=None)
+
+
+def get_modification_time(file_path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return None
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .download import ContentHash, remove_if_exists, to_partial_file_path
+
+EPISODES_REGISTRY_FILE_NAME = "episodes.sqlite"
+
+
+class EpisodeRegistry:
+    # The downloaded files with their links and the hashes of their content.
+    # Without the database path, it is kept only for the current run.
+
+    def __init__(self, database_path: Optional[str] = None) -> None:
+        if database_path:
+            os.makedirs(os.path.dirname(database_path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            database_path or ":memory:", check_same_thread=False
+        )
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS episodes ("
+                "path TEXT PRIMARY KEY, link TEXT NOT NULL, "
+                "content_hash TEXT NOT NULL, size INTEGER NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS episodes_link ON episodes (link)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS episodes_content "
+                "ON episodes (content_hash, size)"
+            )
+
+    def find_by_link(self, link: str) -> List[Tuple[str, int]]:
+        with self.lock:
+            return self.connection.execute(
+                "SELECT path, size FROM episodes WHERE link = ? ORDER BY rowid DESC",
+                (link,),
+            ).fetchall()
+
+    def find_by_content(self, content_hash: str, size: int) -> List[Tuple[str, int]]:
+        with self.lock:
+            return self.connection.execute(
+                "SELECT path, size FROM episodes "
+                "WHERE content_hash = ? AND size = ? ORDER BY rowid DESC",
+                (content_hash, size),
+            ).fetchall()
+
+    def add(self, path: str, link: str, content_hash: str, size: int) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO episodes (path, link, content_hash, size) "
+                "VALUES (?, ?, ?, ?)",
+                (path, link, content_hash, size),
+            )
+
+    def remove(self, path: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM episodes WHERE path = ?", (path,))
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def link_or_copy(source: str, target: str, allow_copy: bool) -> bool:
+    # The hard link takes no space. It is not possible between the disks,
+    # then the file is copied (when it is still better than downloading).
+    try:
+        os.link(source, target)
+        return True
+    except FileNotFoundError:
+        raise
+    except OSError:
+        if not allow_copy:
+            return False
+
+    shutil.copyfile(source, target)
+    return True
+
+
+class EpisodeDeduplicator:
+    # The file is not downloaded, when the same link has been downloaded
+    # before: the existing file is linked instead. The files with the same
+    # content (under the different links) are recognized by the hash counted
+    # during the download, the new copy is replaced by the link then.
+
+    def __init__(self, registry: EpisodeRegistry) -> None:
+        self.registry = registry
+        self.lock = threading.Lock()
+        self.link_locks: Dict[str, threading.Lock] = {}
+
+    def get_link_lock(self, link: str) -> threading.Lock:
+        # the same link downloaded for two podcasts at once is downloaded once
+        with self.lock:
+            return self.link_locks.setdefault(link, threading.Lock())
+
+    def link_known_file(
+        self,
+        known_files: List[Tuple[str, int]],
+        path_to_file: str,
+        allow_copy: bool,
+    ) -> Optional[str]:
+        target = to_partial_file_path(path_to_file)
+        temporary_target = target + ".link"
+        remove_if_exists(temporary_target)
+
+        for known_path, size in known_files:
+            if known_path == path_to_file:
+                continue
+
+            # the file from this run can be still waiting for its publication
+            for source in (known_path, to_partial_file_path(known_path)):
+                try:
+                    if os.path.getsize(source) != size:
+                        continue
+
+                    if link_or_copy(source, temporary_target, allow_copy):
+                        os.replace(temporary_target, target)
+                        return known_path
+                except FileNotFoundError:
+                    continue
+
+            if not os.path.exists(known_path) and not os.path.exists(
+                to_partial_file_path(known_path)
+            ):
+                self.registry.remove(known_path)
+
+        return None
+
+    def download(
+        self,
+        download_file: Callable[[Optional[ContentHash]], int],
+        link: str,
+        path_to_file: str,
+    ) -> Tuple[int, Optional[str]]:
+        # gives the number of downloaded bytes and the path of the linked file
+        path_to_file = os.path.abspath(path_to_file)
+
+        with self.get_link_lock(link):
+            known_path = self.link_known_file(
+                self.registry.find_by_link(link), path_to_file, True
+            )
+            if known_path:
+                return 0, known_path
+
+            content_hash = hashlib.sha256()
+            downloaded_bytes = download_file(content_hash)
+            size = os.path.getsize(to_partial_file_path(path_to_file))
+
+            known_path = self.link_known_file(
+                self.registry.find_by_content(content_hash.hexdigest(), size),
+                path_to_file,
+                False,
+            )
+            self.registry.add(path_to_file, link, content_hash.hexdigest(), size)
+
+            return downloaded_bytes, known_path
@@ -0,0 +1,331 @@
+import os
+import re
+import threading
+import urllib.error
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Optional,
+    TypeVar,
+)
+
+from .throttle import Throttle
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PARTIAL_FILE_EXTENSION = ".part"
+RESUME_VALIDATOR_EXTENSION = ".validator"
+
+HTTP_PARTIAL_CONTENT = 206
+HTTP_RANGE_NOT_SATISFIABLE = 416
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# the object from hashlib, e.g. hashlib.sha256()
+ContentHash = Any
+
+
+def to_partial_file_path(path_to_file: str) -> str:
+    return path_to_file + PARTIAL_FILE_EXTENSION
+
+
+def to_resume_validator_path(path_to_file: str) -> str:
+    return to_partial_file_path(path_to_file) + RESUME_VALIDATOR_EXTENSION
+
+
+def copy_in_chunks(
+    source: BinaryIO,
+    destination: BinaryIO,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    throttle: Optional[Throttle] = None,
+    content_hash: Optional[ContentHash] = None,
+) -> int:
+    copied_bytes = 0
+
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return copied_bytes
+
+        if throttle:
+            throttle(len(chunk))
+
+        if content_hash:
+            content_hash.update(chunk)
+
+        destination.write(chunk)
+        copied_bytes += len(chunk)
+
+
+def remove_if_exists(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def remove_partial_file(path_to_file: str) -> None:
+    remove_if_exists(to_partial_file_path(path_to_file))
+    remove_if_exists(to_resume_validator_path(path_to_file))
+
+
+def save_stream_to_partial_file(
+    source: BinaryIO,
+    path_to_file: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    append: bool = False,
+    throttle: Optional[Throttle] = None,
+    content_hash: Optional[ContentHash] = None,
+) -> int:
+    with open(to_partial_file_path(path_to_file), "ab" if append else "wb") as file:
+        return copy_in_chunks(source, file, chunk_size, throttle, content_hash)
+
+
+def update_hash_from_file(content_hash: ContentHash, file_path: str) -> None:
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+            content_hash.update(chunk)
+
+
+def commit_partial_file(path_to_file: str) -> None:
+    os.replace(to_partial_file_path(path_to_file), path_to_file)
+    remove_if_exists(to_resume_validator_path(path_to_file))
+
+
+def get_resume_validator(headers) -> Optional[str]:
+    # the If-Range requires the strong ETag, otherwise the date is used
+    if headers.get("Accept-Ranges", "bytes").lower() == "none":
+        return None
+
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return headers.get("Last-Modified")
+
+
+def store_resume_validator(path_to_file: str, headers) -> None:
+    validator = get_resume_validator(headers)
+    if validator is None:
+        remove_if_exists(to_resume_validator_path(path_to_file))
+        return
+
+    with open(to_resume_validator_path(path_to_file), "w", encoding="utf-8") as file:
+        file.write(validator)
+
+
+def build_resume_headers(path_to_file: str) -> Dict[str, str]:
+    partial_file_path = to_partial_file_path(path_to_file)
+    validator_path = to_resume_validator_path(path_to_file)
+
+    if not os.path.isfile(partial_file_path) or not os.path.isfile(validator_path):
+        return {}
+
+    partial_file_size = os.path.getsize(partial_file_path)
+    if partial_file_size == 0:
+        return {}
+
+    with open(validator_path, "r", encoding="utf-8") as file:
+        validator = file.read()
+
+    return {"Range": f"bytes={partial_file_size}-", "If-Range": validator}
+
+
+def get_content_range_start(content_range: Optional[str]) -> Optional[int]:
+    match = re.match(r"^bytes (\d+)-", content_range or "")
+    return int(match[1]) if match else None
+
+
+def download_to_partial_file(
+    open_link: Callable[[str, Dict[str, str]], ContextManager],
+    headers: Dict[str, str],
+    link: str,
+    path_to_file: str,
+    throttle: Optional[Throttle] = None,
+    content_hash: Optional[ContentHash] = None,
+) -> int:
+    # The partial file is kept after a failure, when the server will allow
+    # to continue it (the file has the validator for the If-Range header).
+    # Then the next attempt asks only for the missing bytes.
+    resume_headers = build_resume_headers(path_to_file)
+
+    try:
+        with open_link(link, {**headers, **resume_headers}) as response:
+            is_resumed = (
+                bool(resume_headers) and response.status == HTTP_PARTIAL_CONTENT
+            )
+
+            if is_resumed:
+                partial_file_size = os.path.getsize(to_partial_file_path(path_to_file))
+                content_range_start = get_content_range_start(
+                    response.headers.get("Content-Range")
+                )
+                if content_range_start != partial_file_size:
+                    remove_partial_file(path_to_file)
+                    raise ValueError(
+                        f"The server returned the unexpected range: {content_range_start}, instead of {partial_file_size}"
+                    )
+
+                if content_hash:
+                    # the hash covers the whole file, with the part kept before
+                    update_hash_from_file(
+                        content_hash, to_partial_file_path(path_to_file)
+                    )
+            else:
+                store_resume_validator(path_to_file, response.headers)
+
+            return save_stream_to_partial_file(
+                response,
+                path_to_file,
+                append=is_resumed,
+                throttle=throttle,
+                content_hash=content_hash,
+            )
+    except urllib.error.HTTPError as error:
+        if resume_headers and error.code == HTTP_RANGE_NOT_SATISFIABLE:
+            remove_partial_file(path_to_file)
+            return download_to_partial_file(
+                open_link, headers, link, path_to_file, throttle, content_hash
+            )
+
+        # the other errors (e.g. 503) do not say anything about the part
+        # already downloaded, it is resumed next time
+        raise
+    except BaseException:
+        if not os.path.isfile(to_resume_validator_path(path_to_file)):
+            remove_partial_file(path_to_file)
+
+        raise
+
+
+class DownloadJob:
+    def __init__(
+        self,
+        download: Callable[[], T],
+        publish: Callable[[T], R],
+        get_start_delay: Optional[Callable[[], float]],
+        future: Future,
+    ) -> None:
+        self.download = download
+        self.publish = publish
+        self.get_start_delay = get_start_delay
+        self.future = future
+        self.is_done = False
+        self.result = None
+        self.error = None
+
+
+class DownloadSequence:
+    # The transfers run concurrently (up to the given number of workers),
+    # but the results are published in the order of submission. That way
+    # the files appear on the disk from the oldest to the newest episode.
+    # The transfers waiting for their slot (or for their turn on the server)
+    # are kept out of the pool, so they do not hold the threads shared with
+    # the other podcasts.
+
+    def __init__(self, queue: "DownloadQueue", workers: int) -> None:
+        self.queue = queue
+        self.free_slots = workers
+        self.lock = threading.Lock()
+        self.publish_lock = threading.Lock()
+        self.waiting: Deque[DownloadJob] = deque()
+        self.unpublished: Deque[DownloadJob] = deque()
+
+    def submit(
+        self,
+        download: Callable[[], T],
+        publish: Callable[[T], R],
+        get_start_delay: Optional[Callable[[], float]] = None,
+    ) -> Future:
+        job = DownloadJob(
+            download, publish, get_start_delay, self.queue.track(Future())
+        )
+
+        with self.lock:
+            self.waiting.append(job)
+            self.unpublished.append(job)
+
+        self.dispatch()
+        return job.future
+
+    def dispatch(self) -> None:
+        with self.lock:
+            jobs = []
+            while self.free_slots and self.waiting:
+                self.free_slots -= 1
+                jobs.append(self.waiting.popleft())
+
+        for job in jobs:
+            # the delay is asked for when the job can start, so the turns are
+            # given in the order of the starts
+            delay = job.get_start_delay() if job.get_start_delay else 0
+            self.queue.start(partial(self.run, job), delay)
+
+    def run(self, job: DownloadJob) -> None:
+        try:
+            job.result = job.download()
+        except BaseException as error:
+            job.error = error
+
+        with self.lock:
+            job.is_done = True
+            self.free_slots += 1
+
+        self.dispatch()
+        self.publish_finished()
+
+    def publish_finished(self) -> None:
+        # the finished jobs are published by the thread which has finished
+        # the oldest of them, the others go on with the next transfers
+        with self.publish_lock:
+            while True:
+                with self.lock:
+                    if not self.unpublished or not self.unpublished[0].is_done:
+                        return
+
+                    job = self.unpublished.popleft()
+
+                if job.error is not None:
+                    job.future.set_exception(job.error)
+                    continue
+
+                try:
+                    job.future.set_result(job.publish(job.result))
+                except BaseException as error:
+                    job.future.set_exception(error)
+
+
+class DownloadQueue:
+    def __init__(self, workers: int) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="download"
+        )
+        self.futures = []
+
+    def start_sequence(self, workers: int) -> DownloadSequence:
+        return DownloadSequence(self, workers)
+
+    def track(self, future: Future) -> Future:
+        self.futures.append(future)
+        return future
+
+    def start(self, job: Callable[[], None], delay: float = 0) -> None:
+        if delay <= 0:
+            self.executor.submit(job)
+            return
+
+        # the job is handed to the pool when its time comes
+        timer = threading.Timer(delay, self.executor.submit, (job,))
+        timer.daemon = True
+        timer.start()
+
+    def wait_for_all(self) -> None:
+        # the waiting jobs are started by the finished ones, so the pool is
+        # closed only when all of them are done
+        wait(self.futures)
+        self.executor.shutdown(wait=True)
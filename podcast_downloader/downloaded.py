@@ -1,7 +1,10 @@
 import os
+import sqlite3
+import threading
 
-from functools import partial
-from typing import Callable, Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+DOWNLOADED_INDEX_FILE_NAME = "downloaded.sqlite"
 
 
 def get_extensions_checker(extensions: List[str]) -> Callable[[str], bool]:
@@ -10,27 +13,23 @@ def get_extensions_checker(extensions: List[str]) -> Callable[[str], bool]:
     )
 
 
-def is_file(directory_path: str, file_name: str) -> bool:
-    return os.path.isfile(os.path.join(directory_path, file_name))
-
-
-def get_files_from(directory_path: str) -> List[str]:
-    sort_key_function = lambda file_name: os.path.getctime(
-        os.path.join(directory_path, file_name)
-    )
-    return sorted(os.listdir(directory_path), key=sort_key_function, reverse=True)
+def scan_directory_files(directory_path: str) -> Iterator[os.DirEntry]:
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            # the type is given by the listing, the file is not asked for it
+            # (except the links and the file systems without the types)
+            if entry.is_file():
+                yield entry
 
 
 def get_downloaded_files(
     podcast_files_filter: Callable[[str], bool], podcast_directory: str
-) -> List[str]:
-    is_directory_file = partial(is_file, podcast_directory)
-
-    return (
-        file
-        for file in get_files_from(podcast_directory)
-        if podcast_files_filter(file) and is_directory_file(file)
-    )
+) -> Set[str]:
+    return {
+        entry.name
+        for entry in scan_directory_files(podcast_directory)
+        if podcast_files_filter(entry.name)
+    }
 
 
 def get_last_downloaded_file_before_gap(
@@ -47,3 +46,136 @@ def get_last_downloaded_file_before_gap(
                 return last_file
 
     return last_file
+
+
+class DownloadedIndex:
+    # The list of the files in the podcasts directories. The directory is
+    # scanned only once, then the index is updated by the script itself.
+
+    def __init__(self, database_path: Optional[str] = None) -> None:
+        if database_path:
+            os.makedirs(os.path.dirname(database_path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.rebuilt_directories = set()
+        self.connection = sqlite3.connect(
+            database_path or ":memory:", check_same_thread=False
+        )
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS directories (path TEXT PRIMARY KEY)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT NOT NULL, file_name TEXT NOT NULL, "
+                "PRIMARY KEY (path, file_name))"
+            )
+
+    def is_indexed(self, directory_path: str) -> bool:
+        with self.lock:
+            return (
+                self.connection.execute(
+                    "SELECT 1 FROM directories WHERE path = ?", (directory_path,)
+                ).fetchone()
+                is not None
+            )
+
+    def rebuild(self, directory_path: str, files: Iterable[str]) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM files WHERE path = ?", (directory_path,)
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO files (path, file_name) VALUES (?, ?)",
+                ((directory_path, file_name) for file_name in files),
+            )
+            self.connection.execute(
+                "INSERT OR IGNORE INTO directories (path) VALUES (?)",
+                (directory_path,),
+            )
+
+        self.rebuilt_directories.add(directory_path)
+
+    def is_rebuilt(self, directory_path: str) -> bool:
+        return directory_path in self.rebuilt_directories
+
+    def add(self, directory_path: str, file_name: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO files (path, file_name) VALUES (?, ?)",
+                (directory_path, file_name),
+            )
+
+    def get_files(self, directory_path: str) -> List[str]:
+        with self.lock:
+            return [
+                file_name
+                for (file_name,) in self.connection.execute(
+                    "SELECT file_name FROM files WHERE path = ?", (directory_path,)
+                )
+            ]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def read_indexed_directory(
+    index: DownloadedIndex, rescan: bool, directory_path: str
+) -> List[str]:
+    if not index.is_indexed(directory_path) or (
+        rescan and not index.is_rebuilt(directory_path)
+    ):
+        index.rebuild(
+            directory_path, get_downloaded_files(lambda _: True, directory_path)
+        )
+
+    return index.get_files(directory_path)
+
+
+class RunDirectoryIndex:
+    # The files of the podcasts directories during one run. Each directory
+    # is read once (from the index, or scanned), however many podcasts use
+    # it, and each podcast sees only its own files through its filter. The
+    # files downloaded by the run are added to both indexes.
+
+    def __init__(self, index: DownloadedIndex, rescan: bool) -> None:
+        self.index = index
+        self.rescan = rescan
+        self.lock = threading.Lock()
+        self.directories: Dict[str, Set[str]] = {}
+
+    def get_directory(self, directory_path: str) -> Set[str]:
+        # called under the lock
+        if directory_path not in self.directories:
+            self.directories[directory_path] = set(
+                read_indexed_directory(self.index, self.rescan, directory_path)
+            )
+
+        return self.directories[directory_path]
+
+    def get_files(
+        self, podcast_files_filter: Callable[[str], bool], podcast_directory: str
+    ) -> Set[str]:
+        directory_path = os.path.abspath(podcast_directory)
+
+        with self.lock:
+            return {
+                file_name
+                for file_name in self.get_directory(directory_path)
+                if podcast_files_filter(file_name)
+            }
+
+    def reserve(self, podcast_directory: str, file_name: str) -> None:
+        # The queued download is seen as taken by the next podcasts using the
+        # directory, so they do not plan the same file again. Only the
+        # published file gets into the persistent index.
+        with self.lock:
+            self.get_directory(os.path.abspath(podcast_directory)).add(file_name)
+
+    def add(self, podcast_directory: str, file_name: str) -> None:
+        directory_path = os.path.abspath(podcast_directory)
+        self.index.add(directory_path, file_name)
+
+        with self.lock:
+            if directory_path in self.directories:
+                self.directories[directory_path].add(file_name)
@@ -0,0 +1,318 @@
+import datetime
+import re
+import xml.etree.ElementTree as ElementTree
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import time
+
+if TYPE_CHECKING:
+    import feedparser
+
+from .rss import (
+    RSSEntity,
+    flatten_rss_links_data,
+    get_feed_title_from_feed,
+    get_raw_rss_entries_from_feed,
+    parse_feed,
+)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+MONTHS = "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split()
+TIME_ZONES_OFFSETS = {
+    "GMT": 0,
+    "UT": 0,
+    "Z": 0,
+    "EDT": -4,
+    "EST": -5,
+    "CDT": -5,
+    "CST": -6,
+    "MDT": -6,
+    "MST": -7,
+    "PDT": -7,
+    "PST": -8,
+}
+RFC822_DATE_PATTERN = re.compile(
+    r"^(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun), )?(\d{1,2}) ("
+    + "|".join(MONTHS)
+    + r") (\d{4}) (\d{2}):(\d{2})(?::(\d{2}))? ([+-]\d{4}|"
+    + "|".join(TIME_ZONES_OFFSETS)
+    + ")$"
+)
+
+CHANNEL_ELEMENTS = {
+    "title": "title",
+    "ttl": "ttl",
+    "{http://purl.org/rss/1.0/modules/syndication/}updatePeriod": "sy_updateperiod",
+    "{http://purl.org/rss/1.0/modules/syndication/}updateFrequency": "sy_updatefrequency",
+}
+
+# the elements read from the item, the other ones are skipped
+ITEM_TITLE = "title"
+ITEM_PUBLISH_DATE = "pubDate"
+ITEM_LINK = "link"
+ITEM_ENCLOSURE = "enclosure"
+
+
+class UnsupportedFeedError(Exception):
+    # The feed is correct, but it uses something which only feedparser
+    # handles (e.g. Atom, relative links, the dates without the time zone).
+    pass
+
+
+def parse_rfc822_date(value: Optional[str]) -> time.struct_time:
+    # Only the common form of the date is accepted here, feedparser deals
+    # with all the other ones.
+    match = RFC822_DATE_PATTERN.match((value or "").strip())
+    if not match:
+        raise UnsupportedFeedError(f"The date is not supported: {value}")
+
+    day, month, year, hour, minute, second, zone = match.groups()
+    try:
+        date = datetime.datetime(
+            int(year),
+            MONTHS.index(month) + 1,
+            int(day),
+            int(hour),
+            int(minute),
+            int(second or 0),
+        )
+    except ValueError:
+        raise UnsupportedFeedError(f"The date is not correct: {value}")
+
+    if zone in TIME_ZONES_OFFSETS:
+        offset = TIME_ZONES_OFFSETS[zone] * 60
+    else:
+        offset = (int(zone[1:3]) * 60 + int(zone[3:])) * (-1 if zone[0] == "-" else 1)
+
+    # feedparser gives the dates in UTC
+    return (date - datetime.timedelta(minutes=offset)).utctimetuple()
+
+
+def is_absolute_link(link: Optional[str]) -> bool:
+    return link is None or "://" in link
+
+
+def item_to_entities(item: ElementTree.Element) -> Generator[RSSEntity, None, None]:
+    # The result has to be the same as flatten_rss_links_data for feedparser
+    # entry: one entity for each link (alternate or enclosure) of the item.
+    title = None
+    published_date = None
+    links = []
+
+    for element in item:
+        if element.tag == ITEM_TITLE:
+            title = (element.text or "").strip()
+        elif element.tag == ITEM_PUBLISH_DATE:
+            published_date = parse_rfc822_date(element.text)
+        elif element.tag == ITEM_LINK:
+            links.append(("text/html", (element.text or "").strip()))
+        elif element.tag == ITEM_ENCLOSURE:
+            if "type" not in element.attrib:
+                raise UnsupportedFeedError("The enclosure without the type")
+
+            links.append((element.attrib["type"], element.attrib.get("url", None)))
+        elif element.tag.endswith("}link"):
+            raise UnsupportedFeedError("The link from the other namespace")
+
+    if title is None or "<" in title:
+        raise UnsupportedFeedError("The item without the plain title")
+
+    if published_date is None:
+        raise UnsupportedFeedError("The item without the publish date")
+
+    if not links or not all(is_absolute_link(link) for _, link in links):
+        raise UnsupportedFeedError("The item without the absolute links")
+
+    for link_type, link in links:
+        yield RSSEntity(published_date, title, link_type, link)
+
+
+def stream_rss_events(
+    body: bytes, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Generator[Tuple[str, ElementTree.Element, List[ElementTree.Element]], None, None]:
+    # The body is parsed in chunks, so nothing is parsed beyond what has been
+    # asked for. Each event comes with the parents of its element.
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    parents = []
+
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start : start + chunk_size])
+
+        for event, element in parser.read_events():
+            if event == "end":
+                parents.pop()
+            elif not parents and element.tag != "rss":
+                raise UnsupportedFeedError(f"Not the RSS 2.0 feed: {element.tag}")
+
+            yield event, element, parents
+
+            if event == "start":
+                parents.append(element)
+
+    parser.close()
+
+
+def is_channel_child(parents: List[ElementTree.Element]) -> bool:
+    return len(parents) == 2 and parents[1].tag == "channel"
+
+
+def read_channel(body: bytes) -> Dict[str, str]:
+    # the channel elements placed before the first item, named as in feedparser
+    channel = {}
+
+    for event, element, parents in stream_rss_events(body):
+        if not is_channel_child(parents):
+            continue
+
+        if event == "start" and element.tag == "item":
+            break
+
+        if event == "end" and element.tag in CHANNEL_ELEMENTS:
+            channel[CHANNEL_ELEMENTS[element.tag]] = (element.text or "").strip()
+
+    return channel
+
+
+def stream_rss_entities(body: bytes) -> Generator[RSSEntity, None, None]:
+    for event, element, parents in stream_rss_events(body):
+        if event == "end" and element.tag == "item" and is_channel_child(parents):
+            yield from item_to_entities(element)
+            # the processed item is not needed anymore
+            parents[-1].remove(element)
+
+
+class StreamedFeed:
+    # The lighter replacement of the feedparser result: it keeps only the
+    # response, the entities are read from it on demand. When the feed turns
+    # out to be broken or not supported, feedparser is used.
+
+    def __init__(
+        self, body: bytes, headers: Dict[str, str], channel: Dict[str, str]
+    ) -> None:
+        self.body = body
+        self.headers = headers
+        self.channel = channel
+
+    def entities(self) -> Generator[RSSEntity, None, None]:
+        streamed_entities = 0
+
+        try:
+            for entity in stream_rss_entities(self.body):
+                yield entity
+                streamed_entities += 1
+        except (ElementTree.ParseError, UnsupportedFeedError):
+            yield from islice(
+                flatten_rss_links_data(
+                    get_raw_rss_entries_from_feed(parse_feed(self.body, self.headers))
+                ),
+                streamed_entities,
+                None,
+            )
+
+
+class FeedSnapshot:
+    # The entities taken out of the parsed feed, together with the channel
+    # elements used by the script. It is stored between the runs, so the
+    # same feed does not have to be parsed again.
+
+    def __init__(self, channel: Dict[str, str], entities: List[RSSEntity]) -> None:
+        self.channel = channel
+        self.entity_list = entities
+
+    def entities(self) -> Iterator[RSSEntity]:
+        return iter(self.entity_list)
+
+
+class BrokenFeed:
+    # The feed which could not be parsed in the other process: only the error
+    # is sent back, not the whole feedparser result.
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+def take_feed_snapshot(
+    feed: Union[StreamedFeed, FeedSnapshot, "feedparser.FeedParserDict"],
+) -> FeedSnapshot:
+    channel = get_feed_channel(feed)
+    return FeedSnapshot(
+        {
+            key: channel[key]
+            for key in CHANNEL_ELEMENTS.values()
+            if key in channel and isinstance(channel[key], str)
+        },
+        list(get_feed_entities(feed)),
+    )
+
+
+def stream_feed(
+    body: bytes, headers: Dict[str, str]
+) -> Union[StreamedFeed, "feedparser.FeedParserDict"]:
+    try:
+        channel = read_channel(body)
+    except (ElementTree.ParseError, UnsupportedFeedError):
+        return parse_feed(body, headers)
+
+    if "title" not in channel:
+        # there was no channel title before the first item
+        return parse_feed(body, headers)
+
+    return StreamedFeed(body, headers, channel)
+
+
+def get_feed_title(
+    feed: Union[StreamedFeed, FeedSnapshot, "feedparser.FeedParserDict"],
+) -> str:
+    if isinstance(feed, (StreamedFeed, FeedSnapshot)):
+        return feed.channel["title"]
+
+    return get_feed_title_from_feed(feed)
+
+
+def get_feed_channel(
+    feed: Union[StreamedFeed, FeedSnapshot, "feedparser.FeedParserDict"],
+) -> Dict[str, str]:
+    if isinstance(feed, (StreamedFeed, FeedSnapshot)):
+        return feed.channel
+
+    return feed.feed
+
+
+def get_feed_entities(
+    feed: Union[StreamedFeed, FeedSnapshot, "feedparser.FeedParserDict"],
+) -> Iterator[RSSEntity]:
+    if isinstance(feed, (StreamedFeed, FeedSnapshot)):
+        return feed.entities()
+
+    return flatten_rss_links_data(get_raw_rss_entries_from_feed(feed))
+
+
+def is_feed_broken(
+    feed: Union[StreamedFeed, FeedSnapshot, BrokenFeed, "feedparser.FeedParserDict"],
+) -> bool:
+    if isinstance(feed, BrokenFeed):
+        return True
+
+    if isinstance(feed, (StreamedFeed, FeedSnapshot)):
+        return False
+
+    return feed.bozo and len(feed.entries) == 0
+
+
+def get_feed_error(
+    feed: Union[BrokenFeed, "feedparser.FeedParserDict"],
+) -> str:
+    if isinstance(feed, BrokenFeed):
+        return feed.error
+
+    return str(feed["bozo_exception"])
@@ -0,0 +1,184 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional
+
+# the time (seconds) for which the worker waits for the database locked by
+# the other worker
+DATABASE_TIMEOUT = 30
+
+# how often (seconds) the worker without the work checks for the feeds
+# left by the stopped workers
+COORDINATION_POLL_INTERVAL = 5
+
+
+def build_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseCoordinator:
+    # The feeds shared by many workers (the processes, also on the other
+    # machines with the same volume). The work is done in rounds: the first
+    # worker opens the round with all its feeds, the other ones join it.
+    # Each worker leases the feeds for a while and prolongs the leases while
+    # it works on them, so the feeds of the stopped worker are taken over by
+    # the others when their leases expire. The round ends, when all the feeds
+    # are finished; the next run opens the new one.
+
+    def __init__(
+        self,
+        database_path: str,
+        lease_seconds: float,
+        worker_id: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        directory = os.path.dirname(database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or build_worker_id()
+        self.clock = clock
+        self.round = None
+        self.keys = {}
+        self.lock = threading.Lock()
+        # the transactions are started by hand, to lock the database at once
+        self.connection = sqlite3.connect(
+            database_path,
+            timeout=DATABASE_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.transaction():
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS rounds ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "round INTEGER NOT NULL, key TEXT NOT NULL, worker TEXT, "
+                "expires REAL NOT NULL DEFAULT 0, finished INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (round, key))"
+            )
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+
+            self.connection.execute("COMMIT")
+
+    def get_unfinished_keys(self, round: int, now: Optional[float] = None) -> List[str]:
+        # Only the feeds of this worker are taken into account: the feed
+        # removed from the configuration would keep the round open forever.
+        # Given the time, only the feeds free at that time are returned.
+        return [
+            key
+            for (key,) in self.connection.execute(
+                "SELECT key FROM leases WHERE round = ? AND finished = 0 "
+                "AND expires <= ? ORDER BY rowid",
+                (round, float("inf") if now is None else now),
+            )
+            if key in self.keys
+        ]
+
+    def join(self, keys: Iterable[str]) -> int:
+        # in the order of the configuration
+        self.keys = dict.fromkeys(keys)
+
+        with self.transaction():
+            row = self.connection.execute("SELECT MAX(id) FROM rounds").fetchone()
+            round = row[0]
+
+            if round is None or not self.get_unfinished_keys(round):
+                round = self.connection.execute(
+                    "INSERT INTO rounds (started) VALUES (?)", (self.clock(),)
+                ).lastrowid
+
+            # the worker with the changed configuration can add the new feeds
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO leases (round, key) VALUES (?, ?)",
+                [(round, key) for key in self.keys],
+            )
+
+        self.round = round
+        return round
+
+    def acquire(self, count: int) -> List[str]:
+        # the free feeds, or the ones which leases have expired
+        with self.transaction():
+            now = self.clock()
+            keys = self.get_unfinished_keys(self.round, now)[:count]
+
+            self.connection.executemany(
+                "UPDATE leases SET worker = ?, expires = ? WHERE round = ? AND key = ?",
+                [
+                    (self.worker_id, now + self.lease_seconds, self.round, key)
+                    for key in keys
+                ],
+            )
+
+        return keys
+
+    def heartbeat(self) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE leases SET expires = ? "
+                "WHERE round = ? AND worker = ? AND finished = 0",
+                (self.clock() + self.lease_seconds, self.round, self.worker_id),
+            )
+
+    def finish(self, keys: Iterable[str]) -> None:
+        # the feed taken over by the other worker (after the lease has
+        # expired) is left to it
+        with self.transaction():
+            self.connection.executemany(
+                "UPDATE leases SET finished = 1 "
+                "WHERE round = ? AND key = ? AND worker = ?",
+                [(self.round, key, self.worker_id) for key in keys],
+            )
+
+    def is_round_finished(self) -> bool:
+        with self.lock:
+            return not self.get_unfinished_keys(self.round)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class Heartbeat:
+    # Prolongs the leases of the worker in the background, a few times
+    # during each lease.
+
+    def __init__(self, coordinator: LeaseCoordinator) -> None:
+        self.coordinator = coordinator
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, name="lease-heartbeat", daemon=True
+        )
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.coordinator.lease_seconds / 3):
+            try:
+                self.coordinator.heartbeat()
+            except sqlite3.Error:
+                # the database is busy, the lease is prolonged the next time
+                continue
+
+    def __enter__(self) -> "Heartbeat":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stopped.set()
+        self.thread.join()
@@ -0,0 +1,205 @@
+import gzip
+import http.client
+import ssl
+import threading
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, List, Tuple
+from urllib.parse import urljoin, urlsplit
+
+HTTP_NOT_MODIFIED = 304
+HTTP_REDIRECTS = (301, 302, 303, 307, 308)
+MAXIMUM_REDIRECTS = 10
+
+OpenLinkFunction = Callable[[str, Dict[str, str]], ContextManager]
+
+ConnectionKey = Tuple[str, str, int]
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def normalize_headers(headers) -> Dict[str, str]:
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def open_link(link: str, headers: Dict[str, str]):
+    return urllib.request.urlopen(urllib.request.Request(link, headers=headers))
+
+
+class PooledResponse:
+    # The wrapper returns the connection to the pool, when the response has
+    # been read to the end. Otherwise the connection cannot be reused.
+
+    def __init__(
+        self,
+        pool: "ConnectionPool",
+        key: ConnectionKey,
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        url: str,
+    ) -> None:
+        self.pool = pool
+        self.key = key
+        self.connection = connection
+        self.response = response
+        self.url = url
+        self.status = response.status
+        self.headers = response.headers
+
+    def read(self, size: int = -1) -> bytes:
+        return self.response.read(size if size >= 0 else None)
+
+    def close(self) -> None:
+        if self.connection is None:
+            return
+
+        if self.response.isclosed() and not self.response.will_close:
+            self.pool.release(self.key, self.connection)
+        else:
+            self.response.close()
+            self.connection.close()
+
+        self.connection = None
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    # Keeps the idle keep-alive connections per host, so the next requests to
+    # the same server do not pay again for the TCP and TLS handshakes.
+
+    def __init__(self, connections_per_host: int) -> None:
+        self.connections_per_host = connections_per_host
+        self.lock = threading.Lock()
+        self.idle: Dict[ConnectionKey, List[http.client.HTTPConnection]] = {}
+        self.ssl_context = ssl.create_default_context()
+
+    def acquire(self, key: ConnectionKey) -> Tuple[http.client.HTTPConnection, bool]:
+        with self.lock:
+            connections = self.idle.get(key)
+            if connections:
+                return connections.pop(), True
+
+        scheme, host, port = key
+        if scheme == "https":
+            return (
+                http.client.HTTPSConnection(host, port, context=self.ssl_context),
+                False,
+            )
+
+        return http.client.HTTPConnection(host, port), False
+
+    def release(
+        self, key: ConnectionKey, connection: http.client.HTTPConnection
+    ) -> None:
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.connections_per_host:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+    def close(self) -> None:
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+
+            self.idle = {}
+
+    def request(self, link: str, headers: Dict[str, str]) -> PooledResponse:
+        parts = urlsplit(link)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported link: {link}")
+
+        key = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+        )
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        while True:
+            connection, is_reused = self.acquire(key)
+
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                # the server could close the idle connection in the meantime
+                if is_reused:
+                    continue
+
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            return PooledResponse(self, key, connection, response, link)
+
+    def open(self, link: str, headers: Dict[str, str]) -> PooledResponse:
+        for _ in range(MAXIMUM_REDIRECTS + 1):
+            response = self.request(link, headers)
+            if 200 <= response.status < 300:
+                return response
+
+            # the body is not needed, but must be read to reuse the connection
+            with response:
+                response.read()
+
+            location = response.headers.get("Location")
+            if response.status in HTTP_REDIRECTS and location:
+                link = urljoin(link, location)
+                continue
+
+            raise urllib.error.HTTPError(
+                link,
+                response.status,
+                response.response.reason,
+                response.headers,
+                None,
+            )
+
+        raise urllib.error.URLError(f"Too many redirects: {link}")
+
+
+def build_open_link(connections_per_host: int) -> Tuple[OpenLinkFunction, Callable]:
+    # the connections made by urllib respect the proxy settings of environment
+    if urllib.request.getproxies():
+        return open_link, lambda: None
+
+    pool = ConnectionPool(connections_per_host)
+    return pool.open, pool.close
+
+
+def fetch(open_link: OpenLinkFunction, link: str, headers: Dict[str, str]) -> Response:
+    try:
+        with open_link(link, {"Accept-Encoding": "gzip", **headers}) as response:
+            response_headers = normalize_headers(response.headers)
+            body = response.read()
+            status = response.status
+            url = response.url
+    except urllib.error.HTTPError as error:
+        if error.code != HTTP_NOT_MODIFIED:
+            raise
+
+        return Response(error.code, normalize_headers(error.headers), b"")
+
+    if response_headers.get("content-encoding", "").lower() == "gzip":
+        body = gzip.decompress(body)
+        del response_headers["content-encoding"]
+
+    response_headers.setdefault("content-location", url)
+    return Response(status, response_headers, body)
@@ -0,0 +1,82 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+from .feed_stream import (
+    BrokenFeed,
+    FeedSnapshot,
+    StreamedFeed,
+    get_feed_error,
+    is_feed_broken,
+    take_feed_snapshot,
+)
+from .rss import RSSEntity
+
+if TYPE_CHECKING:
+    import feedparser
+
+# with fewer feeds, starting the processes takes longer than the parsing
+PARSE_POOL_MIN_FEEDS = 8
+
+EntityTuple = Tuple[List[int], str, str, Optional[str]]
+ParsedFeedTuple = Tuple[Dict[str, str], List[EntityTuple], Optional[str]]
+
+ParseFunction = Callable[
+    [bytes, Dict[str, str]], Union[StreamedFeed, "feedparser.FeedParserDict"]
+]
+
+
+def parse_to_tuples(
+    parse: ParseFunction, body: bytes, headers: Dict[str, str]
+) -> ParsedFeedTuple:
+    # It runs in the worker process. Only the plain values are sent back,
+    # the feedparser result would take longer to pass than to parse again.
+    feed = parse(body, headers)
+    if is_feed_broken(feed):
+        return {}, [], get_feed_error(feed)
+
+    snapshot = take_feed_snapshot(feed)
+    return (
+        snapshot.channel,
+        [
+            (list(entity.published_date), entity.title, entity.type, entity.link)
+            for entity in snapshot.entities()
+        ],
+        None,
+    )
+
+
+def tuples_to_feed(parsed: ParsedFeedTuple) -> Union[FeedSnapshot, BrokenFeed]:
+    channel, entities, error = parsed
+    if error is not None:
+        return BrokenFeed(error)
+
+    return FeedSnapshot(
+        channel,
+        [
+            RSSEntity(time.struct_time(published_date), title, link_type, link)
+            for published_date, title, link_type, link in entities
+        ],
+    )
+
+
+def build_parse_pool(workers: int) -> ProcessPoolExecutor:
+    # The feeds are fetched by many threads, so the workers are not forked
+    # from this process (the locks held by the other threads would be copied).
+    start_methods = multiprocessing.get_all_start_methods()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(
+            "forkserver" if "forkserver" in start_methods else "spawn"
+        ),
+    )
+
+
+def parse_in_pool(
+    pool: ProcessPoolExecutor,
+    parse: ParseFunction,
+    body: bytes,
+    headers: Dict[str, str],
+) -> Union[FeedSnapshot, BrokenFeed]:
+    return tuples_to_feed(pool.submit(parse_to_tuples, parse, body, headers).result())
@@ -0,0 +1,29 @@
+import threading
+import time
+from typing import Callable, Dict
+
+DELAY_SCOPE_HOST = "host"
+DELAY_SCOPE_FEED = "feed"
+
+DELAY_SCOPES = (DELAY_SCOPE_HOST, DELAY_SCOPE_FEED)
+
+
+class PolitenessScheduler:
+    # Keeps the minimum gap between the starts of the downloads sharing the
+    # key (the host or the feed). Each download reserves its start time at
+    # once and only its own thread waits for it, so the downloads with the
+    # other keys are not stopped.
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.next_starts: Dict[str, float] = {}
+
+    def reserve(self, key: str, gap: float) -> float:
+        # gives the number of seconds to wait before the download can start
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.next_starts.get(key, now))
+            self.next_starts[key] = start + gap
+
+        return start - now
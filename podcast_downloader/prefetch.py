@@ -0,0 +1,84 @@
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Tuple, TypeVar
+
+from .utils import link_to_host
+
+T = TypeVar("T")
+
+
+class HostQueues:
+    # The links waiting for their host's free slot are kept here, not in the
+    # pool, so the feeds of one busy host do not hold the threads needed by
+    # the other hosts. The finished fetch starts the next one of its host.
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        load_function: Callable[[str], T],
+        slots_per_host: int,
+    ) -> None:
+        self.executor = executor
+        self.load_function = load_function
+        self.slots_per_host = slots_per_host
+        self.lock = threading.Lock()
+        self.running: Dict[str, int] = defaultdict(int)
+        self.waiting: Dict[str, Deque[Tuple[str, Future]]] = defaultdict(deque)
+        self.unfinished = 0
+
+    def start(self, links: Iterable[str]) -> Dict[str, Future]:
+        futures = {link: Future() for link in links}
+
+        # all the links are counted before the first fetch can finish
+        with self.lock:
+            self.unfinished = len(futures)
+            for link, future in futures.items():
+                self.waiting[link_to_host(link)].append((link, future))
+
+        for host in list(self.waiting):
+            self.dispatch(host)
+
+        return futures
+
+    def dispatch(self, host: str) -> None:
+        with self.lock:
+            jobs = []
+            while self.running[host] < self.slots_per_host and self.waiting[host]:
+                self.running[host] += 1
+                jobs.append(self.waiting[host].popleft())
+
+        for link, future in jobs:
+            self.executor.submit(self.run, host, link, future)
+
+    def run(self, host: str, link: str, future: Future) -> None:
+        try:
+            future.set_result(self.load_function(link))
+        except BaseException as error:
+            future.set_exception(error)
+
+        with self.lock:
+            self.running[host] -= 1
+            self.unfinished -= 1
+            is_last = self.unfinished == 0
+
+        if is_last:
+            # nothing will be submitted anymore
+            self.executor.shutdown(wait=False)
+        else:
+            self.dispatch(host)
+
+
+def prefetch(
+    load_function: Callable[[str], T],
+    links: Iterable[str],
+    workers: int,
+    workers_per_host: int,
+) -> Dict[str, Future]:
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed")
+    unique_links = list(dict.fromkeys(links))
+    if not unique_links:
+        executor.shutdown(wait=False)
+        return {}
+
+    return HostQueues(executor, load_function, workers_per_host).start(unique_links)
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Set
+
+from .rss import RSSEntity
+
+
+@dataclass
+class Reconciliation:
+    # all the lists are in the feed order: from the newest to the oldest entry
+    entities: List[RSSEntity]
+    file_names: List[str]
+    downloaded_files: Set[str]
+    last_downloaded_index: Optional[int]
+    last_downloaded_before_gap_index: Optional[int]
+
+    @property
+    def has_downloaded_files(self) -> bool:
+        return self.last_downloaded_index is not None
+
+    def get_boundary_index(self, fill_up_gaps: bool) -> Optional[int]:
+        return (
+            self.last_downloaded_before_gap_index
+            if fill_up_gaps
+            else self.last_downloaded_index
+        )
+
+    def get_last_downloaded_file(self, fill_up_gaps: bool) -> Optional[str]:
+        index = self.get_boundary_index(fill_up_gaps)
+        return None if index is None else self.file_names[index]
+
+    def get_missing_entities(self, fill_up_gaps: bool) -> List[RSSEntity]:
+        index = self.get_boundary_index(fill_up_gaps)
+
+        return [
+            entity
+            for entity, file_name in zip(self.entities[:index], self.file_names[:index])
+            if file_name not in self.downloaded_files
+        ]
+
+
+def reconcile(
+    to_file_name: Callable[[RSSEntity], str],
+    downloaded_files: Set[str],
+    feed_entities: Iterable[RSSEntity],
+    fill_up_gaps: bool = True,
+) -> Reconciliation:
+    # Single pass over the feed (from the newest entry). The newest downloaded
+    # file is the first one found. The last file before the gap is the newest
+    # file of the oldest continuous group of downloaded files.
+    # Without filling up the gaps nothing older than the newest downloaded file
+    # matters, so the pass (and the reading of the lazy feed) stops there.
+    entities = []
+    file_names = []
+    last_downloaded_index = None
+    last_downloaded_before_gap_index = None
+    is_previous_downloaded = False
+
+    for index, entity in enumerate(feed_entities):
+        file_name = to_file_name(entity)
+        entities.append(entity)
+        file_names.append(file_name)
+
+        is_downloaded = file_name in downloaded_files
+        if is_downloaded:
+            if last_downloaded_index is None:
+                last_downloaded_index = index
+
+            if not is_previous_downloaded:
+                last_downloaded_before_gap_index = index
+
+            if not fill_up_gaps:
+                break
+
+        is_previous_downloaded = is_downloaded
+
+    return Reconciliation(
+        entities,
+        file_names,
+        downloaded_files,
+        last_downloaded_index,
+        last_downloaded_before_gap_index,
+    )
@@ -1,22 +1,123 @@
+import io
 import re
 import time
 from dataclasses import dataclass
 from functools import partial
 from itertools import takewhile, islice
-from typing import Callable, Generator, Iterator, List
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 import unicodedata
-import feedparser
+
+if TYPE_CHECKING:
+    import feedparser
+
+from .cache import (
+    VALIDATOR_EXPIRES,
+    FeedValidatorsStore,
+    build_conditional_headers,
+    build_feed_validators,
+    is_fresh,
+)
+from .network import HTTP_NOT_MODIFIED, OpenLinkFunction, fetch
 
 
 FILE_NAME_CHARACTER_LIMIT = 255
 
 
-@dataclass
 class RSSEntity:
-    published_date: time.struct_time
-    title: str
-    type: str
-    link: str
+    # There is an entity for every link in the feed, so it keeps only the plain
+    # values (no feedparser objects). The names derived from them are computed
+    # on the first use and kept with the value they come from, so they are
+    # computed again when that value is changed.
+    __slots__ = (
+        "published_date",
+        "title",
+        "type",
+        "link",
+        "_file_name",
+        "_file_name_link",
+        "_file_extension",
+        "_file_extension_link",
+        "_file_title",
+        "_file_title_source",
+        "_date_key",
+        "_date_key_source",
+    )
+
+    def __init__(
+        self, published_date: time.struct_time, title: str, type: str, link: str
+    ) -> None:
+        self.published_date = published_date
+        self.title = title
+        self.type = type
+        self.link = link
+        self._file_name = None
+        self._file_name_link = None
+        self._file_extension = None
+        self._file_extension_link = None
+        self._file_title = None
+        self._file_title_source = None
+        self._date_key = None
+        self._date_key_source = None
+
+    @property
+    def file_name(self) -> str:
+        if self._file_name is None or self._file_name_link is not self.link:
+            self._file_name = link_to_file_name(self.link)
+            self._file_name_link = self.link
+
+        return self._file_name
+
+    @property
+    def file_extension(self) -> str:
+        if self._file_extension is None or self._file_extension_link is not self.link:
+            self._file_extension = link_to_extension(self.link)
+            self._file_extension_link = self.link
+
+        return self._file_extension
+
+    @property
+    def file_title(self) -> str:
+        if self._file_title is None or self._file_title_source is not self.title:
+            self._file_title = str_to_filename(self.title)
+            self._file_title_source = self.title
+
+        return self._file_title
+
+    @property
+    def date_key(self) -> str:
+        if self._date_key is None or self._date_key_source is not self.published_date:
+            self._date_key = time.strftime("%Y%m%d", self.published_date)
+            self._date_key_source = self.published_date
+
+        return self._date_key
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        return (self.published_date, self.title, self.type, self.link) == (
+            other.published_date,
+            other.title,
+            other.type,
+            other.link,
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"RSSEntity(published_date={self.published_date!r}, title={self.title!r}, "
+            f"type={self.type!r}, link={self.link!r})"
+        )
 
 
 def link_to_file_name_with_extension(link: str) -> str:
@@ -75,6 +176,160 @@ def file_template_to_file_name(name_template: str, entity: RSSEntity) -> str:
     )
 
 
+PUBLISH_DATE_FORMAT_TOKEN = "%publish_date:"
+
+FILE_NAME_TEMPLATE_FIELDS = (
+    ("%file_name%", lambda entity: entity.file_name),
+    ("%publish_date%", lambda entity: entity.date_key),
+    ("%file_extension%", lambda entity: entity.file_extension),
+    ("%title%", lambda entity: entity.file_title),
+)
+
+TemplateSegment = Union[str, Callable[[RSSEntity], str]]
+
+
+class AmbiguousTemplateError(Exception):
+    pass
+
+
+def format_publish_date(date_format: str, entity: RSSEntity) -> str:
+    return time.strftime(date_format, entity.published_date)
+
+
+def can_text_follow_fields(segments: List[TemplateSegment], text: str) -> bool:
+    # the field values have no "%", so the first "%" after the fields comes
+    # from the template text
+    if "%" not in text:
+        return True
+
+    pattern = ""
+    for segment in segments:
+        if not isinstance(segment, str):
+            pattern += "[^%]*"
+        elif "%" in segment:
+            pattern += re.escape(segment[: segment.index("%") + 1])
+            return re.fullmatch(pattern, text) is not None
+        else:
+            pattern += re.escape(segment)
+
+    return False
+
+
+def can_token_span_fields(segments: List[TemplateSegment], token: str) -> bool:
+    # the token could be made from the end of the text before a field,
+    # the field value and the text after it
+    for index, segment in enumerate(segments[:-1]):
+        if not isinstance(segment, str) or isinstance(segments[index + 1], str):
+            continue
+
+        for start, character in enumerate(segment):
+            suffix = segment[start:]
+            if (
+                character == "%"
+                and len(suffix) < len(token)
+                and token.startswith(suffix)
+                and can_text_follow_fields(segments[index + 1 :], token[len(suffix) :])
+            ):
+                return True
+
+    return False
+
+
+def replace_token_with_field(
+    segments: List[TemplateSegment],
+    token: str,
+    field: Callable[[RSSEntity], str],
+) -> List[TemplateSegment]:
+    if can_token_span_fields(segments, token):
+        raise AmbiguousTemplateError(token)
+
+    result = []
+    for segment in segments:
+        if not isinstance(segment, str):
+            result.append(segment)
+            continue
+
+        for index, part in enumerate(segment.split(token)):
+            if index > 0:
+                result.append(field)
+
+            result.append(part)
+
+    return result
+
+
+def find_publish_date_format_token(segments: List[TemplateSegment]) -> Optional[str]:
+    if can_token_span_fields(segments, PUBLISH_DATE_FORMAT_TOKEN):
+        raise AmbiguousTemplateError(PUBLISH_DATE_FORMAT_TOKEN)
+
+    for segment in segments:
+        if not isinstance(segment, str) or PUBLISH_DATE_FORMAT_TOKEN not in segment:
+            continue
+
+        start = segment.index(PUBLISH_DATE_FORMAT_TOKEN)
+        end = segment.find("%", start + len(PUBLISH_DATE_FORMAT_TOKEN))
+        if end == -1:
+            raise AmbiguousTemplateError(PUBLISH_DATE_FORMAT_TOKEN)
+
+        return segment[start : end + 1]
+
+    return None
+
+
+def parse_file_name_template(name_template: str) -> List[TemplateSegment]:
+    # The tokens are replaced in the same order as file_template_to_file_name
+    # does, but only in the template text. The fields are placed between.
+    segments = [name_template]
+
+    while True:
+        token = find_publish_date_format_token(segments)
+        if token is None:
+            break
+
+        date_format = token[len(PUBLISH_DATE_FORMAT_TOKEN) : -1].replace("$", "%")
+        segments = replace_token_with_field(
+            segments, token, partial(format_publish_date, date_format)
+        )
+
+    for token, field in FILE_NAME_TEMPLATE_FIELDS:
+        segments = replace_token_with_field(segments, token, field)
+
+    return [segment for segment in segments if segment != ""]
+
+
+def render_file_name(
+    segments: List[TemplateSegment],
+    fallback: Callable[[RSSEntity], str],
+    entity: RSSEntity,
+) -> str:
+    parts = []
+
+    for segment in segments:
+        if isinstance(segment, str):
+            parts.append(segment)
+            continue
+
+        value = segment(entity)
+        if "%" in value:
+            # the value itself could create a new token
+            return fallback(entity)
+
+        parts.append(value)
+
+    return "".join(parts).strip()
+
+
+def compile_file_name_template(name_template: str) -> Callable[[RSSEntity], str]:
+    fallback = partial(file_template_to_file_name, name_template)
+
+    try:
+        segments = parse_file_name_template(name_template)
+    except AmbiguousTemplateError:
+        return fallback
+
+    return partial(render_file_name, segments, fallback)
+
+
 def limit_file_name(maximum_length: int, file_name: str) -> str:
     last_dot_index = file_name.rfind(".")
     if last_dot_index == -1:
@@ -90,22 +345,82 @@ def limit_file_name(maximum_length: int, file_name: str) -> str:
     )
 
 
-def load_feed(rss_link: str) -> feedparser.FeedParserDict:
+def load_feed(rss_link: str) -> "feedparser.FeedParserDict":
+    import feedparser
+
     return feedparser.parse(rss_link)
 
 
-def get_feed_title_from_feed(feedParser: feedparser.FeedParserDict) -> str:
+def parse_feed(body: bytes, headers: Dict[str, str]) -> "feedparser.FeedParserDict":
+    # feedparser takes a long time to import, so it is loaded on the first use
+    import feedparser
+
+    return feedparser.parse(io.BytesIO(body), response_headers=headers)
+
+
+@dataclass
+class FetchedFeed:
+    link: str
+    feed: Optional["feedparser.FeedParserDict"]
+    validators: Dict
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+    @property
+    def is_modified(self) -> bool:
+        return self.feed is not None
+
+
+def fetch_feed(
+    open_link: OpenLinkFunction,
+    validators_store: FeedValidatorsStore,
+    headers: Dict[str, str],
+    parse: Callable[[bytes, Dict[str, str]], "feedparser.FeedParserDict"],
+    feeds_settings: Dict[str, str],
+    rss_link: str,
+) -> FetchedFeed:
+    now = time.time()
+    validators = validators_store.get(rss_link, feeds_settings[rss_link])
+    if is_fresh(validators, now):
+        return FetchedFeed(rss_link, None, validators)
+
+    start = time.perf_counter()
+    response = fetch(
+        open_link, rss_link, {**headers, **build_conditional_headers(validators)}
+    )
+    fetch_seconds = time.perf_counter() - start
+    response_validators = build_feed_validators(response.headers, now)
+
+    if response.status == HTTP_NOT_MODIFIED:
+        validators.pop(VALIDATOR_EXPIRES, None)
+        return FetchedFeed(
+            rss_link, None, {**validators, **response_validators}, fetch_seconds
+        )
+
+    start = time.perf_counter()
+    feed = parse(response.body, response.headers)
+
+    return FetchedFeed(
+        rss_link,
+        feed,
+        response_validators,
+        fetch_seconds,
+        time.perf_counter() - start,
+    )
+
+
+def get_feed_title_from_feed(feedParser: "feedparser.FeedParserDict") -> str:
     return feedParser.feed.title
 
 
 def get_raw_rss_entries_from_feed(
-    feedParser: feedparser.FeedParserDict,
-) -> Generator[feedparser.FeedParserDict, None, None]:
+    feedParser: "feedparser.FeedParserDict",
+) -> Generator["feedparser.FeedParserDict", None, None]:
     yield from feedParser.entries
 
 
 def flatten_rss_links_data(
-    source: Generator[feedparser.FeedParserDict, None, None]
+    source: Generator["feedparser.FeedParserDict", None, None]
 ) -> Generator[RSSEntity, None, None]:
     return (
         RSSEntity(
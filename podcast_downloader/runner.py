@@ -0,0 +1,814 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import partial
+from logging import getLogger
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import re
+import time
+import sys
+
+from . import configuration
+from .configuration import (
+    configuration_verification,
+    get_label_to_date,
+    get_n_age_date,
+    load_configuration,
+    parse_day_label,
+)
+from .utils import compose, link_to_host
+from .dedup import EPISODES_REGISTRY_FILE_NAME, EpisodeDeduplicator, EpisodeRegistry
+from .download import (
+    ContentHash,
+    DownloadQueue,
+    commit_partial_file,
+    download_to_partial_file,
+)
+from .downloaded import (
+    DOWNLOADED_INDEX_FILE_NAME,
+    DownloadedIndex,
+    RunDirectoryIndex,
+    get_extensions_checker,
+)
+from .cache import FeedValidatorsStore, get_settings_fingerprint
+from .daemon import (
+    CONFIGURATION_CHECK_INTERVAL,
+    FeedScheduler,
+    get_modification_time,
+    get_update_hints,
+    get_update_interval,
+)
+from .lease import COORDINATION_POLL_INTERVAL, Heartbeat, LeaseCoordinator
+from .network import OpenLinkFunction, build_open_link
+from .parse_pool import PARSE_POOL_MIN_FEEDS, build_parse_pool, parse_in_pool
+from .politeness import DELAY_SCOPE_FEED, PolitenessScheduler
+from .prefetch import prefetch
+from .snapshot import (
+    BYTES_IN_MEGABYTE,
+    FEED_SNAPSHOTS_DIRECTORY_NAME,
+    FeedSnapshotStore,
+    parse_with_snapshot,
+)
+from .reconciliation import reconcile
+from .selection import apply_selection
+from .throttle import Throttle, build_throttle, build_token_bucket
+from .timing import PHASE_FETCH, PHASE_PARSE, PHASE_PLAN, PHASE_SCAN, RunTimings
+from .parameters import merge_parameters_collection
+from .rss import (
+    RSSEntity,
+    build_only_allowed_filter_for_link_data,
+    compile_file_name_template,
+    fetch_feed,
+    limit_file_name,
+    only_entities_from_date,
+    only_last_n_entities,
+    parse_feed,
+)
+from .feed_stream import (
+    get_feed_channel,
+    get_feed_entities,
+    get_feed_error,
+    get_feed_title,
+    is_feed_broken,
+    stream_feed,
+)
+
+logger = getLogger(__name__)
+
+
+def download_rss_entity_to_path(
+    open_link: OpenLinkFunction,
+    headers: List[Tuple[str, str]],
+    to_file_name_function: Callable[[RSSEntity], str],
+    record_download: Callable[[str, float, int], None],
+    throttle: Optional[Throttle],
+    deduplicator: Optional[EpisodeDeduplicator],
+    path: str,
+    rss_entity: RSSEntity,
+) -> Optional[str]:
+    path_to_file = os.path.join(path, to_file_name_function(rss_entity))
+
+    def download_file(content_hash: Optional[ContentHash] = None) -> int:
+        start = time.perf_counter()
+        downloaded_bytes = download_to_partial_file(
+            open_link, headers, rss_entity.link, path_to_file, throttle, content_hash
+        )
+        record_download(
+            os.path.basename(path_to_file),
+            time.perf_counter() - start,
+            downloaded_bytes,
+        )
+        return downloaded_bytes
+
+    try:
+        if deduplicator is None:
+            download_file()
+            return path_to_file
+
+        _, known_path = deduplicator.download(
+            download_file, rss_entity.link, path_to_file
+        )
+        if known_path:
+            logger.info(
+                'The file "%s" is the same as "%s", it is linked',
+                os.path.basename(path_to_file),
+                known_path,
+            )
+
+        return path_to_file
+    except Exception:
+        logger.exception(
+            'The podcast file "%s" could not be saved to disk "%s" due to the following error',
+            rss_entity.link,
+            path_to_file,
+        )
+
+    return None
+
+
+def get_download_delay_key(
+    scope: str, rss_source_link: str, rss_entity: RSSEntity
+) -> str:
+    return (
+        rss_source_link if scope == DELAY_SCOPE_FEED else link_to_host(rss_entity.link)
+    )
+
+
+def get_download_turn_delay(
+    politeness: PolitenessScheduler,
+    delay: int,
+    to_key: Callable[[RSSEntity], str],
+    rss_entity: RSSEntity,
+) -> float:
+    # the download starts later, nothing waits for it (the other hosts and
+    # the threads of the pool are not stopped)
+    if delay <= 0:
+        return 0
+
+    key = to_key(rss_entity)
+    wait = politeness.reserve(key, delay)
+    if wait > 0:
+        logger.info('The download from "%s" is waiting (%d second)', key, wait)
+
+    return wait
+
+
+def publish_downloaded_file(
+    directory_index: RunDirectoryIndex, path_to_file: Optional[str]
+) -> bool:
+    if path_to_file is None:
+        return False
+
+    try:
+        commit_partial_file(path_to_file)
+        directory_index.add(
+            os.path.dirname(path_to_file),
+            os.path.basename(path_to_file),
+        )
+        return True
+    except Exception:
+        logger.exception(
+            'The podcast file "%s" could not be moved into place due to the following error',
+            path_to_file,
+        )
+
+    return False
+
+
+def configuration_to_function_on_empty_directory(
+    configuration_value: str, last_run_date: time.struct_time
+) -> Callable[[Iterable[RSSEntity]], Iterable[RSSEntity]]:
+    if configuration_value == "download_last":
+        return partial(only_last_n_entities, 1)
+
+    if configuration_value == "download_all_from_feed":
+        return lambda source: source
+
+    if configuration_value == "download_since_last_run":
+        if last_run_date:
+            return only_entities_from_date(last_run_date)
+
+        logger.error(
+            'The "download_since_last_run" require setup the "last_run_mark_file_path"'
+        )
+        raise Exception("Missing the last run mark file")
+
+    local_time = time.localtime()
+
+    from_n_day_match = re.match(r"^download_from_(\d+)_days$", configuration_value)
+    if from_n_day_match:
+        from_date = get_n_age_date(int(from_n_day_match[1]), local_time)
+        return only_entities_from_date(from_date)
+
+    last_n_episodes = re.match(r"^download_last_(\d+)_episodes", configuration_value)
+    if last_n_episodes:
+        download_limit = int(last_n_episodes[1])
+        return partial(only_last_n_entities, download_limit)
+
+    from_nth_day_match = re.match(r"^download_from_(.*)", configuration_value)
+    if from_nth_day_match:
+        day_label = parse_day_label(from_nth_day_match[1])
+
+        return only_entities_from_date(get_label_to_date(day_label)(local_time))
+
+    raise Exception(f"The value the '{configuration_value}' is not recognizable")
+
+
+def is_windows_running():
+    return sys.platform == "win32"
+
+
+def get_system_file_name_limit(sub_configuration: Dict[str, str]) -> int:
+    # on Windows, the file name is limited to 260 characters including the path to it
+    return 255 if is_windows_running() else 260 - len(sub_configuration["path"]) - 1
+
+
+def configuration_to_function_rss_to_name(
+    configuration_value: str, sub_configuration: Dict[str, str]
+) -> Callable[[RSSEntity], str]:
+    if (
+        configuration.CONFIG_PODCASTS_REQUIRE_DATE in sub_configuration
+        and configuration.CONFIG_FILE_NAME_TEMPLATE not in sub_configuration
+    ):
+        default_file_name_template_with_date = (
+            "[%publish_date%] %file_name%.%file_extension%"
+        )
+
+        if sub_configuration[configuration.CONFIG_PODCASTS_REQUIRE_DATE]:
+            configuration_value = default_file_name_template_with_date
+
+        logger.warning(
+            'The option %s is deprecated, please replace use of it with the %s option: "%s"',
+            configuration.CONFIG_PODCASTS_REQUIRE_DATE,
+            configuration.CONFIG_FILE_NAME_TEMPLATE,
+            default_file_name_template_with_date,
+        )
+
+    return compile_file_name_template(configuration_value)
+
+
+@dataclass
+class Session:
+    # everything what is kept between the checks of the podcasts
+    open_link: OpenLinkFunction
+    close_connections: Callable[[], None]
+    feed_validators: FeedValidatorsStore
+    downloaded_index: DownloadedIndex
+    rescan: bool
+    last_run_datetime: Optional[time.struct_time]
+    timing_report_path: Optional[str]
+    feed_snapshots: Optional[FeedSnapshotStore]
+    deduplicator: Optional[EpisodeDeduplicator]
+    feed_update_hints: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # started on the first run with enough feeds, kept for the next runs
+    parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def open_session(
+    config: Dict, parameters: Dict, last_run_datetime: Optional[time.struct_time]
+) -> Session:
+    open_link, close_connections = build_open_link(
+        config[configuration.CONFIG_CONNECTIONS_PER_HOST]
+    )
+
+    cache_directory = config[configuration.CONFIG_CACHE_DIRECTORY]
+    feed_validators = FeedValidatorsStore(
+        os.path.expanduser(cache_directory) if cache_directory else None
+    )
+    downloaded_index = DownloadedIndex(
+        os.path.join(os.path.expanduser(cache_directory), DOWNLOADED_INDEX_FILE_NAME)
+        if cache_directory
+        else None
+    )
+    feed_snapshots = (
+        FeedSnapshotStore(
+            os.path.join(
+                os.path.expanduser(cache_directory), FEED_SNAPSHOTS_DIRECTORY_NAME
+            ),
+            config[configuration.CONFIG_FEED_SNAPSHOTS_SIZE] * BYTES_IN_MEGABYTE,
+        )
+        if cache_directory
+        else None
+    )
+
+    deduplicator = (
+        EpisodeDeduplicator(
+            EpisodeRegistry(
+                os.path.join(
+                    os.path.expanduser(cache_directory), EPISODES_REGISTRY_FILE_NAME
+                )
+                if cache_directory
+                else None
+            )
+        )
+        if config[configuration.CONFIG_DEDUPLICATE_EPISODES]
+        else None
+    )
+
+    rescan = parameters.get("rescan", False)
+    if rescan:
+        feed_validators.clear()
+
+    return Session(
+        open_link,
+        close_connections,
+        feed_validators,
+        downloaded_index,
+        rescan,
+        last_run_datetime,
+        parameters.get("timing_report"),
+        feed_snapshots,
+        deduplicator,
+    )
+
+
+def close_session(session: Session) -> None:
+    session.downloaded_index.close()
+    if session.deduplicator:
+        session.deduplicator.registry.close()
+    if session.parse_pool:
+        session.parse_pool.shutdown()
+    session.close_connections()
+
+
+def get_enabled_rss_links(rss_sources: List[Dict]) -> List[str]:
+    return [
+        rss_source[configuration.CONFIG_PODCASTS_RSS_LINK]
+        for rss_source in rss_sources
+        if not rss_source.get(configuration.CONFIG_PODCASTS_DISABLE, False)
+    ]
+
+
+def get_feeds_settings(config: Dict, rss_sources: List[Dict]) -> Dict[str, str]:
+    # only the settings deciding which files are downloaded, and where
+    feeds_podcasts = defaultdict(list)
+    for rss_source in rss_sources:
+        if rss_source.get(configuration.CONFIG_PODCASTS_DISABLE, False):
+            continue
+
+        feeds_podcasts[rss_source[configuration.CONFIG_PODCASTS_RSS_LINK]].append(
+            {
+                configuration.CONFIG_PODCASTS_PATH: os.path.abspath(
+                    os.path.expanduser(rss_source[configuration.CONFIG_PODCASTS_PATH])
+                ),
+                **{
+                    key: rss_source.get(key, config.get(key))
+                    for key in (
+                        configuration.CONFIG_FILE_NAME_TEMPLATE,
+                        configuration.CONFIG_PODCAST_EXTENSIONS,
+                        configuration.CONFIG_IF_DIRECTORY_EMPTY,
+                        configuration.CONFIG_FILL_UP_GAPS,
+                    )
+                },
+            }
+        )
+
+    return {
+        rss_link: get_settings_fingerprint(podcasts_settings)
+        for rss_link, podcasts_settings in feeds_podcasts.items()
+    }
+
+
+def report_timings(session: Session, timings: RunTimings) -> None:
+    for line in timings.get_summary():
+        logger.info(line)
+
+    if session.timing_report_path:
+        timings.save_report(os.path.expanduser(session.timing_report_path))
+
+
+def run_podcasts(
+    session: Session,
+    config: Dict,
+    rss_sources: List[Dict],
+    timings: RunTimings,
+    downloads_limit: int,
+) -> int:
+    # gives back the part of the downloads limit which has not been used
+    # the pool shared by all the podcasts, each one can use only a part of it
+    download_queue = DownloadQueue(config[configuration.CONFIG_DOWNLOAD_WORKERS])
+
+    # the podcasts sharing the directory use the same list of its files
+    directory_index = RunDirectoryIndex(session.downloaded_index, session.rescan)
+    politeness = PolitenessScheduler()
+    # the limit shared by all the transfers of the run
+    download_bucket = build_token_bucket(
+        config.get(configuration.CONFIG_DOWNLOAD_RATE_LIMIT)
+    )
+    feed_downloads = defaultdict(list)
+    unfinished_feeds = set()
+
+    enabled_rss_links = get_enabled_rss_links(rss_sources)
+    # the same feed can be used by many podcasts (e.g. with different filters)
+    feed_uses = Counter(enabled_rss_links)
+
+    parse = stream_feed if config[configuration.CONFIG_STREAMING_PARSER] else parse_feed
+
+    # feedparser keeps one core busy, so the many feeds are parsed by the
+    # other processes (only the entities are sent back)
+    parse_workers = config[configuration.CONFIG_FEED_PARSE_WORKERS]
+    if parse_workers > 1 and len(feed_uses) >= PARSE_POOL_MIN_FEEDS:
+        if session.parse_pool is None:
+            session.parse_pool = build_parse_pool(parse_workers)
+
+        parse = partial(parse_in_pool, session.parse_pool, parse)
+
+    if session.feed_snapshots:
+        parse = partial(parse_with_snapshot, session.feed_snapshots, parse)
+
+    feeds_settings = get_feeds_settings(config, rss_sources)
+    feeds = prefetch(
+        partial(
+            fetch_feed,
+            session.open_link,
+            session.feed_validators,
+            config[configuration.CONFIG_HTTP_HEADER],
+            parse,
+            feeds_settings,
+        ),
+        enabled_rss_links,
+        config[configuration.CONFIG_FEED_FETCH_WORKERS],
+        config[configuration.CONFIG_FEED_FETCH_WORKERS_PER_HOST],
+    )
+
+    for rss_source in rss_sources:
+        file_length_limit = get_system_file_name_limit(rss_source)
+        rss_source_name = rss_source.get(configuration.CONFIG_PODCASTS_NAME, None)
+        rss_source_path = os.path.expanduser(
+            rss_source[configuration.CONFIG_PODCASTS_PATH]
+        )
+        rss_source_link = rss_source[configuration.CONFIG_PODCASTS_RSS_LINK]
+        rss_disable = rss_source.get(configuration.CONFIG_PODCASTS_DISABLE, False)
+        rss_file_name_template_value = rss_source.get(
+            configuration.CONFIG_FILE_NAME_TEMPLATE,
+            config[configuration.CONFIG_FILE_NAME_TEMPLATE],
+        )
+        rss_on_empty_directory = rss_source.get(
+            configuration.CONFIG_IF_DIRECTORY_EMPTY,
+            config[configuration.CONFIG_IF_DIRECTORY_EMPTY],
+        )
+        rss_podcast_extensions = rss_source.get(
+            configuration.CONFIG_PODCAST_EXTENSIONS,
+            config[configuration.CONFIG_PODCAST_EXTENSIONS],
+        )
+        rss_https_header = merge_parameters_collection(
+            config[configuration.CONFIG_HTTP_HEADER],
+            rss_source.get(configuration.CONFIG_HTTP_HEADER, {}),
+        )
+        rss_fill_up_gaps = rss_source.get(
+            config[configuration.CONFIG_FILL_UP_GAPS],
+            rss_source.get(configuration.CONFIG_FILL_UP_GAPS, False),
+        )
+        rss_download_delay = rss_source.get(
+            configuration.CONFIG_DOWNLOAD_DELAY,
+            config[configuration.CONFIG_DOWNLOAD_DELAY],
+        )
+        rss_download_delay_scope = rss_source.get(
+            configuration.CONFIG_DOWNLOAD_DELAY_SCOPE,
+            config[configuration.CONFIG_DOWNLOAD_DELAY_SCOPE],
+        )
+
+        rss_download_workers = rss_source.get(
+            configuration.CONFIG_DOWNLOAD_WORKERS,
+            config[configuration.CONFIG_DOWNLOAD_WORKERS],
+        )
+
+        if rss_disable:
+            logger.info('Skipping the "%s"', rss_source_name or rss_source_link)
+            continue
+
+        try:
+            fetched_feed = feeds[rss_source_link].result()
+        except Exception as error:
+            logger.error(f"Error while checking the link: '{rss_source_link}': {error}")
+            continue
+
+        if not fetched_feed.is_modified:
+            logger.info(
+                "%s: Nothing new, the feed has not changed since the last run",
+                rss_source_name or rss_source_link,
+            )
+            continue
+
+        feed = fetched_feed.feed
+        if is_feed_broken(feed):
+            logger.error(
+                f"Error while checking the link: '{rss_source_link}': {get_feed_error(feed)}"
+            )
+            unfinished_feeds.add(rss_source_link)
+            continue
+
+        session.feed_update_hints[rss_source_link] = get_update_hints(
+            get_feed_channel(feed)
+        )
+
+        if not rss_source_name:
+            rss_source_name = get_feed_title(feed)
+
+        logger.info('Checking "%s"', rss_source_name)
+
+        to_name_function = configuration_to_function_rss_to_name(
+            rss_file_name_template_value, rss_source
+        )
+
+        on_empty_directory = configuration_to_function_on_empty_directory(
+            rss_on_empty_directory, session.last_run_datetime
+        )
+
+        with timings.measure(rss_source_link, PHASE_SCAN):
+            downloaded_files = directory_index.get_files(
+                get_extensions_checker(rss_podcast_extensions),
+                rss_source_path,
+            )
+
+        allow_link_types = list(set(rss_podcast_extensions.values()))
+
+        # the entries are read (and named) only as far as it is needed
+        feed_entries = compose(
+            partial(filter, build_only_allowed_filter_for_link_data(allow_link_types)),
+            get_feed_entities,
+        )(feed)
+
+        to_real_podcast_file_name = compose(
+            partial(limit_file_name, file_length_limit), to_name_function
+        )
+
+        # with the lazy feed, the plan includes reading of the entries
+        with timings.measure(rss_source_link, PHASE_PLAN):
+            reconciliation = reconcile(
+                to_real_podcast_file_name,
+                downloaded_files,
+                feed_entries,
+                rss_fill_up_gaps,
+            )
+
+            last_downloaded_file = None
+            if reconciliation.has_downloaded_files:
+                last_downloaded_file = reconciliation.get_last_downloaded_file(
+                    rss_fill_up_gaps
+                )
+                missing_files_links = reconciliation.get_missing_entities(
+                    rss_fill_up_gaps
+                )
+            else:
+                # nothing has been found, so the whole feed has been read
+                missing_files_links = compose(list, on_empty_directory)(
+                    reconciliation.entities
+                )
+
+        # only the read entities are needed from now, the parse tree can be
+        # freed after the last podcast using the feed
+        feed_uses[rss_source_link] -= 1
+        if feed_uses[rss_source_link] == 0:
+            fetched_feed.feed = feed = feed_entries = None
+
+        logger.info('Last downloaded file "%s"', last_downloaded_file or "<none>")
+
+        if missing_files_links:
+            download_podcast = partial(
+                download_rss_entity_to_path,
+                session.open_link,
+                rss_https_header,
+                to_real_podcast_file_name,
+                partial(timings.add_download, rss_source_link),
+                build_throttle(
+                    [
+                        download_bucket,
+                        build_token_bucket(
+                            rss_source.get(configuration.CONFIG_DOWNLOAD_RATE_LIMIT)
+                        ),
+                    ]
+                ),
+                session.deduplicator,
+            )
+            get_turn_delay = partial(
+                get_download_turn_delay,
+                politeness,
+                rss_download_delay,
+                partial(
+                    get_download_delay_key, rss_download_delay_scope, rss_source_link
+                ),
+            )
+
+            download_sequence = download_queue.start_sequence(rss_download_workers)
+
+            for rss_entry in reversed(missing_files_links):
+                wanted_podcast_file_name = to_name_function(rss_entry)
+
+                if downloads_limit == 0:
+                    unfinished_feeds.add(rss_source_link)
+                    continue
+
+                if len(wanted_podcast_file_name) > file_length_limit:
+                    logger.info(
+                        'Your system cannot support the full podcast file name "%s". The name will be shortened',
+                        wanted_podcast_file_name,
+                    )
+
+                logger.info(
+                    '%s: Downloading file: "%s" saved as "%s"',
+                    rss_source_name,
+                    rss_entry.link,
+                    to_real_podcast_file_name(rss_entry),
+                )
+
+                directory_index.reserve(
+                    rss_source_path, to_real_podcast_file_name(rss_entry)
+                )
+
+                feed_downloads[rss_source_link].append(
+                    download_sequence.submit(
+                        partial(download_podcast, rss_source_path, rss_entry),
+                        partial(publish_downloaded_file, directory_index),
+                        partial(get_turn_delay, rss_entry),
+                    )
+                )
+                downloads_limit -= 1
+        else:
+            logger.info("%s: Nothing new", rss_source_name)
+
+    download_queue.wait_for_all()
+
+    # the feed is not asked again only if everything from it has been downloaded
+    for rss_source_link, fetched_feed in feeds.items():
+        if (
+            rss_source_link not in unfinished_feeds
+            and fetched_feed.exception() is None
+            and all(
+                download.exception() is None and download.result()
+                for download in feed_downloads[rss_source_link]
+            )
+        ):
+            session.feed_validators.update(
+                rss_source_link,
+                fetched_feed.result().validators,
+                feeds_settings[rss_source_link],
+            )
+
+    for rss_source_link, fetched_feed in feeds.items():
+        if fetched_feed.exception() is None:
+            timings.add(
+                rss_source_link, PHASE_FETCH, fetched_feed.result().fetch_seconds
+            )
+            timings.add(
+                rss_source_link, PHASE_PARSE, fetched_feed.result().parse_seconds
+            )
+
+    session.feed_validators.save()
+
+    if session.feed_snapshots:
+        session.feed_snapshots.evict()
+
+    return downloads_limit
+
+
+def run_coordinated(
+    session: Session,
+    config: Dict,
+    poll_interval: float = COORDINATION_POLL_INTERVAL,
+) -> None:
+    # Many workers share the feeds: each one leases a few of them at once
+    # (as many as are fetched together) until all of them are finished.
+    coordinator = LeaseCoordinator(
+        os.path.expanduser(config[configuration.CONFIG_COORDINATION_DATABASE]),
+        config[configuration.CONFIG_LEASE_SECONDS],
+    )
+    rss_sources = config[configuration.CONFIG_PODCASTS]
+    # the limit is for the whole run of the worker, not for each of the leases
+    downloads_limit = config[configuration.CONFIG_DOWNLOADS_LIMIT]
+    timings = RunTimings()
+
+    try:
+        coordinator.join(get_enabled_rss_links(rss_sources))
+        logger.info("Working as %s", coordinator.worker_id)
+
+        with Heartbeat(coordinator):
+            while True:
+                rss_links = coordinator.acquire(
+                    config[configuration.CONFIG_FEED_FETCH_WORKERS]
+                )
+
+                if rss_links:
+                    downloads_limit = run_podcasts(
+                        session,
+                        config,
+                        [
+                            rss_source
+                            for rss_source in rss_sources
+                            if rss_source[configuration.CONFIG_PODCASTS_RSS_LINK]
+                            in rss_links
+                        ],
+                        timings,
+                        downloads_limit,
+                    )
+                    coordinator.finish(rss_links)
+                    continue
+
+                if coordinator.is_round_finished():
+                    break
+
+                # the rest is leased by the other workers, their feeds are
+                # taken over if they stop before finishing them
+                time.sleep(poll_interval)
+
+        report_timings(session, timings)
+    finally:
+        coordinator.close()
+
+
+def get_configured_update_interval(
+    rss_sources: List[Dict], rss_link: str
+) -> Optional[int]:
+    intervals = [
+        rss_source[configuration.CONFIG_UPDATE_INTERVAL]
+        for rss_source in rss_sources
+        if rss_source[configuration.CONFIG_PODCASTS_RSS_LINK] == rss_link
+        and configuration.CONFIG_UPDATE_INTERVAL in rss_source
+    ]
+
+    return min(intervals, default=None)
+
+
+def run_daemon(
+    session: Session, config_file_path: str, parameters: Dict, config: Dict
+) -> None:
+    # Each feed is checked on its own interval. The configuration file is
+    # watched and loaded again when it is changed.
+    scheduler = FeedScheduler()
+    scheduler.keep_only(
+        get_enabled_rss_links(config[configuration.CONFIG_PODCASTS]), time.time()
+    )
+    config_modification_time = get_modification_time(config_file_path)
+
+    while True:
+        due_links = set(scheduler.get_due(time.time()))
+
+        if due_links:
+            rss_sources = config[configuration.CONFIG_PODCASTS]
+            # the report covers the last check
+            timings = RunTimings()
+            run_podcasts(
+                session,
+                config,
+                [
+                    rss_source
+                    for rss_source in rss_sources
+                    if rss_source[configuration.CONFIG_PODCASTS_RSS_LINK] in due_links
+                ],
+                timings,
+                config[configuration.CONFIG_DOWNLOADS_LIMIT],
+            )
+            report_timings(session, timings)
+            # all the podcasts have been checked at start, the index is fresh
+            session.rescan = False
+
+            now = time.time()
+            for rss_link in due_links:
+                scheduler.schedule(
+                    rss_link,
+                    get_update_interval(
+                        get_configured_update_interval(rss_sources, rss_link),
+                        config[configuration.CONFIG_UPDATE_INTERVAL],
+                        session.feed_update_hints.get(rss_link, {}),
+                        session.feed_validators.get(rss_link),
+                        now,
+                    ),
+                    now,
+                )
+
+            logger.info(
+                "Waiting for the next check (%s)",
+                time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(scheduler.get_next_check())
+                ),
+            )
+
+        next_check = scheduler.get_next_check()
+        time.sleep(
+            CONFIGURATION_CHECK_INTERVAL
+            if next_check is None
+            else max(0, min(next_check - time.time(), CONFIGURATION_CHECK_INTERVAL))
+        )
+
+        modification_time = get_modification_time(config_file_path)
+        if modification_time == config_modification_time:
+            continue
+
+        config_modification_time = modification_time
+        try:
+            new_config = load_configuration(config_file_path, parameters)
+        except Exception as error:
+            logger.error("The configuration file cannot be loaded: %s", error)
+            continue
+
+        is_valid, error = configuration_verification(new_config)
+        if not is_valid:
+            logger.error("There is a problem with configuration file: %s", error)
+            continue
+
+        logger.info("The configuration has been changed, loading it again")
+        config = apply_selection(new_config, parameters)
+        scheduler.keep_only(
+            get_enabled_rss_links(config[configuration.CONFIG_PODCASTS]), time.time()
+        )
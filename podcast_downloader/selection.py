@@ -0,0 +1,88 @@
+import argparse
+import hashlib
+import re
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import configuration
+
+SHARD_PATTERN = re.compile(r"^(\d+)/(\d+)$")
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(value: str) -> Shard:
+    # the shards are numbered from 1, e.g. "3/8" is the third of eight
+    match = SHARD_PATTERN.match(value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f'The shard "{value}" should look like "3/8" (the shard/all the shards)'
+        )
+
+    index, count = int(match[1]), int(match[2])
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f'The shard "{value}" should be between 1 and {count}'
+        )
+
+    return index, count
+
+
+def get_shard_number(rss_link: str, count: int) -> int:
+    # The shard depends only on the feed link, so adding the feeds does not
+    # move the other ones, and the podcasts sharing the feed stay together.
+    link_hash = hashlib.sha256(rss_link.encode("utf-8")).digest()
+    return int.from_bytes(link_hash[:8], "big") % count + 1
+
+
+def is_in_shard(shard: Shard, rss_source: Dict) -> bool:
+    index, count = shard
+    return (
+        get_shard_number(rss_source[configuration.CONFIG_PODCASTS_RSS_LINK], count)
+        == index
+    )
+
+
+def is_matching_any(patterns: Iterable[str], rss_source: Dict) -> bool:
+    # the pattern is compared with the name and the link of the podcast
+    values = [
+        value.casefold()
+        for value in (
+            rss_source.get(configuration.CONFIG_PODCASTS_NAME, None),
+            rss_source[configuration.CONFIG_PODCASTS_RSS_LINK],
+        )
+        if value
+    ]
+
+    return any(
+        fnmatchcase(value, pattern.casefold())
+        for pattern in patterns
+        for value in values
+    )
+
+
+def select_podcasts(
+    rss_sources: List[Dict], shard: Optional[Shard], only: Optional[List[str]]
+) -> List[Dict]:
+    return [
+        rss_source
+        for rss_source in rss_sources
+        if (shard is None or is_in_shard(shard, rss_source))
+        and (not only or is_matching_any(only, rss_source))
+    ]
+
+
+def apply_selection(config: Dict, parameters: Dict) -> Dict:
+    # the podcasts outside the selection are left out before anything is done
+    return {
+        **config,
+        configuration.CONFIG_PODCASTS: select_podcasts(
+            config[configuration.CONFIG_PODCASTS],
+            parameters.get("shard", None),
+            parameters.get("only", None),
+        ),
+    }
+
+
+def has_selection(parameters: Dict) -> bool:
+    return "shard" in parameters or "only" in parameters
@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+
+from .feed_stream import (
+    FeedSnapshot,
+    StreamedFeed,
+    is_feed_broken,
+    take_feed_snapshot,
+)
+from .rss import RSSEntity
+
+if TYPE_CHECKING:
+    import feedparser
+
+Feed = Union[StreamedFeed, FeedSnapshot, "feedparser.FeedParserDict"]
+
+FEED_SNAPSHOTS_DIRECTORY_NAME = "snapshots"
+FEED_SNAPSHOT_EXTENSION = ".json.gz"
+FEED_SNAPSHOT_VERSION = 1
+
+BYTES_IN_MEGABYTE = 1024 * 1024
+
+# the headers changing the result of the parsing (the encoding, the base of
+# the relative links)
+PARSE_HEADERS = ("content-type", "content-location")
+
+
+def get_feed_body_hash(body: bytes, headers: Dict[str, str]) -> str:
+    body_hash = hashlib.sha256(body)
+    for header in PARSE_HEADERS:
+        body_hash.update(f"\n{header}: {headers.get(header, '')}".encode("utf-8"))
+
+    return body_hash.hexdigest()
+
+
+def feed_snapshot_to_bytes(snapshot: FeedSnapshot) -> bytes:
+    return gzip.compress(
+        json.dumps(
+            {
+                "version": FEED_SNAPSHOT_VERSION,
+                "channel": snapshot.channel,
+                "entities": [
+                    [
+                        list(entity.published_date),
+                        entity.title,
+                        entity.type,
+                        entity.link,
+                    ]
+                    for entity in snapshot.entities()
+                ],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+
+
+def bytes_to_feed_snapshot(data: bytes) -> Optional[FeedSnapshot]:
+    content = json.loads(gzip.decompress(data))
+    if content.get("version") != FEED_SNAPSHOT_VERSION:
+        return None
+
+    return FeedSnapshot(
+        content["channel"],
+        [
+            RSSEntity(time.struct_time(published_date), title, link_type, link)
+            for published_date, title, link_type, link in content["entities"]
+        ],
+    )
+
+
+class FeedSnapshotStore:
+    # The snapshots of the parsed feeds, one file for each feed body. The
+    # files are used like the cache: the least recently used ones are
+    # removed, when all of them take more than the given size.
+
+    def __init__(self, directory: str, size_limit: int) -> None:
+        self.directory = directory
+        self.size_limit = size_limit
+        self.lock = threading.Lock()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + FEED_SNAPSHOT_EXTENSION)
+
+    def load(self, key: str) -> Optional[FeedSnapshot]:
+        path = self.get_path(key)
+
+        try:
+            with open(path, "rb") as file:
+                snapshot = bytes_to_feed_snapshot(file.read())
+
+            # the modification time marks the last use
+            os.utime(path)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            # there is no snapshot, or it cannot be read (it will be replaced)
+            return None
+
+        return snapshot
+
+    def save(self, key: str, snapshot: FeedSnapshot) -> None:
+        path = self.get_path(key)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(temporary_path, "wb") as file:
+            file.write(feed_snapshot_to_bytes(snapshot))
+
+        os.replace(temporary_path, path)
+
+    def evict(self) -> List[str]:
+        with self.lock:
+            try:
+                entries = [
+                    entry
+                    for entry in os.scandir(self.directory)
+                    if entry.name.endswith(FEED_SNAPSHOT_EXTENSION)
+                ]
+            except FileNotFoundError:
+                return []
+
+            files = sorted(
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in entries
+            )
+            total_size = sum(size for _, size, _ in files)
+            removed = []
+
+            for _, size, path in files:
+                if total_size <= self.size_limit:
+                    break
+
+                os.remove(path)
+                total_size -= size
+                removed.append(path)
+
+            return removed
+
+
+def parse_with_snapshot(
+    store: FeedSnapshotStore,
+    parse: Callable[[bytes, Dict[str, str]], Feed],
+    body: bytes,
+    headers: Dict[str, str],
+) -> Feed:
+    # The server can send the same feed again (e.g. without the support for
+    # the conditional requests), then the snapshot is used instead of parsing.
+    key = get_feed_body_hash(body, headers)
+
+    snapshot = store.load(key)
+    if snapshot is not None:
+        return snapshot
+
+    feed = parse(body, headers)
+    if isinstance(feed, StreamedFeed) or is_feed_broken(feed):
+        # the streamed feed is read only as far as it is needed, the
+        # snapshot would read all of it
+        return feed
+
+    try:
+        snapshot = take_feed_snapshot(feed)
+    except Exception:
+        # the entries are read only as far as it is needed, so the broken
+        # ones are not always a problem: the feed is used as it is
+        return feed
+
+    if "title" not in snapshot.channel:
+        return feed
+
+    try:
+        store.save(key, snapshot)
+    except OSError:
+        # the snapshot only saves the time of the next run
+        pass
+
+    return snapshot
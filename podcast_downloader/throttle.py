@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+Throttle = Callable[[int], None]
+
+
+class TokenBucket:
+    # Limits the number of bytes per second, for all the threads sharing it.
+    # The bucket holds up to one second of the transfer. Each chunk takes its
+    # bytes from the bucket at once (going into debt, when there is not
+    # enough of them) and its thread waits until the debt is paid off.
+
+    def __init__(
+        self,
+        rate: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = rate
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.tokens = float(rate)
+        self.updated = clock()
+
+    def consume(self, amount: int) -> None:
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        # the lock is not held while waiting, so the other threads can take
+        # their place in the queue
+        if wait > 0:
+            self.sleep(wait)
+
+
+def build_token_bucket(rate: Optional[int]) -> Optional[TokenBucket]:
+    return TokenBucket(rate) if rate else None
+
+
+def build_throttle(buckets: Iterable[Optional[TokenBucket]]) -> Optional[Throttle]:
+    # every chunk has to pass all the limits (e.g. the global and the podcast one)
+    active_buckets = [bucket for bucket in buckets if bucket is not None]
+    if not active_buckets:
+        return None
+
+    def throttle(amount: int) -> None:
+        for bucket in active_buckets:
+            bucket.consume(amount)
+
+    return throttle
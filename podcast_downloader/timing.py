@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List
+
+PHASE_FETCH = "fetch"
+PHASE_PARSE = "parse"
+PHASE_SCAN = "scan"
+PHASE_PLAN = "plan"
+PHASE_DOWNLOAD = "download"
+
+PHASES = (PHASE_FETCH, PHASE_PARSE, PHASE_SCAN, PHASE_PLAN, PHASE_DOWNLOAD)
+
+BYTES_IN_MEGABYTE = 1024 * 1024
+
+
+@dataclass
+class DownloadTiming:
+    file_name: str
+    seconds: float
+    bytes: int
+
+    @property
+    def throughput(self) -> float:
+        # bytes per second
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+
+class RunTimings:
+    # Collects the time spent in each phase, per feed. The downloads are
+    # reported from many threads at once.
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.downloads: Dict[str, List[DownloadTiming]] = {}
+
+    def add(self, feed: str, phase: str, seconds: float) -> None:
+        with self.lock:
+            feed_phases = self.phases.setdefault(feed, {})
+            feed_phases[phase] = feed_phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, feed: str, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(feed, phase, time.perf_counter() - start)
+
+    def add_download(
+        self, feed: str, file_name: str, seconds: float, size: int
+    ) -> None:
+        self.add(feed, PHASE_DOWNLOAD, seconds)
+
+        with self.lock:
+            self.downloads.setdefault(feed, []).append(
+                DownloadTiming(file_name, seconds, size)
+            )
+
+    def get_summary(self) -> List[str]:
+        lines = [
+            " ".join(f"{phase + ' [s]':>12}" for phase in PHASES)
+            + f" {'files':>6} {'MB':>9} {'MB/s':>7}  feed"
+        ]
+
+        with self.lock:
+            for feed, feed_phases in self.phases.items():
+                downloads = self.downloads.get(feed, [])
+                downloaded_bytes = sum(download.bytes for download in downloads)
+                download_seconds = feed_phases.get(PHASE_DOWNLOAD, 0.0)
+                throughput = (
+                    downloaded_bytes / download_seconds if download_seconds else 0.0
+                )
+
+                lines.append(
+                    " ".join(
+                        f"{feed_phases.get(phase, 0.0):>12.3f}" for phase in PHASES
+                    )
+                    + f" {len(downloads):>6}"
+                    + f" {downloaded_bytes / BYTES_IN_MEGABYTE:>9.2f}"
+                    + f" {throughput / BYTES_IN_MEGABYTE:>7.2f}"
+                    + f"  {feed}"
+                )
+
+        return lines
+
+    def to_report(self) -> Dict:
+        with self.lock:
+            return {
+                "total_seconds": time.perf_counter() - self.started,
+                "feeds": [
+                    {
+                        "feed": feed,
+                        "phases": dict(feed_phases),
+                        "downloads": [
+                            {**asdict(download), "throughput": download.throughput}
+                            for download in self.downloads.get(feed, [])
+                        ],
+                    }
+                    for feed, feed_phases in self.phases.items()
+                ],
+            }
+
+    def save_report(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_report(), file, indent=2)
@@ -1,4 +1,5 @@
 from functools import reduce
+from urllib.parse import urlsplit
 from logging import Formatter, WARNING, ERROR
 
 
@@ -25,3 +26,7 @@ class ConsoleOutputFormatter(Formatter):
 
 def compose(*functions):
     return reduce(lambda f, g: lambda x: f(g(x)), functions)
+
+
+def link_to_host(link: str) -> str:
+    return urlsplit(link).netloc.lower()
@@ -1,11 +1,11 @@
 from functools import partial
 import os
-from podcast_downloader.__main__ import get_system_file_name_limit
+from podcast_downloader.runner import get_system_file_name_limit
 from podcast_downloader.downloaded import get_downloaded_files, get_extensions_checker
 from podcast_downloader.parameters import load_configuration_file
+from podcast_downloader.reconciliation import reconcile
 from podcast_downloader.rss import (
     build_only_allowed_filter_for_link_data,
-    build_only_new_entities,
     file_template_to_file_name,
     flatten_rss_links_data,
     get_raw_rss_entries_from_feed,
@@ -38,7 +38,7 @@ all_feed_entries = compose(
     get_raw_rss_entries_from_feed,
 )(feed)
 
-downloaded_files = list(
+downloaded_files = set(
     get_downloaded_files(
         get_extensions_checker(rss_podcast_extensions), rss_source_path
     )
@@ -50,25 +50,18 @@ to_real_podcast_file_name = compose(
     partial(limit_file_name, file_length_limit), to_name_function
 )
 
-all_feed_files = list(map(to_real_podcast_file_name, all_feed_entries))[::-1]
-only_files_from_feed_sorted = [
-    feed for feed in all_feed_files if feed in downloaded_files
-]
-last_downloaded_file = only_files_from_feed_sorted[-1]
-
-download_limiter_function = partial(
-    build_only_new_entities(to_name_function), last_downloaded_file
+reconciliation = reconcile(
+    to_real_podcast_file_name, downloaded_files, all_feed_entries
+)
+missing_files = set(
+    map(to_real_podcast_file_name, reconciliation.get_missing_entities(False))
 )
 
-missing_files_links = compose(list, download_limiter_function)(all_feed_entries)
-
-for feed in all_feed_entries:
-    feed_file = to_real_podcast_file_name(feed)
-
+for feed, feed_file in zip(reconciliation.entities, reconciliation.file_names):
     status = (
         "to-download"
-        if feed_file in missing_files_links
-        else ("downloaded" if feed_file in only_files_from_feed_sorted else "ignored")
+        if feed_file in missing_files
+        else ("downloaded" if feed_file in downloaded_files else "ignored")
     )
 
     print(feed.title + "\t" + feed_file + "\t" + status)
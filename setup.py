@@ -16,6 +16,11 @@ setup(
     long_description=read("README.md"),
     packages=["podcast_downloader"],
     install_requires=["feedparser"],
+    entry_points={
+        "console_scripts": [
+            "podcast_downloader=podcast_downloader.__main__:main",
+        ],
+    },
     url="https://github.com/dplocki/podcast-downloader",
     classifiers=[
         "Environment :: Console",
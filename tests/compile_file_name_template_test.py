@@ -0,0 +1,107 @@
+import random
+import unittest
+from podcast_downloader.rss import (
+    RSSEntity,
+    compile_file_name_template,
+    file_template_to_file_name,
+)
+
+from tests.commons import build_timestamp
+
+TEMPLATE_PIECES = [
+    "%file_name%",
+    "%file_extension%",
+    "%publish_date%",
+    "%title%",
+    "%publish_date:$Y-$m-$d%",
+    "%publish_date:$d%",
+    "%publish_date:",
+    "%publ",
+    "ish_date%",
+    "file_name",
+    "title",
+    "%",
+    "$",
+    "$Y",
+    "[",
+    "]",
+    ".",
+    " ",
+    "-",
+    "_",
+    "a",
+]
+
+LINKS = [
+    "http://www.podcast.com/podcast/something/abc.mp3",
+    "http://www.podcast.com/file_name.mp3?with&parameter",
+    "http://www.podcast.com/title.%title%.mp3",
+    "http://www.podcast.com/no_extension",
+    "http://www.podcast.com/%25.mp3",
+    "http://www.podcast.com/ish_date%.mp3",
+]
+
+TITLES = [
+    "The fancy title",
+    "  spaces around  ",
+    "100% sure",
+    "%file_name%",
+    "publish_date%",
+    "",
+]
+
+
+def call(function, entity: RSSEntity):
+    try:
+        return function(entity)
+    except ValueError as error:
+        return type(error)
+
+
+class TestCompileFileNameTemplate(unittest.TestCase):
+    def test_compiled_template_should_render_typical_template(self):
+        # Assign
+        entity = RSSEntity(
+            build_timestamp(2020, 1, 2),
+            "The fancy title",
+            "audio/mp3",
+            "http://www.podcast.com/podcast/something/abc.mp3",
+        )
+
+        # Act
+        result = compile_file_name_template(
+            "[%publish_date:$Y-$m-$d%] %title%.%file_extension%"
+        )(entity)
+
+        # Assert
+        self.assertEqual(result, "[2020-01-02] The fancy title.mp3")
+
+    def test_compiled_template_should_match_reference_implementation(self):
+        # Assign
+        generator = random.Random(2137)
+
+        for _ in range(5000):
+            template = "".join(
+                generator.choice(TEMPLATE_PIECES)
+                for _ in range(generator.randint(0, 8))
+            )
+            entity = RSSEntity(
+                build_timestamp(
+                    2020, generator.randint(1, 12), generator.randint(1, 28)
+                ),
+                generator.choice(TITLES),
+                "audio/mp3",
+                generator.choice(LINKS),
+            )
+
+            # Act
+            result = call(compile_file_name_template(template), entity)
+
+            # Assert
+            self.assertEqual(
+                result,
+                call(
+                    lambda entity: file_template_to_file_name(template, entity), entity
+                ),
+                f'The template "{template}" should give the same name as before',
+            )
@@ -64,3 +64,27 @@ class TestConfigurationVerification(unittest.TestCase):
         )
 
         self.assertIsNone(message, "The validator should not return any message")
+
+    def test_check_for_invalid_download_workers(self):
+        # Assign
+        config = {
+            configuration.CONFIG_DOWNLOAD_WORKERS: 2,
+            configuration.CONFIG_PODCASTS: [
+                {
+                    configuration.CONFIG_PODCASTS_NAME: "no workers",
+                    configuration.CONFIG_PODCASTS_PATH: "/podcast/directory",
+                    configuration.CONFIG_PODCASTS_RSS_LINK: "https://podcasts/mine",
+                    configuration.CONFIG_DOWNLOAD_WORKERS: 0,
+                }
+            ],
+        }
+
+        # Act
+        is_valid_result, message = configuration.configuration_verification(config)
+
+        # Assert
+        self.assertFalse(
+            is_valid_result,
+            "Validator should notice the wrong 'download_workers' value",
+        )
+        self.assertIsNotNone(message, "The validator should return message")
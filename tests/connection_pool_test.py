@@ -0,0 +1,81 @@
+import threading
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from podcast_downloader.network import ConnectionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file.mp3")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path != "/file.mp3":
+            self.send_error(404)
+            return
+
+        content = b"mp3_content"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *_):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.client_ports = set()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.link_prefix = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.pool = ConnectionPool(2)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_should_reuse_connection(self):
+        # Act
+        results = []
+        for _ in range(3):
+            with self.pool.open(self.link_prefix + "/file.mp3", {}) as response:
+                results.append(response.read())
+
+        # Assert
+        self.assertListEqual(results, [b"mp3_content"] * 3)
+        self.assertEqual(
+            len(self.server.client_ports), 1, "Only one connection should be made"
+        )
+
+    def test_should_follow_redirects(self):
+        # Act
+        with self.pool.open(self.link_prefix + "/redirect", {}) as response:
+            result = response.read()
+            url = response.url
+
+        # Assert
+        self.assertEqual(result, b"mp3_content")
+        self.assertEqual(url, self.link_prefix + "/file.mp3")
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_should_raise_http_error(self):
+        # Act
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.pool.open(self.link_prefix + "/missing.mp3", {})
+
+        # Assert
+        self.assertEqual(context.exception.code, 404)
@@ -0,0 +1,105 @@
+import random
+import unittest
+from podcast_downloader.cache import VALIDATOR_EXPIRES
+from podcast_downloader.daemon import (
+    MINIMUM_UPDATE_INTERVAL,
+    FeedScheduler,
+    get_channel_update_interval,
+    get_update_hints,
+    get_update_interval,
+)
+
+
+class TestGetUpdateInterval(unittest.TestCase):
+    def test_should_read_interval_from_channel(self):
+        # Assign
+        test_parameters = [
+            ({}, None),
+            ({"ttl": "30"}, 30 * 60),
+            ({"ttl": "-5"}, None),
+            ({"ttl": "often"}, None),
+            ({"sy_updateperiod": "daily"}, 24 * 60 * 60),
+            ({"sy_updateperiod": "Daily", "sy_updatefrequency": "4"}, 6 * 60 * 60),
+            ({"sy_updateperiod": "hourly", "ttl": "120"}, 120 * 60),
+            ({"sy_updateperiod": "never"}, None),
+        ]
+
+        for channel, expected_interval in test_parameters:
+            # Act
+            result = get_channel_update_interval(channel)
+
+            # Assert
+            self.assertEqual(result, expected_interval, channel)
+
+    def test_should_choose_interval(self):
+        # Assign
+        now = 1000.0
+        test_parameters = [
+            (7200, {"ttl": "30"}, {}, 7200),
+            (None, {}, {}, 3600),
+            (None, {"ttl": "120"}, {}, 7200),
+            (None, {"ttl": "10"}, {VALIDATOR_EXPIRES: now + 900}, 900),
+            (None, {}, {VALIDATOR_EXPIRES: now - 10}, 3600),
+            (None, {"ttl": "0"}, {VALIDATOR_EXPIRES: now + 5}, MINIMUM_UPDATE_INTERVAL),
+        ]
+
+        for configured, channel, validators, expected_interval in test_parameters:
+            # Act
+            result = get_update_interval(configured, 3600, channel, validators, now)
+
+            # Assert
+            self.assertEqual(result, expected_interval, (configured, channel))
+
+    def test_should_keep_only_update_hints(self):
+        # Assign
+        channel = {"title": "Podcast", "ttl": "60", "sy_updateperiod": "daily"}
+
+        # Act
+        result = get_update_hints(channel)
+
+        # Assert
+        self.assertDictEqual(result, {"ttl": "60", "sy_updateperiod": "daily"})
+
+
+class TestFeedScheduler(unittest.TestCase):
+    def test_should_check_new_feeds_at_once(self):
+        # Assign
+        scheduler = FeedScheduler(generator=random.Random(0))
+
+        # Act
+        scheduler.keep_only(["a", "b"], 100.0)
+
+        # Assert
+        self.assertListEqual(scheduler.get_due(100.0), ["a", "b"])
+        self.assertEqual(scheduler.get_next_check(), 100.0)
+
+    def test_should_spread_checks_with_jitter(self):
+        # Assign
+        scheduler = FeedScheduler(0.1, random.Random(0))
+        links = [f"feed{number}" for number in range(20)]
+        scheduler.keep_only(links, 0.0)
+
+        # Act
+        for link in links:
+            scheduler.schedule(link, 1000.0, 0.0)
+
+        # Assert
+        checks = list(scheduler.next_checks.values())
+        self.assertTrue(all(900.0 <= check <= 1100.0 for check in checks))
+        self.assertGreater(len(set(checks)), 1, "The checks should not be at once")
+        self.assertListEqual(scheduler.get_due(899.0), [])
+        self.assertListEqual(sorted(scheduler.get_due(1100.0)), sorted(links))
+
+    def test_should_forget_removed_feeds_and_keep_the_rest(self):
+        # Assign
+        scheduler = FeedScheduler(0.0)
+        scheduler.keep_only(["a", "b"], 0.0)
+        scheduler.schedule("a", 500.0, 0.0)
+        scheduler.schedule("b", 500.0, 0.0)
+
+        # Act
+        scheduler.keep_only(["a", "c"], 10.0)
+
+        # Assert
+        self.assertDictEqual(scheduler.next_checks, {"a": 500.0, "c": 10.0})
+        self.assertListEqual(scheduler.get_due(10.0), ["c"])
@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+
+from podcast_downloader.download import DownloadQueue
+from podcast_downloader.politeness import PolitenessScheduler
+
+
+class TestDownloadSequence(unittest.TestCase):
+    def test_should_publish_in_order_of_submission(self):
+        # Assign
+        queue = DownloadQueue(4)
+        sequence = queue.start_sequence(4)
+        published = []
+
+        def download(index: int) -> int:
+            # the later ones finish first
+            time.sleep((4 - index) * 0.02)
+            return index
+
+        # Act
+        futures = [
+            sequence.submit(lambda index=index: download(index), published.append)
+            for index in range(4)
+        ]
+        queue.wait_for_all()
+
+        # Assert
+        self.assertListEqual(
+            published, [0, 1, 2, 3], "Results should be published in order"
+        )
+        self.assertTrue(
+            all(future.exception() is None for future in futures),
+            "None of the jobs should fail",
+        )
+
+    def test_should_limit_the_number_of_concurrent_downloads(self):
+        # Assign
+        queue = DownloadQueue(6)
+        sequence = queue.start_sequence(2)
+        lock = threading.Lock()
+        running = [0]
+        maximum_running = [0]
+
+        def download() -> None:
+            with lock:
+                running[0] += 1
+                maximum_running[0] = max(maximum_running[0], running[0])
+
+            time.sleep(0.02)
+
+            with lock:
+                running[0] -= 1
+
+        # Act
+        for _ in range(6):
+            sequence.submit(download, lambda _: None)
+
+        queue.wait_for_all()
+
+        # Assert
+        self.assertEqual(
+            maximum_running[0], 2, "Only two downloads should run at the same time"
+        )
+
+    def test_should_publish_next_results_after_failure(self):
+        # Assign
+        queue = DownloadQueue(2)
+        sequence = queue.start_sequence(2)
+        published = []
+
+        def failing_download() -> None:
+            raise ConnectionResetError("Connection lost")
+
+        # Act
+        failed = sequence.submit(failing_download, published.append)
+        succeeded = sequence.submit(lambda: "second", published.append)
+        queue.wait_for_all()
+
+        # Assert
+        self.assertIsInstance(failed.exception(), ConnectionResetError)
+        self.assertIsNone(succeeded.exception())
+        self.assertListEqual(published, ["second"], "The second should be published")
+
+    def test_should_not_hold_up_other_sequences_waiting_for_slot(self):
+        # Assign
+        queue = DownloadQueue(2)
+        slow_sequence = queue.start_sequence(1)
+        fast_sequence = queue.start_sequence(1)
+        release = threading.Event()
+
+        for _ in range(4):
+            slow_sequence.submit(release.wait, lambda _: None)
+
+        # Act
+        fast = fast_sequence.submit(lambda: "fast", lambda result: result)
+
+        # Assert
+        try:
+            self.assertEqual(
+                fast.result(timeout=5),
+                "fast",
+                "The waiting downloads should not take the threads of the pool",
+            )
+        finally:
+            release.set()
+            queue.wait_for_all()
+
+    def test_should_not_hold_up_other_hosts_during_the_delay(self):
+        # Assign
+        queue = DownloadQueue(1)
+        politeness = PolitenessScheduler()
+        slow_sequence = queue.start_sequence(1)
+        fast_sequence = queue.start_sequence(1)
+        start = time.monotonic()
+
+        for _ in range(5):
+            slow_sequence.submit(
+                lambda: None,
+                lambda _: None,
+                lambda: politeness.reserve("slow.com", 0.5),
+            )
+
+        # Act
+        fast = [
+            fast_sequence.submit(lambda: None, lambda _: time.monotonic() - start)
+            for _ in range(3)
+        ]
+        queue.wait_for_all()
+
+        # Assert
+        self.assertLess(
+            max(future.result() for future in fast),
+            0.4,
+            "The other host should not wait for the delay",
+        )
+        self.assertGreaterEqual(time.monotonic() - start, 2)
@@ -0,0 +1,191 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+import urllib.error
+from contextlib import contextmanager
+from typing import Dict
+
+from podcast_downloader.download import (
+    commit_partial_file,
+    download_to_partial_file,
+    to_partial_file_path,
+    to_resume_validator_path,
+)
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, status: int, headers: Dict[str, str], content: bytes) -> None:
+        super().__init__(content)
+        self.status = status
+        self.headers = headers
+
+
+class BrokenResponse(FakeResponse):
+    def read(self, size: int = -1) -> bytes:
+        if self.tell() >= 1000:
+            raise ConnectionResetError("Connection lost")
+
+        return super().read(min(size, 1000 - self.tell()))
+
+
+class FakeServer:
+    def __init__(self, headers: Dict[str, str], break_first: bool = True) -> None:
+        self.headers = headers
+        self.break_first = break_first
+        self.requests = []
+
+    @contextmanager
+    def open_link(self, link: str, headers: Dict[str, str]):
+        self.requests.append(headers)
+
+        if self.break_first and len(self.requests) == 1:
+            yield BrokenResponse(200, self.headers, CONTENT)
+            return
+
+        if "Range" in headers and headers.get("If-Range") in self.headers.values():
+            start = int(headers["Range"][len("bytes=") : -1])
+            yield FakeResponse(
+                206,
+                {**self.headers, "Content-Range": f"bytes {start}-/{len(CONTENT)}"},
+                CONTENT[start:],
+            )
+            return
+
+        yield FakeResponse(200, self.headers, CONTENT)
+
+
+class TestDownloadToPartialFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path_to_file = os.path.join(self.directory.name, "episode.mp3")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def download(self, server: FakeServer) -> None:
+        download_to_partial_file(
+            server.open_link, {}, "http://p.com/episode.mp3", self.path_to_file
+        )
+
+    def read_file(self) -> bytes:
+        with open(self.path_to_file, "rb") as file:
+            return file.read()
+
+    def test_should_resume_broken_download(self):
+        # Assign
+        server = FakeServer({"ETag": '"abc"', "Accept-Ranges": "bytes"})
+
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        # Act
+        self.download(server)
+        commit_partial_file(self.path_to_file)
+
+        # Assert
+        self.assertDictEqual(
+            server.requests[1],
+            {"Range": "bytes=1000-", "If-Range": '"abc"'},
+            "The second request should ask only for the missing part",
+        )
+        self.assertEqual(self.read_file(), CONTENT, "The file should be complete")
+        self.assertFalse(os.path.exists(to_resume_validator_path(self.path_to_file)))
+
+    def test_should_start_from_beginning_when_file_changed(self):
+        # Assign
+        server = FakeServer({"ETag": '"abc"'})
+
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        server.headers = {"ETag": '"changed"'}
+
+        # Act
+        self.download(server)
+        commit_partial_file(self.path_to_file)
+
+        # Assert
+        self.assertEqual(self.read_file(), CONTENT, "The file should be replaced")
+
+    def test_should_not_keep_partial_file_without_validator(self):
+        # Assign
+        server = FakeServer({"ETag": 'W/"weak"'})
+
+        # Act
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        # Assert
+        self.assertFalse(
+            os.path.exists(to_partial_file_path(self.path_to_file)),
+            "The partial file cannot be resumed, so it should be removed",
+        )
+
+    def test_should_start_from_beginning_on_not_satisfiable_range(self):
+        # Assign
+        server = FakeServer({"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        original_open_link = server.open_link
+
+        def open_link(link: str, headers: Dict[str, str]):
+            if "Range" in headers:
+                raise urllib.error.HTTPError(link, 416, "Not satisfiable", {}, None)
+
+            return original_open_link(link, headers)
+
+        # Act
+        download_to_partial_file(open_link, {}, "http://p.com/e.mp3", self.path_to_file)
+        commit_partial_file(self.path_to_file)
+
+        # Assert
+        self.assertEqual(self.read_file(), CONTENT, "The file should be complete")
+
+    def test_should_keep_partial_file_on_other_http_error(self):
+        # Assign
+        server = FakeServer({"ETag": '"abc"', "Accept-Ranges": "bytes"})
+
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        def open_link(link: str, headers: Dict[str, str]):
+            raise urllib.error.HTTPError(link, 503, "Service Unavailable", {}, None)
+
+        # Act
+        with self.assertRaises(urllib.error.HTTPError):
+            download_to_partial_file(
+                open_link, {}, "http://p.com/episode.mp3", self.path_to_file
+            )
+
+        # Assert
+        self.assertTrue(
+            os.path.exists(to_partial_file_path(self.path_to_file)),
+            "The partial file should be kept for the next attempt",
+        )
+        self.assertTrue(os.path.exists(to_resume_validator_path(self.path_to_file)))
+
+    def test_should_hash_whole_content_of_resumed_download(self):
+        # Assign
+        server = FakeServer({"ETag": '"abc"', "Accept-Ranges": "bytes"})
+        with self.assertRaises(ConnectionResetError):
+            self.download(server)
+
+        content_hash = hashlib.sha256()
+
+        # Act
+        download_to_partial_file(
+            server.open_link,
+            {},
+            "http://p.com/episode.mp3",
+            self.path_to_file,
+            content_hash=content_hash,
+        )
+
+        # Assert
+        self.assertEqual(content_hash.hexdigest(), hashlib.sha256(CONTENT).hexdigest())
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from podcast_downloader.downloaded import get_downloaded_files, get_extensions_checker
+
+
+class TestGetDownloadedFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def add_file(self, file_name: str) -> None:
+        with open(os.path.join(self.directory.name, file_name), "w") as file:
+            file.write(file_name)
+
+    def test_should_give_only_the_matching_files(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.add_file("second.mp3")
+        self.add_file("cover.jpg")
+        os.mkdir(os.path.join(self.directory.name, "directory.mp3"))
+
+        # Act
+        result = get_downloaded_files(
+            get_extensions_checker([".mp3"]), self.directory.name
+        )
+
+        # Assert
+        self.assertSetEqual(result, {"first.mp3", "second.mp3"})
+
+    def test_should_not_stat_the_files(self):
+        # Assign
+        for number in range(10):
+            self.add_file(f"{number}.mp3")
+
+        # Act
+        with mock.patch("os.stat", side_effect=AssertionError("os.stat called")):
+            result = get_downloaded_files(lambda _: True, self.directory.name)
+
+        # Assert
+        self.assertEqual(len(result), 10)
@@ -0,0 +1,189 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from podcast_downloader import downloaded
+from podcast_downloader.downloaded import (
+    DownloadedIndex,
+    RunDirectoryIndex,
+    get_extensions_checker,
+    read_indexed_directory,
+)
+
+
+class TestDownloadedIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = self.open_index()
+        self.podcast_directory = os.path.join(self.directory.name, "podcast")
+        os.mkdir(self.podcast_directory)
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.directory.cleanup()
+
+    def open_index(self) -> DownloadedIndex:
+        return DownloadedIndex(
+            os.path.join(self.directory.name, "cache", "index.sqlite")
+        )
+
+    def add_file(self, file_name: str) -> None:
+        with open(os.path.join(self.podcast_directory, file_name), "w") as file:
+            file.write(file_name)
+
+    def get_files(self, rescan: bool = False):
+        return sorted(
+            filter(
+                get_extensions_checker([".mp3"]),
+                read_indexed_directory(
+                    self.index, rescan, os.path.abspath(self.podcast_directory)
+                ),
+            )
+        )
+
+    def test_should_scan_directory_only_once(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.add_file("cover.jpg")
+        first_result = self.get_files()
+
+        # Act
+        self.add_file("second.mp3")
+        result = self.get_files()
+
+        # Assert
+        self.assertListEqual(first_result, ["first.mp3"])
+        self.assertListEqual(
+            result, ["first.mp3"], "The file added by hand should not be noticed"
+        )
+
+    def test_should_include_files_added_to_index(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.get_files()
+
+        # Act
+        self.index.add(os.path.abspath(self.podcast_directory), "second.mp3")
+
+        # Assert
+        self.assertListEqual(self.get_files(), ["first.mp3", "second.mp3"])
+
+    def test_should_rebuild_index_on_rescan(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.get_files()
+
+        self.add_file("second.mp3")
+        os.remove(os.path.join(self.podcast_directory, "first.mp3"))
+
+        self.index.close()
+        self.index = self.open_index()
+
+        # Act
+        result = self.get_files(rescan=True)
+
+        # Assert
+        self.assertListEqual(result, ["second.mp3"], "The index should be rebuilt")
+
+    def test_should_keep_index_between_runs(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.get_files()
+
+        self.add_file("second.mp3")
+
+        # Act
+        self.index.close()
+        self.index = self.open_index()
+
+        # Assert
+        self.assertListEqual(
+            self.get_files(), ["first.mp3"], "The stored index should be used"
+        )
+
+
+class TestRunDirectoryIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = DownloadedIndex()
+        self.podcast_directory = os.path.join(self.directory.name, "podcast")
+        os.mkdir(self.podcast_directory)
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.directory.cleanup()
+
+    def add_file(self, file_name: str) -> None:
+        with open(os.path.join(self.podcast_directory, file_name), "w") as file:
+            file.write(file_name)
+
+    def test_should_scan_shared_directory_once(self):
+        # Assign
+        self.add_file("first.mp3")
+        self.add_file("second.m4a")
+        self.add_file("cover.jpg")
+        directory_index = RunDirectoryIndex(self.index, False)
+
+        # Act
+        with mock.patch.object(
+            downloaded, "scan_directory_files", wraps=downloaded.scan_directory_files
+        ) as scan:
+            mp3_files = directory_index.get_files(
+                get_extensions_checker([".mp3"]), self.podcast_directory
+            )
+            audio_files = directory_index.get_files(
+                get_extensions_checker([".mp3", ".m4a"]),
+                self.podcast_directory + os.sep,
+            )
+
+        # Assert
+        self.assertEqual(scan.call_count, 1)
+        self.assertSetEqual(mp3_files, {"first.mp3"})
+        self.assertSetEqual(audio_files, {"first.mp3", "second.m4a"})
+
+    def test_should_include_files_downloaded_during_run(self):
+        # Assign
+        self.add_file("first.mp3")
+        directory_index = RunDirectoryIndex(self.index, False)
+        directory_index.get_files(
+            get_extensions_checker([".mp3"]), self.podcast_directory
+        )
+
+        # Act
+        directory_index.add(self.podcast_directory, "second.mp3")
+        directory_index.add(self.podcast_directory, "second.jpg")
+
+        # Assert
+        self.assertSetEqual(
+            directory_index.get_files(
+                get_extensions_checker([".mp3"]), self.podcast_directory
+            ),
+            {"first.mp3", "second.mp3"},
+        )
+        self.assertListEqual(
+            sorted(self.index.get_files(os.path.abspath(self.podcast_directory))),
+            ["first.mp3", "second.jpg", "second.mp3"],
+            "The downloaded file should be kept in the index for the next runs",
+        )
+
+    def test_should_give_the_reserved_files_only_to_this_run(self):
+        # Assign
+        self.add_file("first.mp3")
+        directory_index = RunDirectoryIndex(self.index, False)
+
+        # Act
+        directory_index.reserve(self.podcast_directory, "second.mp3")
+
+        # Assert
+        self.assertSetEqual(
+            directory_index.get_files(
+                get_extensions_checker([".mp3"]), self.podcast_directory
+            ),
+            {"first.mp3", "second.mp3"},
+        )
+        self.assertListEqual(
+            self.index.get_files(os.path.abspath(self.podcast_directory)),
+            ["first.mp3"],
+            "Only the published file should be kept in the index",
+        )
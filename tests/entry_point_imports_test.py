@@ -0,0 +1,21 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["feedparser", "http.client", "sqlite3", "podcast_downloader.runner"]
+
+
+class TestEntryPointImports(unittest.TestCase):
+    def test_should_not_load_heavy_modules_on_import(self):
+        # Assign
+        code = "import sys, podcast_downloader.__main__; print('\\n'.join(sys.modules))"
+
+        # Act
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        # Assert
+        loaded_modules = result.stdout.splitlines()
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded_modules)
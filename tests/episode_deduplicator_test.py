@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from podcast_downloader.dedup import EpisodeDeduplicator, EpisodeRegistry
+from podcast_downloader.download import commit_partial_file, to_partial_file_path
+
+CONTENT = b"The episode content" * 100
+
+
+class FakeDownload:
+    def __init__(self, path_to_file: str, content: bytes = CONTENT) -> None:
+        self.path_to_file = path_to_file
+        self.content = content
+        self.calls = 0
+
+    def __call__(self, content_hash) -> int:
+        self.calls += 1
+        with open(to_partial_file_path(self.path_to_file), "wb") as file:
+            file.write(self.content)
+
+        content_hash.update(self.content)
+        return len(self.content)
+
+
+class TestEpisodeDeduplicator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.directory.name, "episodes.sqlite")
+        self.registry = EpisodeRegistry(self.database_path)
+
+    def tearDown(self) -> None:
+        self.registry.close()
+        self.directory.cleanup()
+
+    def get_path(self, file_name: str) -> str:
+        return os.path.join(self.directory.name, file_name)
+
+    def download(
+        self,
+        deduplicator: EpisodeDeduplicator,
+        link: str,
+        file_name: str,
+        content: bytes = CONTENT,
+    ):
+        path_to_file = self.get_path(file_name)
+        download = FakeDownload(path_to_file, content)
+        result = deduplicator.download(download, link, path_to_file)
+        commit_partial_file(path_to_file)
+
+        return download.calls, result
+
+    def assertSameFile(self, first: str, second: str) -> None:
+        self.assertTrue(os.path.samefile(self.get_path(first), self.get_path(second)))
+
+    def test_should_link_file_with_the_same_link(self):
+        # Assign
+        deduplicator = EpisodeDeduplicator(self.registry)
+        self.download(deduplicator, "http://a.com/1.mp3", "a.mp3")
+
+        # Act
+        calls, result = self.download(deduplicator, "http://a.com/1.mp3", "b.mp3")
+
+        # Assert
+        self.assertEqual(calls, 0, "The file should not be downloaded again")
+        self.assertEqual(result, (0, self.get_path("a.mp3")))
+        self.assertSameFile("a.mp3", "b.mp3")
+
+    def test_should_link_file_with_the_same_content(self):
+        # Assign
+        deduplicator = EpisodeDeduplicator(self.registry)
+        self.download(deduplicator, "http://a.com/1.mp3", "a.mp3")
+
+        # Act
+        calls, result = self.download(deduplicator, "http://b.com/1.mp3", "b.mp3")
+        _, other_result = self.download(
+            deduplicator, "http://c.com/1.mp3", "c.mp3", b"Other content"
+        )
+
+        # Assert
+        self.assertEqual(calls, 1)
+        self.assertEqual(result, (len(CONTENT), self.get_path("a.mp3")))
+        self.assertSameFile("a.mp3", "b.mp3")
+        self.assertEqual(other_result, (len(b"Other content"), None))
+
+    def test_should_remember_files_between_runs(self):
+        # Assign
+        self.download(EpisodeDeduplicator(self.registry), "http://a.com/1", "a.mp3")
+        self.registry.close()
+        self.registry = EpisodeRegistry(self.database_path)
+
+        # Act
+        calls, _ = self.download(
+            EpisodeDeduplicator(self.registry), "http://a.com/1", "b.mp3"
+        )
+
+        # Assert
+        self.assertEqual(calls, 0)
+        self.assertSameFile("a.mp3", "b.mp3")
+
+    def test_should_download_when_known_file_is_removed(self):
+        # Assign
+        deduplicator = EpisodeDeduplicator(self.registry)
+        self.download(deduplicator, "http://a.com/1.mp3", "a.mp3")
+        os.remove(self.get_path("a.mp3"))
+
+        # Act
+        calls, result = self.download(deduplicator, "http://a.com/1.mp3", "b.mp3")
+
+        # Assert
+        self.assertEqual(calls, 1)
+        self.assertEqual(result, (len(CONTENT), None))
+        self.assertListEqual(
+            self.registry.find_by_link("http://a.com/1.mp3"),
+            [(self.get_path("b.mp3"), len(CONTENT))],
+        )
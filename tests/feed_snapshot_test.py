@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from podcast_downloader.feed_stream import (
+    FeedSnapshot,
+    StreamedFeed,
+    get_feed_entities,
+    stream_feed,
+)
+from podcast_downloader.rss import parse_feed
+from podcast_downloader.snapshot import (
+    FeedSnapshotStore,
+    bytes_to_feed_snapshot,
+    feed_snapshot_to_bytes,
+    parse_with_snapshot,
+)
+from tests.feed_stream_test import HEADERS, build_item, build_rss
+
+
+class CountingParse:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, body, headers):
+        self.calls += 1
+        return parse_feed(body, headers)
+
+
+class TestFeedSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_should_keep_the_entities_in_snapshot(self):
+        # Assign
+        body = build_rss("<ttl>60</ttl>" + build_item(2) + build_item(1))
+        feed = parse_feed(body, HEADERS)
+
+        # Act
+        result = bytes_to_feed_snapshot(
+            feed_snapshot_to_bytes(
+                FeedSnapshot(
+                    {"title": "The podcast", "ttl": "60"},
+                    list(get_feed_entities(feed)),
+                )
+            )
+        )
+
+        # Assert
+        self.assertDictEqual(result.channel, {"title": "The podcast", "ttl": "60"})
+        self.assertListEqual(
+            list(get_feed_entities(result)), list(get_feed_entities(feed))
+        )
+
+    def test_should_not_parse_the_same_body_again(self):
+        # Assign
+        store = FeedSnapshotStore(self.directory.name, 1024 * 1024)
+        parse = CountingParse()
+        body = build_rss(build_item(2) + build_item(1))
+
+        # Act
+        first = parse_with_snapshot(store, parse, body, HEADERS)
+        second = parse_with_snapshot(store, parse, body, HEADERS)
+        changed = parse_with_snapshot(
+            store, parse, build_rss(build_item(3) + build_item(2)), HEADERS
+        )
+
+        # Assert
+        self.assertEqual(parse.calls, 2, "Only the changed body should be parsed")
+        self.assertListEqual(
+            list(get_feed_entities(second)), list(get_feed_entities(first))
+        )
+        self.assertEqual(
+            list(get_feed_entities(changed))[0].link, "http://www.p.com/3.html"
+        )
+
+    def test_should_not_take_snapshot_of_streamed_feed(self):
+        # Assign
+        store = FeedSnapshotStore(self.directory.name, 1024 * 1024)
+        body = build_rss(build_item(2) + build_item(1))
+
+        # Act
+        result = parse_with_snapshot(store, stream_feed, body, HEADERS)
+
+        # Assert
+        self.assertIsInstance(
+            result, StreamedFeed, "The feed should be still read on demand"
+        )
+        self.assertListEqual(os.listdir(self.directory.name), [])
+
+    def test_should_parse_again_when_snapshot_is_broken(self):
+        # Assign
+        store = FeedSnapshotStore(self.directory.name, 1024 * 1024)
+        parse = CountingParse()
+        body = build_rss(build_item(1))
+        parse_with_snapshot(store, parse, body, HEADERS)
+
+        for name in os.listdir(self.directory.name):
+            with open(os.path.join(self.directory.name, name), "wb") as file:
+                file.write(b"broken")
+
+        # Act
+        result = parse_with_snapshot(store, parse, body, HEADERS)
+
+        # Assert
+        self.assertEqual(parse.calls, 2)
+        self.assertEqual(len(list(get_feed_entities(result))), 2)
+
+    def test_should_remove_least_recently_used_snapshots(self):
+        # Assign
+        store = FeedSnapshotStore(self.directory.name, 0)
+        snapshot = FeedSnapshot({"title": "The podcast"}, [])
+        for number, key in enumerate(["old", "used", "new"]):
+            store.save(key, snapshot)
+            os.utime(store.get_path(key), (1000 + number, 1000 + number))
+
+        store.load("old")
+        store.size_limit = 2 * os.path.getsize(store.get_path("old"))
+
+        # Act
+        result = store.evict()
+
+        # Assert
+        self.assertListEqual(result, [store.get_path("used")])
+        self.assertListEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["new.json.gz", "old.json.gz"],
+        )
@@ -0,0 +1,121 @@
+import unittest
+from itertools import islice
+from podcast_downloader.feed_stream import (
+    StreamedFeed,
+    get_feed_channel,
+    get_feed_entities,
+    get_feed_title,
+    stream_feed,
+)
+from podcast_downloader.rss import parse_feed
+
+HEADERS = {"content-location": "http://www.p.com/feed.xml"}
+
+
+def build_rss(items: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+        "<channel><title> The podcast </title><link>http://www.p.com</link>"
+        f"{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def build_item(number: int, date: str = "Tue, 14 Nov 2023 22:13:20 +0100") -> str:
+    return (
+        f"<item><title>  Episode &amp; {number} </title>"
+        f"<itunes:title>Other {number}</itunes:title>"
+        f"<link>http://www.p.com/{number}.html</link><pubDate>{date}</pubDate>"
+        f'<enclosure url="http://www.p.com/{number}.mp3?a=1&amp;b=2" type="audio/mpeg" length="1"/>'
+        f"<guid>{number}</guid></item>"
+    )
+
+
+class TestStreamFeed(unittest.TestCase):
+    def test_should_give_the_same_entities_as_feedparser(self):
+        # Assign
+        body = build_rss(
+            "".join(
+                build_item(number, date)
+                for number, date in enumerate(
+                    [
+                        "Tue, 14 Nov 2023 22:13:20 +0100",
+                        "Tue, 14 Nov 2023 22:13:20 GMT",
+                        "14 Nov 2023 23:13:20 EST",
+                        "Wed, 01 Feb 2023 00:00:00 -0800",
+                    ]
+                )
+            )
+        )
+
+        # Act
+        feed = stream_feed(body, HEADERS)
+
+        # Assert
+        expected_feed = parse_feed(body, HEADERS)
+        self.assertIsInstance(feed, StreamedFeed)
+        self.assertEqual(get_feed_title(feed), get_feed_title(expected_feed))
+        self.assertListEqual(
+            list(get_feed_entities(feed)), list(get_feed_entities(expected_feed))
+        )
+
+    def test_should_use_feedparser_for_not_supported_feed(self):
+        # Assign
+        test_parameters = [
+            build_rss(build_item(1, "Tue, 14 Nov 2023 22:13:20")),
+            build_rss(build_item(1).replace("http://www.p.com/1.mp3", "/1.mp3")),
+            build_rss(build_item(2) + build_item(1).replace("&amp;", "&nbsp;")),
+            b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            b"<title>Atom</title></feed>",
+        ]
+
+        for body in test_parameters:
+            # Act
+            feed = stream_feed(body, HEADERS)
+
+            # Assert
+            expected_feed = parse_feed(body, HEADERS)
+            self.assertListEqual(
+                list(get_feed_entities(feed)), list(get_feed_entities(expected_feed))
+            )
+
+    def test_should_parse_only_needed_part_of_feed(self):
+        # Assign
+        body = build_rss(
+            build_item(3) + build_item(2) + build_item(1) + "<item><title>Broken"
+        )
+        feed = stream_feed(body, HEADERS)
+
+        # Act
+        result = list(islice(get_feed_entities(feed), 2))
+
+        # Assert
+        self.assertIsInstance(feed, StreamedFeed)
+        self.assertEqual(
+            [entity.link for entity in result],
+            ["http://www.p.com/3.html", "http://www.p.com/3.mp3?a=1&b=2"],
+        )
+
+    def test_should_read_update_hints_as_feedparser(self):
+        # Assign
+        body = (
+            build_rss("<ttl> 30 </ttl>" + build_item(1))
+            .replace(
+                b'<rss version="2.0"',
+                b'<rss version="2.0" xmlns:sy="http://purl.org/rss/1.0/modules/syndication/"',
+            )
+            .replace(
+                b"<ttl>",
+                b"<sy:updatePeriod>daily</sy:updatePeriod>"
+                b"<sy:updateFrequency>2</sy:updateFrequency><ttl>",
+            )
+        )
+
+        # Act
+        feed = stream_feed(body, HEADERS)
+
+        # Assert
+        expected_channel = get_feed_channel(parse_feed(body, HEADERS))
+        self.assertIsInstance(feed, StreamedFeed)
+        for key in ("ttl", "sy_updateperiod", "sy_updatefrequency"):
+            self.assertEqual(get_feed_channel(feed)[key], expected_channel[key], key)
@@ -0,0 +1,149 @@
+import unittest
+
+from podcast_downloader.cache import (
+    FeedValidatorsStore,
+    build_conditional_headers,
+    build_feed_validators,
+    get_max_age,
+    get_settings_fingerprint,
+    is_fresh,
+)
+
+
+class TestFeedValidators(unittest.TestCase):
+    def test_get_max_age(self):
+        test_parameters = [
+            ("", None),
+            ("public, max-age=600", 600),
+            ("max-age=60, must-revalidate", 60),
+            ("no-cache, max-age=600", None),
+            ("no-store", None),
+            ("max-age=abc", None),
+        ]
+
+        for cache_control, expected_max_age in test_parameters:
+            # Act
+            result = get_max_age(cache_control)
+
+            # Assert
+            self.assertEqual(
+                result,
+                expected_max_age,
+                f'The max age of "{cache_control}" should be {expected_max_age} not {result}',
+            )
+
+    def test_should_build_validators_from_response_headers(self):
+        # Assign
+        headers = {
+            "etag": '"abc"',
+            "last-modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+            "cache-control": "max-age=600",
+            "age": "100",
+        }
+
+        # Act
+        result = build_feed_validators(headers, 1000)
+
+        # Assert
+        self.assertDictEqual(
+            result,
+            {
+                "etag": '"abc"',
+                "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                "expires": 1500,
+            },
+        )
+        self.assertDictEqual(
+            build_conditional_headers(result),
+            {
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+        )
+
+    def test_should_use_expires_header_without_max_age(self):
+        # Assign
+        date = "Wed, 21 Oct 2015 07:00:00 GMT"
+        test_parameters = [
+            (
+                "Expires only",
+                {"date": date, "expires": "Wed, 21 Oct 2015 07:10:00 GMT"},
+                1600,
+            ),
+            (
+                "The max-age takes precedence",
+                {
+                    "date": date,
+                    "expires": "Wed, 21 Oct 2015 07:10:00 GMT",
+                    "cache-control": "max-age=60",
+                },
+                1060,
+            ),
+            (
+                "No cache",
+                {
+                    "date": date,
+                    "expires": "Wed, 21 Oct 2015 07:10:00 GMT",
+                    "cache-control": "no-cache",
+                },
+                None,
+            ),
+            ("Already expired", {"date": date, "expires": date}, None),
+            ("Not a date", {"date": date, "expires": "0"}, None),
+        ]
+
+        for name, headers, expected_expires in test_parameters:
+            # Act
+            result = build_feed_validators(headers, 1000)
+
+            # Assert
+            self.assertEqual(result.get("expires"), expected_expires, name)
+
+    def test_is_fresh(self):
+        # Assign
+        validators = build_feed_validators({"cache-control": "max-age=600"}, 1000)
+
+        # Assert
+        self.assertTrue(is_fresh(validators, 1599), "Feed should be still fresh")
+        self.assertFalse(is_fresh(validators, 1600), "Feed should be expired")
+        self.assertFalse(is_fresh({}, 0), "Feed without max age is never fresh")
+
+
+class TestFeedValidatorsStore(unittest.TestCase):
+    def test_should_forget_validators_when_settings_change(self):
+        # Assign
+        podcast = {"path": "/podcasts/first", "file_name_template": "%file_name%"}
+        store = FeedValidatorsStore(None)
+        settings = get_settings_fingerprint([podcast])
+        store.update("http://www.p.com/feed.rss", {"etag": '"abc"'}, settings)
+
+        test_parameters = [
+            ("The same podcasts", [dict(podcast)], {"etag": '"abc"'}),
+            ("Added podcast", [podcast, {**podcast, "path": "/podcasts/second"}], {}),
+            ("Changed path", [{**podcast, "path": "/podcasts/other"}], {}),
+            ("Changed template", [{**podcast, "file_name_template": "%title%"}], {}),
+        ]
+
+        for name, podcasts_settings, expected_validators in test_parameters:
+            # Act
+            result = store.get(
+                "http://www.p.com/feed.rss", get_settings_fingerprint(podcasts_settings)
+            )
+
+            # Assert
+            self.assertDictEqual(
+                {key: value for key, value in result.items() if key != "settings"},
+                expected_validators,
+                name,
+            )
+
+    def test_should_ignore_order_of_podcasts(self):
+        # Assign
+        first = {"path": "/podcasts/first"}
+        second = {"path": "/podcasts/second"}
+
+        # Act
+        result = get_settings_fingerprint([second, first])
+
+        # Assert
+        self.assertEqual(result, get_settings_fingerprint([first, second]))
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from podcast_downloader.lease import LeaseCoordinator
+
+FEEDS = ["http://www.p.com/1.xml", "http://www.p.com/2.xml", "http://www.p.com/3.xml"]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLeaseCoordinator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.directory.name, "leases.sqlite")
+        self.clock = FakeClock()
+        self.coordinators = []
+
+    def tearDown(self) -> None:
+        for coordinator in self.coordinators:
+            coordinator.close()
+
+        self.directory.cleanup()
+
+    def build_worker(self, name: str) -> LeaseCoordinator:
+        coordinator = LeaseCoordinator(self.database_path, 60, name, self.clock)
+        self.coordinators.append(coordinator)
+        return coordinator
+
+    def test_should_give_each_feed_to_one_worker(self):
+        # Assign
+        first_worker = self.build_worker("first")
+        second_worker = self.build_worker("second")
+        first_worker.join(FEEDS)
+        second_worker.join(FEEDS)
+
+        # Act
+        first_leases = first_worker.acquire(2)
+        second_leases = second_worker.acquire(2)
+        nothing_left = first_worker.acquire(2)
+
+        # Assert
+        self.assertListEqual(first_leases, FEEDS[:2])
+        self.assertListEqual(second_leases, FEEDS[2:])
+        self.assertListEqual(nothing_left, [])
+        self.assertFalse(first_worker.is_round_finished())
+
+    def test_should_finish_the_round_when_all_feeds_are_finished(self):
+        # Assign
+        first_worker = self.build_worker("first")
+        second_worker = self.build_worker("second")
+        first_worker.join(FEEDS)
+        second_worker.join(FEEDS)
+
+        # Act
+        first_worker.finish(first_worker.acquire(2))
+        second_worker.finish(second_worker.acquire(2))
+
+        # Assert
+        self.assertTrue(first_worker.is_round_finished())
+        self.assertTrue(second_worker.is_round_finished())
+
+    def test_should_take_over_the_expired_lease(self):
+        # Assign
+        stopped_worker = self.build_worker("stopped")
+        worker = self.build_worker("worker")
+        stopped_worker.join(FEEDS)
+        worker.join(FEEDS)
+        stopped_leases = stopped_worker.acquire(3)
+
+        # Act
+        before_expiration = worker.acquire(3)
+        self.clock.now += 61
+        after_expiration = worker.acquire(3)
+        stopped_worker.finish(stopped_leases)
+
+        # Assert
+        self.assertListEqual(before_expiration, [])
+        self.assertListEqual(after_expiration, FEEDS)
+        self.assertFalse(worker.is_round_finished())
+
+    def test_should_keep_the_lease_with_heartbeat(self):
+        # Assign
+        busy_worker = self.build_worker("busy")
+        worker = self.build_worker("worker")
+        busy_worker.join(FEEDS)
+        worker.join(FEEDS)
+        busy_worker.acquire(3)
+
+        # Act
+        self.clock.now += 50
+        busy_worker.heartbeat()
+        self.clock.now += 50
+        result = worker.acquire(3)
+
+        # Assert
+        self.assertListEqual(result, [])
+
+    def test_should_open_new_round_after_the_finished_one(self):
+        # Assign
+        worker = self.build_worker("worker")
+        first_round = worker.join(FEEDS)
+        worker.finish(worker.acquire(3))
+
+        # Act
+        next_worker = self.build_worker("next")
+        next_round = next_worker.join(FEEDS)
+
+        # Assert
+        self.assertNotEqual(next_round, first_round)
+        self.assertListEqual(next_worker.acquire(3), FEEDS)
+
+    def test_should_not_wait_for_the_feeds_of_other_configuration(self):
+        # Assign
+        old_worker = self.build_worker("old")
+        old_worker.join(FEEDS + ["http://www.p.com/removed.xml"])
+        worker = self.build_worker("worker")
+        round = worker.join(FEEDS)
+
+        # Act
+        worker.finish(worker.acquire(3))
+
+        # Assert
+        self.assertTrue(worker.is_round_finished())
+        self.assertEqual(self.build_worker("next").join(FEEDS), round + 1)
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from podcast_downloader.feed_stream import (
+    BrokenFeed,
+    FeedSnapshot,
+    get_feed_entities,
+    get_feed_error,
+    get_feed_title,
+    is_feed_broken,
+    stream_feed,
+)
+from podcast_downloader.parse_pool import (
+    build_parse_pool,
+    parse_in_pool,
+    parse_to_tuples,
+    tuples_to_feed,
+)
+from podcast_downloader.rss import parse_feed
+from tests.feed_stream_test import HEADERS, build_item, build_rss
+
+
+def failing_parse(body, headers):
+    # the function is sent to the worker, so it cannot be a local one
+    raise ValueError("The parser has failed")
+
+
+class TestParseToTuples(unittest.TestCase):
+    def test_should_give_the_same_entities_as_feedparser(self):
+        # Assign
+        body = build_rss("<ttl>60</ttl>" + build_item(2) + build_item(1))
+
+        for parse in (parse_feed, stream_feed):
+            # Act
+            result = tuples_to_feed(
+                pickle.loads(pickle.dumps(parse_to_tuples(parse, body, HEADERS)))
+            )
+
+            # Assert
+            expected_feed = parse_feed(body, HEADERS)
+            self.assertIsInstance(result, FeedSnapshot)
+            self.assertEqual(get_feed_title(result), get_feed_title(expected_feed))
+            self.assertEqual(result.channel["ttl"], "60")
+            self.assertListEqual(
+                list(get_feed_entities(result)),
+                list(get_feed_entities(expected_feed)),
+            )
+
+    def test_should_send_back_only_the_error_of_broken_feed(self):
+        # Assign
+        body = b"<html><body>Not found</body>"
+
+        # Act
+        result = tuples_to_feed(parse_to_tuples(parse_feed, body, HEADERS))
+
+        # Assert
+        self.assertIsInstance(result, BrokenFeed)
+        self.assertTrue(is_feed_broken(result))
+        self.assertEqual(
+            get_feed_error(result), get_feed_error(parse_feed(body, HEADERS))
+        )
+
+
+class TestParseInPool(unittest.TestCase):
+    def test_should_parse_in_other_process(self):
+        # Assign
+        bodies = [build_rss(build_item(number)) for number in range(3)]
+
+        # Act
+        with build_parse_pool(2) as pool:
+            result = [parse_in_pool(pool, parse_feed, body, HEADERS) for body in bodies]
+
+        # Assert
+        self.assertListEqual(
+            [list(get_feed_entities(feed)) for feed in result],
+            [list(get_feed_entities(parse_feed(body, HEADERS))) for body in bodies],
+        )
+
+    def test_should_pass_the_parse_error(self):
+        # Act
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            # Assert
+            with self.assertRaises(ValueError):
+                parse_in_pool(pool, failing_parse, b"", HEADERS)
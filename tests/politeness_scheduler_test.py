@@ -0,0 +1,50 @@
+import unittest
+from podcast_downloader.politeness import PolitenessScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPolitenessScheduler(unittest.TestCase):
+    def test_should_keep_gap_between_downloads_with_the_same_key(self):
+        # Assign
+        scheduler = PolitenessScheduler(FakeClock())
+
+        # Act
+        result = [scheduler.reserve("a.com", 30) for _ in range(3)]
+
+        # Assert
+        self.assertListEqual(result, [0, 30, 60])
+
+    def test_should_not_delay_other_keys(self):
+        # Assign
+        scheduler = PolitenessScheduler(FakeClock())
+        scheduler.reserve("a.com", 30)
+        scheduler.reserve("a.com", 30)
+
+        # Act
+        result = scheduler.reserve("b.com", 30)
+
+        # Assert
+        self.assertEqual(result, 0)
+
+    def test_should_count_the_gap_from_the_reserved_start(self):
+        # Assign
+        clock = FakeClock()
+        scheduler = PolitenessScheduler(clock)
+        scheduler.reserve("a.com", 30)
+
+        # Act
+        clock.now += 20
+        first = scheduler.reserve("a.com", 30)
+        clock.now += 100
+        second = scheduler.reserve("a.com", 30)
+
+        # Assert
+        self.assertEqual(first, 10)
+        self.assertEqual(second, 0)
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from collections import Counter
+
+from podcast_downloader.prefetch import prefetch
+from podcast_downloader.utils import link_to_host
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_should_fetch_every_link_once(self):
+        # Assign
+        links = [
+            "http://first.com/feed.rss",
+            "http://second.com/feed.rss",
+            "http://first.com/feed.rss",
+        ]
+        requested = Counter()
+
+        def load(link: str) -> str:
+            requested[link] += 1
+            return link.upper()
+
+        # Act
+        result = prefetch(load, links, 4, 2)
+
+        # Assert
+        self.assertDictEqual(
+            {link: future.result() for link, future in result.items()},
+            {
+                "http://first.com/feed.rss": "HTTP://FIRST.COM/FEED.RSS",
+                "http://second.com/feed.rss": "HTTP://SECOND.COM/FEED.RSS",
+            },
+            "Every link should have its own result",
+        )
+        self.assertEqual(
+            max(requested.values()), 1, "The same link should not be fetched twice"
+        )
+
+    def test_should_limit_concurrent_fetches_per_host(self):
+        # Assign
+        links = [f"http://{host}.com/feed{i}.rss" for host in "ab" for i in range(4)]
+        lock = threading.Lock()
+        running = Counter()
+        maximum_running = Counter()
+
+        def load(link: str) -> None:
+            host = link_to_host(link)
+            with lock:
+                running[host] += 1
+                maximum_running[host] = max(maximum_running[host], running[host])
+
+            time.sleep(0.02)
+
+            with lock:
+                running[host] -= 1
+
+        # Act
+        for future in prefetch(load, links, 8, 2).values():
+            future.result()
+
+        # Assert
+        self.assertDictEqual(
+            dict(maximum_running),
+            {"a.com": 2, "b.com": 2},
+            "Only two fetches per host should run at the same time",
+        )
+
+    def test_should_not_hold_up_other_hosts_waiting_for_slot(self):
+        # Assign
+        links = [f"http://a.com/feed{i}.rss" for i in range(3)] + [
+            "http://b.com/feed.rss"
+        ]
+        release = threading.Event()
+
+        def load(link: str) -> str:
+            if link_to_host(link) == "a.com":
+                release.wait(5)
+
+            return link
+
+        # Act
+        result = prefetch(load, links, 2, 1)
+        other_host = result["http://b.com/feed.rss"].result(timeout=1)
+        release.set()
+
+        # Assert
+        self.assertEqual(other_host, "http://b.com/feed.rss")
+        self.assertListEqual(
+            [result[link].result(timeout=5) for link in links[:3]], links[:3]
+        )
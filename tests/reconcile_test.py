@@ -0,0 +1,91 @@
+import random
+import unittest
+from functools import partial
+
+from commons import rss_entity_generator
+from podcast_downloader.downloaded import get_last_downloaded_file_before_gap
+from podcast_downloader.reconciliation import reconcile
+from podcast_downloader.rss import build_only_new_entities, file_template_to_file_name
+
+to_file_name = partial(file_template_to_file_name, "%file_name%.%file_extension%")
+
+
+class TestReconcile(unittest.TestCase):
+    def test_should_find_nothing_on_empty_directory(self):
+        # Assign
+        entities = list(rss_entity_generator(limit=5))
+
+        # Act
+        result = reconcile(to_file_name, set(), entities)
+
+        # Assert
+        self.assertFalse(result.has_downloaded_files)
+        self.assertIsNone(result.get_last_downloaded_file(False))
+        self.assertIsNone(result.get_last_downloaded_file(True))
+
+    def test_should_find_newer_and_gap_entities(self):
+        # Assign
+        entities = list(rss_entity_generator(limit=7))
+        new_1, new_2, downloaded_1, gap_1, downloaded_2, downloaded_3, old = entities
+        downloaded_files = set(
+            map(to_file_name, [downloaded_1, downloaded_2, downloaded_3])
+        )
+
+        # Act
+        result = reconcile(to_file_name, downloaded_files, entities)
+
+        # Assert
+        self.assertEqual(result.get_last_downloaded_file(False), "file0003.mp3")
+        self.assertListEqual(result.get_missing_entities(False), [new_1, new_2])
+        self.assertEqual(result.get_last_downloaded_file(True), "file0001.mp3")
+        self.assertListEqual(result.get_missing_entities(True), [new_1, new_2, gap_1])
+
+    def test_should_give_the_same_result_as_list_based_approach(self):
+        for _ in range(200):
+            # Assign
+            entities = list(rss_entity_generator(day=31, file_number=30, limit=30))
+            feed_files = [to_file_name(entity) for entity in entities][::-1]
+            downloaded_files = set(
+                random.sample(feed_files, random.randint(1, len(feed_files)))
+            )
+            downloaded_files.add("not_from_feed.mp3")
+
+            feed_downloaded_files = [
+                file_name for file_name in feed_files if file_name in downloaded_files
+            ]
+            expected_last = feed_downloaded_files[-1]
+            expected_last_before_gap = get_last_downloaded_file_before_gap(
+                feed_files, feed_downloaded_files
+            )
+            expected_missing = list(
+                build_only_new_entities(to_file_name)(expected_last, entities)
+            )
+
+            # Act
+            result = reconcile(to_file_name, downloaded_files, entities)
+
+            # Assert
+            self.assertEqual(result.get_last_downloaded_file(False), expected_last)
+            self.assertEqual(
+                result.get_last_downloaded_file(True), expected_last_before_gap
+            )
+            self.assertListEqual(result.get_missing_entities(False), expected_missing)
+
+    def test_should_stop_on_newest_downloaded_file_without_filling_up_gaps(self):
+        # Assign
+        read_entities = []
+        entities = list(rss_entity_generator(day=31, file_number=30, limit=30))
+        downloaded_files = set(map(to_file_name, entities[2:]))
+
+        def read_feed():
+            for entity in entities:
+                read_entities.append(entity)
+                yield entity
+
+        # Act
+        result = reconcile(to_file_name, downloaded_files, read_feed(), False)
+
+        # Assert
+        self.assertListEqual(result.get_missing_entities(False), entities[:2])
+        self.assertEqual(result.get_last_downloaded_file(False), "file0028.mp3")
+        self.assertEqual(len(read_entities), 3, "Should read up to the newest file")
@@ -0,0 +1,60 @@
+import unittest
+from podcast_downloader.rss import RSSEntity
+
+from tests.commons import build_timestamp
+
+
+def build_entity() -> RSSEntity:
+    return RSSEntity(
+        build_timestamp(2020, 1, 2),
+        "The: fancy title",
+        "audio/mp3",
+        "http://www.podcast.com/podcast/Episode_01.mp3?source=rss",
+    )
+
+
+class TestRSSEntity(unittest.TestCase):
+    def test_should_derive_names_from_link_title_and_date(self):
+        # Assign
+        entity = build_entity()
+
+        # Act
+        result = (
+            entity.file_name,
+            entity.file_extension,
+            entity.file_title,
+            entity.date_key,
+        )
+
+        # Assert
+        self.assertEqual(result, ("episode_01", "mp3", "The  fancy title", "20200102"))
+
+    def test_should_recompute_names_after_value_change(self):
+        # Assign
+        entity = build_entity()
+        entity.file_name
+        entity.file_title
+        entity.date_key
+
+        # Act
+        entity.link = "http://www.podcast.com/podcast/other.ogg"
+        entity.title = "Other title?"
+        entity.published_date = build_timestamp(2021, 3, 4)
+
+        # Assert
+        self.assertEqual(entity.file_name, "other")
+        self.assertEqual(entity.file_extension, "ogg")
+        self.assertEqual(entity.file_title, "Other title")
+        self.assertEqual(entity.date_key, "20210304")
+
+    def test_should_be_compared_by_values(self):
+        # Assign
+        entity = build_entity()
+        entity.file_name
+
+        # Act
+        result = entity == build_entity()
+
+        # Assert
+        self.assertTrue(result, "The computed names should not affect equality")
+        self.assertFalse(hasattr(entity, "__dict__"), "The entity should use slots")
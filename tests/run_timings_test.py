@@ -0,0 +1,50 @@
+import unittest
+from podcast_downloader.timing import (
+    PHASE_DOWNLOAD,
+    PHASE_FETCH,
+    PHASE_SCAN,
+    RunTimings,
+)
+
+
+class TestRunTimings(unittest.TestCase):
+    def test_should_sum_phases_and_downloads_per_feed(self):
+        # Assign
+        timings = RunTimings()
+
+        # Act
+        timings.add("http://a/feed", PHASE_FETCH, 0.5)
+        timings.add("http://a/feed", PHASE_SCAN, 0.25)
+        timings.add("http://a/feed", PHASE_SCAN, 0.25)
+        timings.add_download("http://a/feed", "one.mp3", 2.0, 4 * 1024 * 1024)
+        timings.add_download("http://a/feed", "two.mp3", 2.0, 4 * 1024 * 1024)
+        timings.add("http://b/feed", PHASE_FETCH, 1.0)
+
+        # Assert
+        report = timings.to_report()
+        self.assertEqual(
+            [feed["feed"] for feed in report["feeds"]],
+            ["http://a/feed", "http://b/feed"],
+        )
+        self.assertEqual(
+            report["feeds"][0]["phases"],
+            {PHASE_FETCH: 0.5, PHASE_SCAN: 0.5, PHASE_DOWNLOAD: 4.0},
+        )
+        self.assertEqual(report["feeds"][0]["downloads"][0]["throughput"], 2097152.0)
+        self.assertEqual(report["feeds"][1]["downloads"], [])
+
+        summary = timings.get_summary()
+        self.assertEqual(len(summary), 3, "Should have the header and line per feed")
+        self.assertIn("     2      8.00    2.00  http://a/feed", summary[1])
+
+    def test_should_measure_the_block(self):
+        # Assign
+        timings = RunTimings()
+
+        # Act
+        with self.assertRaises(ValueError):
+            with timings.measure("http://a/feed", PHASE_SCAN):
+                raise ValueError()
+
+        # Assert
+        self.assertIn(PHASE_SCAN, timings.to_report()["feeds"][0]["phases"])
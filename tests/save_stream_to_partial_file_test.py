@@ -0,0 +1,52 @@
+import io
+import os
+import tempfile
+import unittest
+
+from podcast_downloader.download import (
+    commit_partial_file,
+    save_stream_to_partial_file,
+    to_partial_file_path,
+)
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self, content: bytes) -> None:
+        super().__init__(content)
+        self.requested_sizes = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.requested_sizes.append(size)
+        return super().read(size)
+
+
+class TestSaveStreamToPartialFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path_to_file = os.path.join(self.directory.name, "episode.mp3")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_should_copy_whole_content_in_bounded_chunks(self):
+        # Assign
+        content = os.urandom(10 * 1024 + 7)
+        stream = RecordingStream(content)
+
+        # Act
+        result = save_stream_to_partial_file(stream, self.path_to_file, chunk_size=1024)
+        commit_partial_file(self.path_to_file)
+
+        # Assert
+        with open(self.path_to_file, "rb") as file:
+            self.assertEqual(file.read(), content, "The file content should match")
+
+        self.assertEqual(result, len(content), "Should return the number of bytes")
+        self.assertTrue(
+            all(size == 1024 for size in stream.requested_sizes),
+            "Every read should be limited to the chunk size",
+        )
+        self.assertFalse(
+            os.path.exists(to_partial_file_path(self.path_to_file)),
+            "The partial file should be renamed",
+        )
@@ -0,0 +1,112 @@
+import argparse
+import unittest
+from podcast_downloader.selection import (
+    get_shard_number,
+    parse_shard,
+    select_podcasts,
+)
+
+
+def build_podcasts(count: int):
+    return [
+        {"name": f"Podcast {number}", "rss_link": f"http://www.p{number}.com/feed.xml"}
+        for number in range(count)
+    ]
+
+
+class TestParseShard(unittest.TestCase):
+    def test_should_read_the_shard(self):
+        # Act
+        result = parse_shard(" 3/8 ")
+
+        # Assert
+        self.assertEqual(result, (3, 8))
+
+    def test_should_reject_wrong_shard(self):
+        # Assign
+        test_parameters = ["0/8", "9/8", "3", "3/0", "a/b", "-1/8"]
+
+        for value in test_parameters:
+            # Act
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_shard(value)
+
+
+class TestSelectPodcasts(unittest.TestCase):
+    def test_should_put_each_podcast_in_one_shard(self):
+        # Assign
+        podcasts = build_podcasts(800)
+
+        # Act
+        result = [select_podcasts(podcasts, (index, 8), None) for index in range(1, 9)]
+
+        # Assert
+        self.assertEqual(sum(len(shard) for shard in result), len(podcasts))
+        self.assertTrue(all(70 <= len(shard) <= 130 for shard in result))
+
+    def test_should_not_move_podcasts_when_new_ones_are_added(self):
+        # Assign
+        podcasts = build_podcasts(100)
+        before = select_podcasts(podcasts, (2, 5), None)
+
+        # Act
+        result = select_podcasts(build_podcasts(300), (2, 5), None)
+
+        # Assert
+        self.assertListEqual(
+            [podcast for podcast in result if podcast in podcasts], before
+        )
+
+    def test_should_keep_the_podcasts_of_the_same_feed_together(self):
+        # Assign
+        rss_link = "http://www.p.com/feed.xml"
+        podcasts = [
+            {"name": "Full", "rss_link": rss_link},
+            {"name": "Only the series", "rss_link": rss_link},
+        ]
+        shard = (get_shard_number(rss_link, 4), 4)
+
+        # Act
+        result = select_podcasts(podcasts, shard, None)
+
+        # Assert
+        self.assertListEqual(result, podcasts)
+
+    def test_should_select_podcasts_by_name_or_link(self):
+        # Assign
+        podcasts = [
+            {"name": "The Daily News", "rss_link": "http://www.news.com/daily.xml"},
+            {"name": "Weekly", "rss_link": "http://www.news.com/weekly.xml"},
+            {"rss_link": "http://www.other.com/feed.xml"},
+        ]
+
+        test_parameters = [
+            (["the daily*"], [podcasts[0]]),
+            (["*news.com*"], podcasts[:2]),
+            (["Weekly", "*other*"], podcasts[1:]),
+            (["nothing"], []),
+        ]
+
+        for only, expected in test_parameters:
+            # Act
+            result = select_podcasts(podcasts, None, only)
+
+            # Assert
+            self.assertListEqual(result, expected)
+
+    def test_should_apply_shard_and_names_together(self):
+        # Assign
+        podcasts = build_podcasts(40)
+
+        # Act
+        result = select_podcasts(podcasts, (1, 2), ["Podcast 1*"])
+
+        # Assert
+        self.assertListEqual(
+            result,
+            [
+                podcast
+                for podcast in select_podcasts(podcasts, (1, 2), None)
+                if podcast["name"].startswith("Podcast 1")
+            ],
+        )
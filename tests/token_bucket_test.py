@@ -0,0 +1,112 @@
+import io
+import threading
+import time
+import unittest
+from podcast_downloader.download import copy_in_chunks
+from podcast_downloader.throttle import TokenBucket, build_throttle, build_token_bucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_should_let_through_one_second_of_transfer_at_once(self):
+        # Assign
+        clock = FakeClock()
+        bucket = TokenBucket(1000, clock, clock.sleep)
+
+        # Act
+        bucket.consume(600)
+        bucket.consume(400)
+
+        # Assert
+        self.assertListEqual(clock.sleeps, [])
+
+    def test_should_wait_for_missing_tokens(self):
+        # Assign
+        clock = FakeClock()
+        bucket = TokenBucket(1000, clock, clock.sleep)
+        bucket.consume(1000)
+
+        # Act
+        bucket.consume(500)
+        bucket.consume(2000)
+
+        # Assert
+        self.assertListEqual(clock.sleeps, [0.5, 2.0])
+        self.assertEqual(clock.now, 2.5)
+
+    def test_should_not_keep_more_than_capacity(self):
+        # Assign
+        clock = FakeClock()
+        bucket = TokenBucket(1000, clock, clock.sleep)
+        clock.now = 3600.0
+
+        # Act
+        bucket.consume(1500)
+
+        # Assert
+        self.assertListEqual(clock.sleeps, [0.5])
+
+    def test_should_limit_all_threads_together(self):
+        # Assign
+        rate = 200_000
+        bucket = TokenBucket(rate)
+
+        def transfer():
+            for _ in range(15):
+                bucket.consume(5_000)
+
+        threads = [threading.Thread(target=transfer) for _ in range(4)]
+
+        # Act
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        # 300 kB in total, the first 200 kB are taken from the full bucket
+        self.assertGreaterEqual(time.monotonic() - start, 0.45)
+
+
+class TestBuildThrottle(unittest.TestCase):
+    def test_should_skip_missing_limits(self):
+        # Act
+        result = build_throttle([build_token_bucket(None), None])
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_should_pass_chunks_through_all_limits(self):
+        # Assign
+        global_clock = FakeClock()
+        podcast_clock = FakeClock()
+        throttle = build_throttle(
+            [
+                TokenBucket(10_000, global_clock, global_clock.sleep),
+                TokenBucket(1_000, podcast_clock, podcast_clock.sleep),
+            ]
+        )
+
+        # Act
+        result = copy_in_chunks(
+            io.BytesIO(b"x" * 3_000), io.BytesIO(), chunk_size=1_000, throttle=throttle
+        )
+
+        # Assert
+        self.assertEqual(result, 3_000)
+        self.assertListEqual(global_clock.sleeps, [])
+        self.assertListEqual(podcast_clock.sleeps, [1.0, 1.0])